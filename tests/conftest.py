@@ -0,0 +1,15 @@
+# tests/conftest.py
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def offscreen():
+    """One headless OffscreenTarget shared by the GL tests; they are skipped where no context can be made."""
+    from zengine.core.offscreen import OffscreenTarget
+    try:
+        target = OffscreenTarget((160, 120))
+    except Exception as e:
+        pytest.skip(f"no standalone GL context: {e}")
+    yield target
+    target.release()
@@ -0,0 +1,115 @@
+# tests/test_aabb_tree.py
+
+import numpy as np
+import pytest
+
+from zengine.util.aabb_tree import DynamicAABBTree
+
+
+def random_box(rng, extent=20.0, size=2.0):
+    lo = rng.uniform(-extent, extent, 3)
+    hi = lo + rng.uniform(0.05, size, 3)
+    return tuple(lo.tolist()), tuple(hi.tolist())
+
+
+def overlaps(alo, ahi, blo, bhi):
+    return all(alo[i] <= bhi[i] and blo[i] <= ahi[i] for i in range(3))
+
+
+def check_queries(tree, boxes, proxies, rng, count=20):
+    """Every query returns exactly the fat boxes it touches: a superset of the tight hits."""
+    for _ in range(count):
+        qlo, qhi = random_box(rng, size=8.0)
+        found = tree.query_aabb(qlo, qhi)
+        assert len(found) == len(set(found))
+        found = set(found)
+        tight = {k for k, (lo, hi) in boxes.items() if overlaps(lo, hi, qlo, qhi)}
+        fat = {k for k, p in proxies.items() if overlaps(*tree.get_fat_aabb(p), qlo, qhi)}
+        assert tight <= found
+        assert found == fat
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_random_insert_move_remove_keeps_invariants(seed):
+    rng = np.random.default_rng(seed)
+    tree = DynamicAABBTree(margin=0.1)
+    boxes, proxies = {}, {}
+    next_key = 0
+
+    for step in range(40):
+        for _ in range(int(rng.integers(0, 12))):
+            lo, hi = random_box(rng)
+            boxes[next_key] = (lo, hi)
+            proxies[next_key] = tree.insert(lo, hi, next_key)
+            next_key += 1
+
+        keys = list(boxes)
+        for k in rng.permutation(keys)[:len(keys) // 3].tolist():
+            lo, hi = boxes[k]
+            if rng.random() < 0.5:      # small nudge, usually inside the fat box
+                d = rng.uniform(-0.08, 0.08, 3)
+            else:
+                d = rng.uniform(-5.0, 5.0, 3)
+            lo, hi = tuple((np.array(lo) + d).tolist()), tuple((np.array(hi) + d).tolist())
+            boxes[k] = (lo, hi)
+            tree.move(proxies[k], lo, hi)
+
+        for k in rng.permutation(list(boxes))[:int(rng.integers(0, 6))].tolist():
+            tree.remove(proxies.pop(k))
+            del boxes[k]
+
+        tree.validate()
+        assert len(tree) == len(boxes)
+        for k, p in proxies.items():
+            assert tree.get_data(p) == k
+            flo, fhi = tree.get_fat_aabb(p)
+            lo, hi = boxes[k]
+            assert all(flo[i] <= lo[i] and hi[i] <= fhi[i] for i in range(3))
+        check_queries(tree, boxes, proxies, rng)
+
+    # balanced: height stays logarithmic in the leaf count
+    if len(tree) > 1:
+        assert tree.height() <= 2 * int(np.ceil(np.log2(len(tree)))) + 2
+
+
+def test_remove_everything_leaves_empty_tree():
+    rng = np.random.default_rng(7)
+    tree = DynamicAABBTree()
+    proxies = [tree.insert(*random_box(rng), i) for i in range(50)]
+    for p in proxies:
+        tree.remove(p)
+        tree.validate()
+    assert len(tree) == 0
+    assert tree.height() == 0
+    assert tree.query_aabb((-100, -100, -100), (100, 100, 100)) == []
+
+
+def test_move_within_margin_does_not_reinsert():
+    tree = DynamicAABBTree(margin=0.5)
+    p = tree.insert((0, 0, 0), (1, 1, 1), "a")
+    assert not tree.move(p, (0.2, 0.2, 0.2), (1.2, 1.2, 1.2))
+    assert tree.move(p, (3, 3, 3), (4, 4, 4))
+    tree.validate()
+    assert tree.query_aabb((3.5, 3.5, 3.5), (3.6, 3.6, 3.6)) == ["a"]
+
+
+def test_query_ray_matches_brute_force():
+    from zengine.util.intersection import ray_aabbs
+
+    rng = np.random.default_rng(11)
+    tree = DynamicAABBTree(margin=0.0)
+    boxes = [random_box(rng, extent=8.0) for _ in range(150)]
+    for i, (lo, hi) in enumerate(boxes):
+        tree.insert(lo, hi, i)
+    lo, hi = np.array([b[0] for b in boxes]), np.array([b[1] for b in boxes])
+    for _ in range(60):
+        origin = rng.uniform(-10, 10, 3)
+        direction = rng.normal(size=3)
+        if rng.random() < 0.3:
+            direction[rng.integers(0, 3)] = 0.0     # parallel to a slab
+        hits = tree.query_ray(origin, direction, 30.0)
+        hit, t = ray_aabbs(origin, direction, lo, hi, 30.0)
+        assert sorted(i for _, i in hits) == np.flatnonzero(hit).tolist()
+        assert [d for d, _ in hits] == sorted(d for d, _ in hits)
+        for d, i in hits:
+            assert d == pytest.approx(t[i])
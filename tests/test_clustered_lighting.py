@@ -0,0 +1,125 @@
+# tests/test_clustered_lighting.py
+
+import numpy as np
+import pytest
+from scipy.optimize import nnls
+
+from zengine.ecs.systems.shadow_system import look_at, orthographic, perspective
+from zengine.graphics.clustered_lighting import ClusteredLightGrid
+
+DIMS = (8, 6, 12)
+NEAR, FAR = 0.5, 60.0
+
+
+def cluster_corners(proj, dims, near, far, ortho):
+    """View-space corners (8 per cluster) of every cluster, indexed like the grid: x + X * (y + Y * z)."""
+    X, Y, Z = dims
+    k = np.arange(Z + 1)
+    depths = near + (far - near) * k / Z if ortho else near * (far / near) ** (k / Z)
+    corners = np.zeros((X * Y * Z, 8, 3))
+    for z in range(Z):
+        for y in range(Y):
+            for x in range(X):
+                cell = []
+                for d in depths[z:z + 2]:
+                    w = proj[3, 2] * -d + proj[3, 3]
+                    for nx in (-1 + 2 * x / X, -1 + 2 * (x + 1) / X):
+                        for ny in (-1 + 2 * y / Y, -1 + 2 * (y + 1) / Y):
+                            vx = (nx * w - proj[0, 2] * -d - proj[0, 3]) / proj[0, 0]
+                            vy = (ny * w - proj[1, 2] * -d - proj[1, 3]) / proj[1, 1]
+                            cell.append((vx, vy, -d))
+                corners[x + X * (y + Y * z)] = cell
+    return corners
+
+
+def distance_to_cell(point, corners):
+    """Distance from a point to the convex hull of a cluster's corners (min-norm over convex weights)."""
+    weight = 1e4    # enforces sum(w) == 1 as a heavily weighted extra row
+    a = np.vstack([corners.T, np.full(8, weight)])
+    b = np.append(point, weight)
+    w, _ = nnls(a, b)
+    return np.linalg.norm(corners.T @ w - point)
+
+
+def brute_force(view, proj, positions, ranges, ortho):
+    """
+    Set of (cluster, light) pairs where the light sphere touches the cluster.
+    Sphere vs cluster AABB first, then the exact distance to the cluster cell
+    for the candidates, since a frustum cell's AABB is looser than the cell.
+    """
+    corners = cluster_corners(proj, DIMS, NEAR, FAR, ortho)
+    lo, hi = corners.min(axis=1), corners.max(axis=1)
+    centers = positions @ view[:3, :3].T + view[:3, 3]
+    pairs = set()
+    for light, (c, r) in enumerate(zip(centers, ranges)):
+        # a hair inside the sphere keeps float ties on cluster faces out of it
+        r = r * 0.999
+        candidates = np.sum((np.clip(c, lo, hi) - c) ** 2, axis=1) < r * r
+        pairs.update((int(cl), light) for cl in np.nonzero(candidates)[0]
+                     if distance_to_cell(c, corners[cl]) < r)
+    return pairs
+
+
+def random_lights(rng, n):
+    positions = rng.uniform((-25, -15, -40), (25, 15, 25), size=(n, 3))
+    ranges = rng.uniform(0.3, 6.0, size=n)
+    return positions, ranges
+
+
+def read_lists(grid):
+    """{cluster: light ids} from the uploaded cluster and index textures."""
+    X, Y, Z = grid.dims
+    cells = np.frombuffer(grid.cluster_tex.read(), dtype='i4').reshape(Z * X * Y, 2)
+    indices = np.frombuffer(grid.index_tex.read(), dtype='i4')
+    return {cl: sorted(indices[off:off + count].tolist())
+            for cl, (off, count) in enumerate(cells) if count}
+
+
+@pytest.mark.parametrize("ortho", [False, True])
+def test_binning_covers_every_cluster_a_light_touches(offscreen, ortho):
+    rng = np.random.default_rng(11 if ortho else 5)
+    view = look_at((3.0, 2.0, 12.0), (0.0, 0.0, -5.0), (0.0, 1.0, 0.0))
+    proj = orthographic(-20, 20, -12, 12, NEAR, FAR) if ortho else perspective(60.0, 4 / 3, NEAR, FAR)
+    positions, ranges = random_lights(rng, 150)
+
+    grid = ClusteredLightGrid(offscreen.ctx, DIMS, capacity=8)
+    try:
+        colors = np.ones((len(positions), 3))
+        grid.build(view, proj, NEAR, FAR, positions, colors, np.ones(len(positions)), ranges, ortho=ortho)
+        clusters, lights = grid.assign(view, proj, positions, ranges)
+
+        binned = set(zip(clusters.tolist(), lights.tolist()))
+        assert len(binned) == len(clusters), "no cluster listed twice for a light"
+        expected = brute_force(view, proj, positions, ranges, ortho)
+        assert expected, "the scene must actually light some clusters"
+        assert expected <= binned, f"missed {sorted(expected - binned)[:5]}"
+
+        # conservative, but not wildly so: boxes around spheres over-cover a little
+        assert len(binned) < 2 * len(expected)
+
+        # the uploaded lists hold exactly the binned pairs, grouped per cluster
+        lists = read_lists(grid)
+        assert grid.index_count == len(binned)
+        assert {(cl, l) for cl, ls in lists.items() for l in ls} == binned
+    finally:
+        for tex in (grid.light_tex, grid.cluster_tex, grid.index_tex):
+            tex.release()
+
+
+def test_lights_out_of_view_are_not_binned(offscreen):
+    view = np.eye(4)
+    proj = perspective(60.0, 4 / 3, NEAR, FAR)
+    grid = ClusteredLightGrid(offscreen.ctx, DIMS, capacity=8)
+    try:
+        grid.near, grid.far = NEAR, FAR
+        positions = np.array([(0.0, 0.0, 5.0),       # behind the camera
+                              (0.0, 0.0, -200.0),    # past the far plane
+                              (90.0, 0.0, -10.0),    # off to the side
+                              (10.0, 0.0, -0.2),     # off to the side, across the camera plane
+                              (0.0, 0.0, -10.0)])    # in view
+        clusters, lights = grid.assign(view, proj, positions, np.full(5, 1.0))
+        assert set(lights.tolist()) == {4}
+        assert len(clusters) > 0
+    finally:
+        for tex in (grid.light_tex, grid.cluster_tex, grid.index_tex):
+            tex.release()
@@ -0,0 +1,167 @@
+# tests/test_file_watcher.py
+
+import os
+
+from zengine.util.file_watcher import FileWatcher
+
+T0 = 1_700_000_000 * 10**9
+
+
+def save(path, text, tick):
+    """Writes `text` and gives the file a distinct mtime, as separate saves would."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.utime(path, ns=(T0 + tick, T0 + tick))
+
+
+def reading(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_burst_of_writes_settles_into_one_event(tmp_path):
+    path = str(tmp_path / "a.txt")
+    save(path, "v0", 0)
+    watcher = FileWatcher(debounce=0.2)
+    watcher.watch(path, "a", reading)
+
+    watcher.check(now=0.0)
+    assert watcher.poll() == []
+
+    save(path, "v1", 1)
+    watcher.check(now=1.0)          # change seen, debounce starts
+    save(path, "v12", 2)
+    watcher.check(now=1.1)          # changed again: window restarts
+    save(path, "v123", 3)
+    watcher.check(now=1.25)
+    watcher.check(now=1.4)          # 0.15s quiet, not yet settled
+    assert watcher.poll() == []
+
+    watcher.check(now=1.46)
+    assert watcher.poll() == [("a", path, "v123")]
+    for now in (1.5, 2.0, 5.0):
+        watcher.check(now=now)
+    assert watcher.poll() == []
+
+
+def test_every_key_on_a_path_gets_the_change(tmp_path):
+    path = str(tmp_path / "shared.txt")
+    save(path, "x", 0)
+    watcher = FileWatcher(debounce=0.0)
+    watcher.watch(path, "first", reading)
+    watcher.watch(path, "second")
+    watcher.watch(path, "first", reading)       # watched once per key
+
+    save(path, "y", 1)
+    watcher.check(now=0.0)
+    watcher.check(now=0.0)
+    assert watcher.poll() == [("first", path, "y"), ("second", path, None)]
+
+    watcher.unwatch("first")
+    save(path, "z", 2)
+    watcher.check(now=1.0)
+    watcher.check(now=1.0)
+    assert watcher.poll() == [("second", path, None)]
+
+
+def test_failed_prepare_reports_and_queues_nothing(tmp_path):
+    path = str(tmp_path / "level.txt")
+    save(path, "good", 0)
+    errors = []
+    watcher = FileWatcher(debounce=0.1, on_error=lambda p, e: errors.append((p, e)))
+
+    def prepare(p):
+        text = reading(p)
+        if text.startswith("bad"):
+            raise ValueError(text)
+        return text
+
+    watcher.watch(path, "level", prepare)
+    save(path, "bad edit", 1)
+    watcher.check(now=0.0)
+    watcher.check(now=0.2)
+    assert watcher.poll() == []
+    assert len(errors) == 1 and errors[0][0] == path and isinstance(errors[0][1], ValueError)
+
+    # the failed version is not retried, the next good save goes through
+    watcher.check(now=0.5)
+    assert len(errors) == 1
+    save(path, "fixed", 2)
+    watcher.check(now=1.0)
+    watcher.check(now=1.2)
+    assert watcher.poll() == [("level", path, "fixed")]
+
+
+def test_deleted_file_keeps_the_last_version(tmp_path):
+    path = str(tmp_path / "gone.txt")
+    save(path, "here", 0)
+    watcher = FileWatcher(debounce=0.0)
+    watcher.watch(path, "gone", reading)
+    os.remove(path)
+    watcher.check(now=0.0)
+    watcher.check(now=0.0)
+    assert watcher.poll() == []
+
+    save(path, "back", 1)
+    watcher.check(now=1.0)
+    watcher.check(now=1.0)
+    assert watcher.poll() == [("gone", path, "back")]
+
+
+VERT = """#version 330 core
+in vec3 in_position;
+void main() { gl_Position = vec4(in_position, 1.0); }
+"""
+
+FRAG = """#version 330 core
+out vec4 frag_color;
+#include "colour.glsl"
+void main() { frag_color = colour(); }
+"""
+
+
+def test_broken_shader_edits_keep_the_running_program(offscreen, tmp_path):
+    from zengine.ecs.systems.hot_reload_system import HotReloadSystem
+    from zengine.graphics.shader_library import ShaderLibrary
+
+    vert, frag, inc = (str(tmp_path / n) for n in ("w_vert.glsl", "w_frag.glsl", "colour.glsl"))
+    save(vert, VERT, 0)
+    save(frag, FRAG, 0)
+    save(inc, "vec4 colour() { return vec4(1.0); }\n", 0)
+
+    shaders = ShaderLibrary.for_context(offscreen.ctx)
+    shader = shaders.load(vert, frag)
+    errors = []
+    system = HotReloadSystem(offscreen.ctx, debounce=0.1)
+    system.watcher.on_error = lambda p, e: errors.append(e)
+    system.rescan()     # not added to a scene: no watcher thread, checks are driven here
+
+    def settle(now):
+        system.watcher.check(now=now)
+        system.watcher.check(now=now + 0.2)
+        system.on_late_update(0.0)
+
+    program = shader.program
+    try:
+        # does not preprocess: the include is missing
+        save(frag, FRAG.replace("colour.glsl", "missing.glsl"), 1)
+        settle(0.0)
+        assert isinstance(errors[-1], FileNotFoundError)
+        assert shader.program is program
+
+        # preprocesses, does not compile
+        save(frag, FRAG.replace("colour()", "colour("), 2)
+        settle(1.0)
+        assert len(errors) == 2 and system.stats["failed"] == 1
+        assert shader.program is program and shader.program.glo > 0
+
+        # saving both files in one window reloads the shader once
+        save(frag, FRAG, 3)
+        save(inc, "vec4 colour() { return vec4(0.5); }\n", 3)
+        settle(2.0)
+        assert len(errors) == 2
+        assert system.stats["shaders"] == 1
+        assert shader.program is not program
+        assert "vec4(0.5)" in shader.fragment_source
+    finally:
+        shaders.release(shader)
@@ -0,0 +1,85 @@
+# tests/test_hot_reload.py
+
+import numpy as np
+
+
+def build_scene(ctx):
+    """One of every system that keeps vertex arrays on a library shader's program."""
+    from zengine.core.scene import Scene
+    from zengine.ecs.components import Transform, MeshFilter, Material, MeshRenderer, ParticleEmitter
+    from zengine.ecs.components.camera import CameraComponent
+    from zengine.ecs.components.light import LightComponent, LightType
+    from zengine.ecs.components.sprite_renderer import SpriteRenderer
+    from zengine.ecs.components.tilemap import Tilemap
+    from zengine.ecs.systems.camera_system import CameraSystem
+    from zengine.ecs.systems.debug_render_system import DebugRenderSystem
+    from zengine.ecs.systems.particle_system import ParticleSystem
+    from zengine.ecs.systems.render_system import RenderSystem, RenderPath
+    from zengine.ecs.systems.sprite_batch_system import SpriteBatchSystem
+    from zengine.ecs.systems.tilemap_system import TilemapSystem
+    from zengine.graphics.shader_library import ShaderLibrary
+    from zengine.util.mesh_factory import MeshFactory
+
+    scene = Scene()
+    em = scene.entity_manager
+    shader = ShaderLibrary.for_context(ctx).load("basic_vert.glsl", "basic_frag.glsl")
+    scene.add_system(CameraSystem())
+
+    e = em.create_entity()
+    em.add_component(e, Transform(x=-1.5, y=0.5, z=0.5))
+    em.add_component(e, MeshFilter(MeshFactory.cube("cube", 1.0)))
+    em.add_component(e, Material(shader=shader, albedo=(1.0, 0.5, 0.2, 1.0)))
+    em.add_component(e, MeshRenderer(shader=shader))
+    e = em.create_entity()
+    em.add_component(e, Transform(y=1.0, z=3.0))
+    em.add_component(e, LightComponent(type=LightType.POINT, intensity=2.0, range=8.0))
+
+    e = em.create_entity()
+    em.add_component(e, Transform(x=1.5, y=0.5, z=0.1))
+    em.add_component(e, SpriteRenderer(texture=None, tint=(0.2, 0.4, 1.0, 1.0)))
+
+    e = em.create_entity()
+    em.add_component(e, Transform(x=-2.5, y=-2.0))
+    tm = Tilemap(palette=[(0.0, 0.0, 1.0, 1.0)], texture=ctx.texture((1, 1), 4, b'\x40\xc0\x40\xff'), chunk_size=4)
+    tm.fill(0, 0, np.zeros((1, 5), dtype=np.int32))
+    em.add_component(e, tm)
+
+    # stationary, never-dying particles, so frames are identical
+    e = em.create_entity()
+    em.add_component(e, Transform(x=1.5, y=-1.0, z=0.5))
+    em.add_component(e, ParticleEmitter(rate=0.0, speed=(0.0, 0.0), lifetime=(1e6, 1e6), gravity=(0.0, 0.0, 0.0),
+                                        start_size=0.5, end_size=0.5, end_color=(1.0, 1.0, 1.0, 1.0),
+                                        pending=1, seed=1))
+
+    cam = em.create_entity()
+    em.add_component(cam, Transform(z=6.0))
+    em.add_component(cam, CameraComponent(aspect=4 / 3))
+
+    scene.add_system(RenderSystem(ctx, scene, render_path=RenderPath.DEFERRED))
+    scene.add_system(TilemapSystem(ctx, scene))
+    scene.add_system(SpriteBatchSystem(ctx, scene))
+    scene.add_system(ParticleSystem(ctx, scene))
+    scene.add_system(DebugRenderSystem(ctx, scene))
+    return scene
+
+
+def test_every_holder_draws_after_a_swap(offscreen):
+    from zengine.graphics.shader_library import ShaderLibrary
+
+    ctx = offscreen.ctx
+    lib = ShaderLibrary.for_context(ctx)
+    scene = build_scene(ctx)
+    before = offscreen.render(scene, frames=1, warmup=1).color.astype(int)
+    assert ctx.error == 'GL_NO_ERROR'
+
+    replaced = []
+    for shader in lib.loaded():
+        replaced.append(shader.program)
+        lib.swap(shader, *lib.prepare_reload(shader))
+    assert not set(map(id, replaced)) & set(map(id, lib.programs()))
+
+    after = offscreen.render(scene, frames=1).color.astype(int)
+    # a vertex array of a released program may even draw right (through whatever program is
+    # bound), but using it is a GL error
+    assert ctx.error == 'GL_NO_ERROR', "a system drew through a vertex array of a released program"
+    assert np.abs(after - before).max() <= 2
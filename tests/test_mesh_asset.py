@@ -0,0 +1,55 @@
+# tests/test_mesh_asset.py
+
+import numpy as np
+import pytest
+
+from zengine.util.mesh_factory import MeshFactory
+
+
+def test_new_mesh_starts_at_revision_zero():
+    assert MeshFactory.cube("cube", 1.0).revision == 0
+
+
+def test_assigning_a_stream_bumps_revision_and_resets_bounds():
+    mesh = MeshFactory.cube("cube", 1.0)
+    assert np.allclose(mesh.bounds()[1], 0.5)
+    mesh.vertices = mesh.vertices * 2.0
+    assert mesh.revision == 1
+    assert np.allclose(mesh.bounds()[1], 1.0)
+    mesh.uvs = mesh.uvs * 0.5
+    assert mesh.revision == 2
+
+
+def test_update_bumps_once_and_rejects_unknown_streams():
+    mesh = MeshFactory.cube("cube", 1.0)
+    mesh.bounds()
+    mesh.update(vertices=mesh.vertices + 1.0, normals=mesh.normals)
+    assert mesh.revision == 1
+    assert np.allclose(mesh.bounds()[0], 0.5)
+    with pytest.raises(AttributeError):
+        mesh.update(revision=5)
+    with pytest.raises(AttributeError):
+        mesh.update(name="other")
+    assert mesh.revision == 1
+
+
+def test_spatial_index_follows_a_direct_vertex_edit():
+    from zengine.core.scene import Scene
+    from zengine.ecs.components import Transform, MeshFilter
+    from zengine.ecs.systems.spatial_index_system import SpatialIndexSystem
+
+    scene = Scene()
+    em = scene.entity_manager
+    index = SpatialIndexSystem(margin=0.0)
+    scene.add_system(index)
+    mesh = MeshFactory.cube("cube", 1.0)
+    e = em.create_entity()
+    em.add_component(e, Transform(x=10.0))
+    em.add_component(e, MeshFilter(mesh))
+    index.sync()
+    assert np.allclose(index.get_bounds(e)[1], (10.5, 0.5, 0.5))
+
+    mesh.vertices = mesh.vertices * 4.0
+    index.sync()
+    assert np.allclose(index.get_bounds(e)[1], (12.0, 2.0, 2.0))
+    assert index.query_aabb((11.8, 0.0, 0.0), (11.9, 0.1, 0.1)) == [e]
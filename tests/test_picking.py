@@ -0,0 +1,152 @@
+# tests/test_picking.py
+
+import numpy as np
+import pytest
+
+from zengine.util.intersection import ray_aabbs, ray_triangles
+
+
+def brute_ray_aabb(o, d, lo, hi, max_distance):
+    """Entry distance of a ray into a box by clipping against each slab in turn, or None."""
+    t0, t1 = 0.0, max_distance
+    for a in range(3):
+        if d[a] == 0.0:
+            if not lo[a] <= o[a] <= hi[a]:
+                return None
+            continue
+        ta, tb = sorted(((lo[a] - o[a]) / d[a], (hi[a] - o[a]) / d[a]))
+        t0, t1 = max(t0, ta), min(t1, tb)
+        if t0 > t1:
+            return None
+    return t0
+
+
+def brute_ray_triangle(o, d, a, b, c):
+    """(t, u, v) solving o + t d = a + u (b - a) + v (c - a) directly, or None for a parallel ray."""
+    m = np.column_stack([-d, b - a, c - a])
+    if abs(np.linalg.det(m)) < 1e-9:
+        return None
+    return np.linalg.solve(m, o - a)
+
+
+def random_ray(rng):
+    o = rng.uniform(-6, 6, 3)
+    d = rng.normal(size=3)
+    if rng.random() < 0.2:
+        d[rng.integers(0, 3)] = 0.0     # axis-parallel components
+    return o, d / np.linalg.norm(d)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_ray_aabbs_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    lo = rng.uniform(-5, 4, (200, 3))
+    hi = lo + rng.uniform(0.1, 3.0, (200, 3))
+    for _ in range(40):
+        o, d = random_ray(rng)
+        max_distance = float(rng.choice([np.inf, rng.uniform(1, 10)]))
+        hit, t = ray_aabbs(o, d, lo, hi, max_distance)
+        for i in range(len(lo)):
+            expected = brute_ray_aabb(o, d, lo[i], hi[i], max_distance)
+            assert hit[i] == (expected is not None)
+            if expected is not None:
+                assert t[i] == pytest.approx(expected, abs=1e-9)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_ray_triangles_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    a, b, c = (rng.uniform(-4, 4, (300, 3)) for _ in range(3))
+    for _ in range(30):
+        o, d = random_ray(rng)
+        hit, t = ray_triangles(o, d, a, b - a, c - a)
+        for i in range(len(a)):
+            solved = brute_ray_triangle(o, d, a[i], b[i], c[i])
+            if solved is None:
+                continue
+            t_i, u, v = solved
+            margins = (t_i, u, v, 1.0 - u - v)
+            if min(abs(m) for m in margins) < 1e-9:
+                continue        # on an edge or at the origin: either answer is fine
+            assert hit[i] == (min(margins) > 0.0)
+            if hit[i]:
+                assert t[i] == pytest.approx(t_i, rel=1e-6, abs=1e-9)
+            else:
+                assert t[i] == np.inf
+
+
+def build_scene(positions):
+    from zengine.core.scene import Scene
+    from zengine.ecs.components import Transform, MeshFilter
+    from zengine.ecs.systems.picking_system import PickingSystem
+    from zengine.ecs.systems.spatial_index_system import SpatialIndexSystem
+    from zengine.util.mesh_factory import MeshFactory
+
+    scene = Scene()
+    em = scene.entity_manager
+    picking = PickingSystem()
+    scene.add_system(picking)           # before the index and input, on purpose
+    index = SpatialIndexSystem()
+    scene.add_system(index)
+    cube = MeshFactory.cube("cube", 1.0)
+    eids = []
+    for p in positions:
+        e = em.create_entity()
+        em.add_component(e, Transform(x=p[0], y=p[1], z=p[2]))
+        em.add_component(e, MeshFilter(cube))
+        eids.append(e)
+    index.sync()
+    return scene, picking, eids
+
+
+@pytest.mark.parametrize("exact", [True, False])
+def test_raycast_hits_are_sorted_by_distance(exact):
+    rng = np.random.default_rng(3)
+    positions = [(0.0, 0.0, float(z)) for z in rng.permutation(np.arange(-20, 0, 2))]
+    positions += [(5.0, 5.0, -4.0)]     # off the ray
+    scene, picking, eids = build_scene(positions)
+
+    hits = picking.raycast((0.0, 0.0, 5.0), (0.0, 0.0, -1.0), exact=exact)
+    assert [h.entity for h in hits] == [eids[i] for i in np.argsort([-p[2] for p in positions[:-1]])]
+    distances = [h.distance for h in hits]
+    assert distances == sorted(distances)
+    # entering each unit cube through its +Z face
+    assert np.allclose(distances, [5.0 - (p[2] + 0.5) for p in sorted(positions[:-1], key=lambda p: -p[2])])
+    assert picking.raycast((0.0, 0.0, 5.0), (0.0, 0.0, -1.0), exact=exact, nearest_only=True)[0].entity == hits[0].entity
+
+
+def test_exact_raycast_skips_boxes_the_mesh_does_not_fill():
+    from zengine.ecs.components import MeshFilter
+    from zengine.ecs.systems.spatial_index_system import SpatialIndexSystem
+    from zengine.util.mesh_factory import MeshFactory
+
+    scene, picking, eids = build_scene([(0.0, 0.0, 0.0)])
+    scene.entity_manager.get_component(eids[0], MeshFilter).asset = MeshFactory.sphere("ball", 0.5)
+    scene.get_system(SpatialIndexSystem).sync()
+    corner = np.array([0.45, 0.45, 5.0])
+    assert picking.raycast(corner, (0.0, 0.0, -1.0), exact=False)
+    assert picking.raycast(corner, (0.0, 0.0, -1.0), exact=True) == []
+
+
+def test_mouse_picking_finds_an_input_system_added_later():
+    from zengine.ecs.components import Transform
+    from zengine.ecs.components.camera import CameraComponent
+    from zengine.ecs.systems.camera_system import CameraSystem
+    from zengine.ecs.systems.input_system import InputSystem
+
+    scene, picking, eids = build_scene([(0.0, 0.0, 0.0)])
+    em = scene.entity_manager
+    cam = em.create_entity()
+    em.add_component(cam, Transform(z=6.0))
+    em.add_component(cam, CameraComponent(aspect=1.0))
+    scene.add_system(CameraSystem())
+    scene.on_update(0.0)
+    scene.window = type("Window", (), {"width": 100, "height": 100})()
+    assert picking.pick() is None and picking.pick_all() == []
+
+    inputs = InputSystem()
+    scene.add_system(inputs)
+    inputs.mouse_pos = (50, 50)     # window center, straight at the cube
+    hit = picking.pick()
+    assert hit is not None and hit.entity == eids[0]
+    assert [h.entity for h in picking.pick_all()] == [eids[0]]
@@ -0,0 +1,67 @@
+# tests/test_rect_packer.py
+
+import random
+
+import numpy as np
+
+from zengine.util.rect_packer import SkylinePacker
+
+
+def overlaps(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+def check_skyline(packer):
+    xs = [x for x, _, _ in packer.skyline]
+    assert xs[0] == 0
+    assert sum(w for _, _, w in packer.skyline) == packer.width
+    for (x, y, w), (nx, ny, _) in zip(packer.skyline, packer.skyline[1:]):
+        assert x + w == nx, "segments are contiguous"
+        assert y != ny, "equal neighbours are merged"
+
+
+def test_random_rects_stay_in_bounds_and_never_overlap():
+    rng = random.Random(7)
+    for trial in range(20):
+        size = rng.choice((64, 128, 256))
+        packer = SkylinePacker(size, size)
+        sizes = [(rng.randint(1, size // 3), rng.randint(1, size // 3)) for _ in range(80)]
+        if trial % 2:
+            sizes.sort(key=lambda s: -s[1])
+
+        placed = []
+        coverage = np.zeros((size, size), dtype=np.int32)
+        for w, h in sizes:
+            pos = packer.insert(w, h)
+            check_skyline(packer)
+            if pos is None:
+                continue
+            x, y = pos
+            assert 0 <= x and x + w <= size and 0 <= y and y + h <= size
+            for other in placed:
+                assert not overlaps((x, y, w, h), other)
+            placed.append((x, y, w, h))
+            coverage[y:y + h, x:x + w] += 1
+        assert coverage.max() <= 1
+        assert packer.used_height == max(y + h for _, y, _, h in placed)
+
+
+def test_rect_lands_on_the_lowest_top():
+    packer = SkylinePacker(10, 10)
+    assert packer.insert(4, 6) == (0, 0)
+    assert packer.insert(6, 2) == (4, 0)
+    # the 4-wide column beside the tall rect is lower than stacking on top of it
+    assert packer.insert(4, 3) == (4, 2)
+    assert packer.skyline == [(0, 6, 4), (4, 5, 4), (8, 2, 2)]
+
+
+def test_full_bin_returns_none():
+    packer = SkylinePacker(8, 8)
+    assert packer.insert(9, 1) is None
+    assert packer.insert(1, 9) is None
+    for i in range(4):
+        assert packer.insert(8, 2) == (0, 2 * i)
+    assert packer.insert(1, 1) is None
+    assert packer.skyline == [(0, 8, 8)]
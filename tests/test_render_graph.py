@@ -0,0 +1,149 @@
+# tests/test_render_graph.py
+
+import numpy as np
+import pytest
+
+from zengine.graphics import render_graph
+from zengine.graphics.render_graph import RenderGraph, FramebufferPool, TextureDesc, BACKBUFFER
+
+PASSTHROUGH_FRAG = """
+#version 330 core
+in vec2 frag_uv;
+out vec4 frag_color;
+uniform sampler2D u_source;
+void main() { frag_color = texture(u_source, frag_uv); }
+"""
+
+
+def noop(graph):
+    pass
+
+
+# --- compile: ordering and culling (no GL needed) --------------------------------------
+
+def test_passes_run_by_order_then_declaration():
+    g = RenderGraph(None, None)
+    g.import_resource(BACKBUFFER, object())
+    g.add_pass("post", noop, order=render_graph.POST, color=(BACKBUFFER,))
+    g.add_pass("opaque_a", noop, order=render_graph.OPAQUE, color=(BACKBUFFER,))
+    g.add_pass("shadow", noop, order=render_graph.SHADOW, side_effects=True)
+    g.add_pass("opaque_b", noop, order=render_graph.OPAQUE, color=(BACKBUFFER,))
+    assert [p.name for p in g.compile()] == ["shadow", "opaque_a", "opaque_b", "post"]
+
+
+def test_unconsumed_transient_outputs_are_culled():
+    g = RenderGraph(None, None)
+    g.import_resource(BACKBUFFER, object())
+    g.create("bloom", TextureDesc((4, 4)))
+    g.create("unused", TextureDesc((4, 4)))
+    g.add_pass("bloom", noop, order=render_graph.POST, color=("bloom",))
+    g.add_pass("unused", noop, order=render_graph.POST, color=("unused",))
+    g.add_pass("final", noop, order=render_graph.POST + 1, color=(BACKBUFFER,), reads=("bloom",))
+    assert [p.name for p in g.compile()] == ["bloom", "final"]
+    assert g.culled == ["unused"]
+
+
+def test_imported_none_and_writes_chain():
+    g = RenderGraph(None, None)
+    g.import_resource("shadow_maps")            # managed by the pass itself, nobody asked for it
+    g.add_pass("shadows", noop, order=render_graph.SHADOW, writes=("shadow_maps",))
+    assert g.compile() == [] and g.culled == ["shadows"]
+
+    g.import_resource(BACKBUFFER, object())
+    g.add_pass("opaque", noop, color=(BACKBUFFER,), reads=("shadow_maps",))
+    assert [p.name for p in g.compile()] == ["shadows", "opaque"]
+
+
+def test_undeclared_attachment_raises():
+    g = RenderGraph(None, None)
+    g.add_pass("opaque", noop, color=("color",), side_effects=True)
+    with pytest.raises(KeyError):
+        g.compile()
+
+
+# --- execute: clears of transient attachments ------------------------------------------
+
+def test_only_fresh_attachments_are_cleared(offscreen):
+    ctx = offscreen.ctx
+    pool = FramebufferPool(ctx)
+    size = (8, 8)
+    g = RenderGraph(ctx, pool, clear_color=(0.25, 0.5, 0.75, 1.0))
+    g.create("color", TextureDesc(size))
+    g.create("depth", TextureDesc(size, depth=True))
+    seen = {}
+
+    def prepass(graph):
+        ctx.color_mask = (False, False, False, False)
+        ctx.clear(depth=0.5)                    # stands in for drawn depth
+        ctx.color_mask = (True, True, True, True)
+
+    def opaque(graph):
+        seen["depth"] = np.frombuffer(graph.texture("depth").read(), dtype='f4')
+        seen["color"] = np.frombuffer(graph.texture("color").read(), dtype='u1').reshape(-1, 4)
+
+    g.add_pass("prepass", prepass, order=render_graph.PREPASS, depth="depth")
+    g.add_pass("opaque", opaque, order=render_graph.OPAQUE, color=("color",), depth="depth",
+               side_effects=True)
+    g.execute()
+
+    assert np.allclose(seen["depth"], 0.5), "the color pass must keep the pre-pass depth"
+    assert np.all(np.abs(seen["color"].astype(int) - (64, 128, 191, 255)) <= 1)
+    pool.release_all()
+
+
+# --- the graph with a passthrough effect matches direct rendering ----------------------
+
+def build_scene(ctx, render_path):
+    from zengine.core.scene import Scene
+    from zengine.ecs.components import Transform, MeshFilter, Material, MeshRenderer
+    from zengine.ecs.components.camera import CameraComponent
+    from zengine.ecs.components.light import LightComponent, LightType
+    from zengine.ecs.systems.camera_system import CameraSystem
+    from zengine.ecs.systems.render_system import RenderSystem
+    from zengine.graphics.shader_library import ShaderLibrary
+    from zengine.util.mesh_factory import MeshFactory
+
+    scene = Scene()
+    em = scene.entity_manager
+    shader = ShaderLibrary.for_context(ctx).load("basic_vert.glsl", "basic_frag.glsl")
+    cube = MeshFactory.cube("cube", 1.0)
+    scene.add_system(CameraSystem())
+    for i in range(5):
+        e = em.create_entity()
+        em.add_component(e, Transform(x=(i - 2) * 1.5, z=-i * 0.5))
+        em.add_component(e, MeshFilter(cube))
+        em.add_component(e, Material(shader=shader, albedo=(1.0, 0.5, 0.2, 1.0)))
+        em.add_component(e, MeshRenderer(shader=shader))
+    for i in range(3):
+        e = em.create_entity()
+        em.add_component(e, Transform(x=(i - 1) * 2.0, y=1.0, z=2.0))
+        em.add_component(e, LightComponent(type=LightType.POINT, intensity=2.0, range=6.0))
+    cam = em.create_entity()
+    em.add_component(cam, Transform(z=6.0))
+    em.add_component(cam, CameraComponent(aspect=4 / 3))
+    scene.add_system(RenderSystem(ctx, scene, render_path=render_path))
+    return scene
+
+
+@pytest.mark.parametrize("path", ["FORWARD", "FORWARD_PREPASS", "DEFERRED"])
+def test_graph_with_passthrough_matches_direct(offscreen, path):
+    from zengine.ecs.systems.render_graph_system import RenderGraphSystem
+    from zengine.ecs.systems.render_system import RenderPath
+    from zengine.graphics.shader_library import ShaderLibrary
+
+    ctx = offscreen.ctx
+    direct = offscreen.render(build_scene(ctx, RenderPath[path])).color
+
+    scene = build_scene(ctx, RenderPath[path])
+    graph = RenderGraphSystem(ctx)
+    lib = ShaderLibrary.for_context(ctx)
+    graph.add_post_effect(lib.from_source(lib.source("fullscreen_vert.glsl"), PASSTHROUGH_FRAG))
+    scene.add_system(graph)
+    through = offscreen.render(scene).color
+    graph.pool.release_all()
+
+    background = np.round(np.asarray(scene.clear_color[:3]) * 255)
+    assert np.abs(direct[0, 0, :3].astype(int) - background).max() <= 1
+    diff = np.abs(direct[..., :3].astype(int) - through[..., :3].astype(int))
+    assert (direct[..., :3] != direct[0, 0, :3]).any(axis=-1).mean() > 0.05, "scene should cover the view"
+    assert diff.max() <= 2, f"{path}: graph output differs by up to {diff.max()}"
@@ -0,0 +1,142 @@
+# tests/test_shader_library.py
+
+import os
+
+import pytest
+
+from zengine.graphics.shader import preprocess
+
+VERT = """#version 330 core
+in vec3 in_position;
+#include "common.glsl"
+void main() { gl_Position = vec4(in_position * scale(), 1.0); }
+"""
+
+FRAG = """#version 330 core
+out vec4 frag_color;
+void main() {
+#if RED
+    frag_color = vec4(1.0, 0.0, 0.0, 1.0);
+#else
+    frag_color = vec4(1.0);
+#endif
+}
+"""
+
+
+def write(directory, name, text):
+    path = os.path.join(str(directory), name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
+
+
+# --- preprocess: includes and defines (no GL needed) -------------------------------------
+
+def test_includes_expand_recursively_relative_then_search_paths(tmp_path):
+    write(tmp_path / "lib", "shared.glsl", '#include "deeper.glsl"\nfloat shared_value;\n')
+    write(tmp_path / "lib", "deeper.glsl", "float deeper_value;\n")
+    write(tmp_path / "src", "local.glsl", "float local_value;\n")
+    source = '#version 330\n#include "local.glsl"\n#include <shared.glsl>\nvoid main() {}\n'
+
+    included = set()
+    out = preprocess(source, str(tmp_path / "src"), [str(tmp_path / "lib")], None, included)
+    assert "#include" not in out
+    assert out.index("local_value") < out.index("deeper_value") < out.index("shared_value")
+    assert included == {os.path.normpath(str(tmp_path / d / f)) for d, f in
+                        (("src", "local.glsl"), ("lib", "shared.glsl"), ("lib", "deeper.glsl"))}
+
+
+def test_each_file_is_included_once_and_cycles_terminate(tmp_path):
+    write(tmp_path, "a.glsl", '#include "b.glsl"\nfloat a_value;\n')
+    write(tmp_path, "b.glsl", '#include "a.glsl"\nfloat b_value;\n')
+    out = preprocess('#include "a.glsl"\n#include "b.glsl"\n', str(tmp_path))
+    assert out.count("a_value") == 1 and out.count("b_value") == 1
+
+
+def test_included_version_lines_are_dropped(tmp_path):
+    write(tmp_path, "inc.glsl", "#version 330 core\nfloat x;\n")
+    out = preprocess('#version 330 core\n#include "inc.glsl"\n', str(tmp_path))
+    assert out.count("#version") == 1
+
+
+def test_missing_include_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        preprocess('#include "nowhere.glsl"\n', str(tmp_path))
+
+
+def test_defines_go_right_after_version():
+    out = preprocess("// header\n#version 330 core\nvoid main() {}\n", defines={"B": 2, "A": True, "C": False})
+    lines = out.splitlines()
+    v = lines.index("#version 330 core")
+    assert lines[v + 1:v + 4] == ["#define A 1", "#define B 2", "#define C 0"]
+    assert lines[0] == "// header"
+
+
+def test_defines_lead_a_source_without_version():
+    assert preprocess("void main() {}\n", defines={"X": 3}).startswith("#define X 3\n")
+
+
+def test_includes_never_get_defines(tmp_path):
+    write(tmp_path, "inc.glsl", "#version 330\nfloat y;\n")
+    out = preprocess('#version 330\n#include "inc.glsl"\n', str(tmp_path), defines={"X": 1})
+    assert out.count("#define X 1") == 1
+
+
+# --- ShaderLibrary: dedupe and variants ---------------------------------------------------
+
+@pytest.fixture
+def library(offscreen, tmp_path):
+    from zengine.graphics.shader_library import ShaderLibrary
+    write(tmp_path, "common.glsl", "float scale() { return 1.0; }\n")
+    write(tmp_path, "test_vert.glsl", VERT)
+    write(tmp_path, "test_frag.glsl", FRAG)
+    write(tmp_path / "copy", "test_frag.glsl", FRAG)
+    return ShaderLibrary(offscreen.ctx, search_paths=[str(tmp_path)])
+
+
+def test_loading_twice_compiles_once(library, tmp_path):
+    a = library.load("test_vert.glsl", "test_frag.glsl")
+    b = library.load("test_vert.glsl", "test_frag.glsl")
+    assert a is b
+    assert library.stats == {"compiled": 1, "reused": 1}
+    assert a.files == {os.path.abspath(str(tmp_path / f)) for f in ("test_vert.glsl", "test_frag.glsl", "common.glsl")}
+
+
+def test_identical_sources_from_other_paths_share_a_program(library, tmp_path):
+    a = library.load("test_vert.glsl", "test_frag.glsl")
+    b = library.load("test_vert.glsl", str(tmp_path / "copy" / "test_frag.glsl"))
+    assert a is b
+    assert library.stats["compiled"] == 1
+
+
+def test_unused_defines_do_not_fork_programs(library):
+    plain = library.load("test_vert.glsl", "test_frag.glsl")
+    assert library.load("test_vert.glsl", "test_frag.glsl", defines={"UNUSED": 1}) is plain
+    red = library.load("test_vert.glsl", "test_frag.glsl", defines={"RED": True, "UNUSED": 1})
+    assert red is not plain
+    assert red.defines == {"RED": True}
+    assert "#define RED 1" in red.fragment_source
+
+
+def test_variants_are_cached(library):
+    plain = library.load("test_vert.glsl", "test_frag.glsl")
+    red = library.variant(plain, RED=True)
+    assert red is not plain
+    assert library.variant(plain, RED=True) is red
+    assert library.variant(red, RED=True) is red
+    assert library.variant(plain) is plain
+    assert library.stats["compiled"] == 2
+
+    # RED=False still differs from no define: `#define RED 0` is part of the source
+    off = library.variant(red, RED=False)
+    assert off is not red and off.defines == {"RED": False}
+    assert library.variant(plain, RED=False) is off
+
+
+def test_variant_of_a_foreign_shader_is_itself(library):
+    shader = library.from_source(library.source("test_vert.glsl"), library.source("test_frag.glsl"))
+    assert shader.name is None
+    assert library.variant(shader, RED=True) is shader
+    assert library.load("test_vert.glsl", "test_frag.glsl") is shader, "same sources, same program"
@@ -0,0 +1,100 @@
+# tests/test_shadow_reuse.py
+
+import numpy as np
+
+
+def build_scene(ctx, light_z=2.0, interval=1, path="FORWARD"):
+    from zengine.core.scene import Scene
+    from zengine.ecs.components import Transform, MeshFilter, Material, MeshRenderer
+    from zengine.ecs.components.camera import CameraComponent
+    from zengine.ecs.components.light import LightComponent, LightType
+    from zengine.ecs.systems.camera_system import CameraSystem
+    from zengine.ecs.systems.render_system import RenderSystem, RenderPath
+    from zengine.ecs.systems.shadow_system import ShadowSystem
+    from zengine.graphics.shader_library import ShaderLibrary
+    from zengine.util.mesh_factory import MeshFactory
+
+    scene = Scene()
+    em = scene.entity_manager
+    shader = ShaderLibrary.for_context(ctx).load("basic_vert.glsl", "basic_frag.glsl")
+    scene.add_system(CameraSystem())
+    for mesh, z in ((MeshFactory.plane("floor", 12.0, 12.0), 0.0), (MeshFactory.cube("cube", 1.0), 0.5)):
+        e = em.create_entity()
+        em.add_component(e, Transform(z=z))
+        em.add_component(e, MeshFilter(mesh))
+        em.add_component(e, Material(shader=shader, albedo=(0.8, 0.8, 0.8, 1.0)))
+        em.add_component(e, MeshRenderer(shader=shader))
+    light = em.create_entity()
+    em.add_component(light, Transform(z=light_z))
+    em.add_component(light, LightComponent(type=LightType.POINT, intensity=3.0, range=12.0, casts_shadows=True,
+                                           shadow_resolution=256, shadow_bias=0.03,
+                                           shadow_update_interval=interval))
+    cam = em.create_entity()
+    em.add_component(cam, Transform(z=8.0))
+    em.add_component(cam, CameraComponent(aspect=4 / 3))
+    shadows = ShadowSystem(ctx, scene)
+    scene.add_system(shadows)
+    scene.add_system(RenderSystem(ctx, scene, render_path=RenderPath[path]))
+    return scene, shadows, em.get_component(light, Transform)
+
+
+def counts(shadows):
+    return shadows.stats["rendered"], shadows.stats["reused"]
+
+
+def test_faces_are_reused_until_the_interval_passes(offscreen):
+    scene, shadows, light = build_scene(offscreen.ctx, interval=3)
+    offscreen.render(scene)
+    assert counts(shadows) == (6, 0)
+    offscreen.render(scene)
+    assert counts(shadows) == (6, 6), "nothing changed: every face is reused"
+
+    light.z = 3.0
+    offscreen.render(scene)
+    assert counts(shadows) == (6, 12), "changed faces wait out shadow_update_interval"
+    shadow = shadows.points[0]
+    assert all(face[:3] == (0.0, 0.0, 2.0) for face in shadow.face_lights)
+    assert shadow.position == (0.0, 0.0, 3.0)
+
+    offscreen.render(scene)
+    assert counts(shadows) == (12, 12), "three frames after the last render"
+    assert all(face[:3] == (0.0, 0.0, 3.0) for face in shadow.face_lights)
+
+
+def test_reused_faces_are_sampled_from_where_they_were_rendered(offscreen):
+    ctx = offscreen.ctx
+    scene, _, light = build_scene(ctx, light_z=2.0, interval=100)
+    offscreen.render(scene)
+    light.z = 3.5
+    reused = offscreen.render(scene).color.astype(int)
+
+    fresh_scene, _, _ = build_scene(ctx, light_z=3.5)
+    fresh = offscreen.render(fresh_scene).color.astype(int)
+
+    # open floor away from the cube is lit in both: a face rendered from z=2 must
+    # not compare its depths against distances from z=3.5
+    h, w = fresh.shape[:2]
+    corner = (slice(h // 8, h // 4), slice(w // 8, w // 4))
+    assert fresh[corner][..., :3].mean() > 40
+    assert np.abs(reused[corner][..., :3] - fresh[corner][..., :3]).max() <= 3
+
+
+def test_deferred_keeps_shadows_by_shading_forward(offscreen):
+    from zengine.ecs.components.light import LightComponent
+    from zengine.ecs.systems.render_system import RenderSystem, RenderPath
+
+    ctx = offscreen.ctx
+    scene, _, _ = build_scene(ctx, path="DEFERRED")
+    deferred = offscreen.render(scene).color.astype(int)
+    renderer = scene.get_system(RenderSystem)
+    assert renderer.active_path is RenderPath.FORWARD_PREPASS
+
+    prepass_scene, _, _ = build_scene(ctx, path="FORWARD_PREPASS")
+    prepass = offscreen.render(prepass_scene).color.astype(int)
+    assert np.abs(deferred - prepass).max() <= 1
+
+    em = scene.entity_manager
+    for eid in em.get_entities_with(LightComponent):
+        em.get_component(eid, LightComponent).casts_shadows = False
+    offscreen.render(scene)
+    assert renderer.active_path is RenderPath.DEFERRED
@@ -0,0 +1,139 @@
+# tests/test_skeleton_pose.py
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from scipy.spatial.transform import Rotation
+
+from zengine.animation.skeleton_pose import SkeletonPose
+from zengine.animation.skin_utils import compute_joint_matrices, skeleton_pose, invalidate_pose
+
+
+def reference_joint_matrices(nodes, joint_nodes, inverse_bind_matrices, overrides=None):
+    """The straightforward recursive walk SkeletonPose replaces."""
+    local = []
+    for i, node in enumerate(nodes):
+        if overrides and i in overrides:
+            local.append(np.asarray(overrides[i], dtype='f8'))
+            continue
+        m = np.eye(4)
+        if node.scale:
+            m = np.diag(list(node.scale) + [1.0]) @ m
+        if node.rotation:
+            r = np.eye(4)
+            r[:3, :3] = Rotation.from_quat(node.rotation).as_matrix()
+            m = r @ m
+        if node.translation:
+            t = np.eye(4)
+            t[:3, 3] = node.translation
+            m = t @ m
+        local.append(m)
+
+    world = [None] * len(nodes)
+
+    def walk(i, parent):
+        world[i] = parent @ local[i]
+        for c in nodes[i].children or []:
+            walk(c, world[i])
+
+    children = {c for n in nodes for c in (n.children or [])}
+    for root in range(len(nodes)):
+        if root not in children:
+            walk(root, np.eye(4))
+    return np.array([world[j] @ ibm for j, ibm in zip(joint_nodes, inverse_bind_matrices)])
+
+
+def random_gltf(rng, count=24, roots=2):
+    """Random forest of glTF-like nodes, parents not necessarily listed before children."""
+    perm = rng.permutation(count).tolist()
+    nodes = [SimpleNamespace(translation=None, rotation=None, scale=None, children=None) for _ in range(count)]
+    for k in range(roots, count):
+        parent = nodes[perm[int(rng.integers(0, k))]]
+        parent.children = (parent.children or []) + [perm[k]]
+    for node in nodes:
+        if rng.random() < 0.8:
+            node.translation = rng.uniform(-2, 2, 3).tolist()
+        if rng.random() < 0.8:
+            node.rotation = Rotation.random(random_state=int(rng.integers(1 << 30))).as_quat().tolist()
+        if rng.random() < 0.5:
+            node.scale = rng.uniform(0.5, 1.5, 3).tolist()
+    return SimpleNamespace(nodes=nodes)
+
+
+def random_skin(rng, gltf, joints=10):
+    joint_nodes = rng.choice(len(gltf.nodes), joints, replace=False).tolist()
+    ibms = np.repeat(np.eye(4, dtype='f4')[None], joints, axis=0)
+    ibms[:, :3, 3] = rng.uniform(-1, 1, (joints, 3))
+    return SimpleNamespace(joint_nodes=joint_nodes, inverse_bind_matrices=ibms)
+
+
+def assert_close(actual, expected):
+    np.testing.assert_allclose(actual, expected, rtol=1e-4, atol=1e-4)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+def test_joint_matrices_match_recursive_walk(seed):
+    rng = np.random.default_rng(seed)
+    gltf = random_gltf(rng)
+    skin = random_skin(rng, gltf)
+    expected = reference_joint_matrices(gltf.nodes, skin.joint_nodes, skin.inverse_bind_matrices)
+    assert_close(compute_joint_matrices(gltf, skin), expected)
+
+
+def test_levels_are_parent_before_child():
+    pose = SkeletonPose.from_gltf(random_gltf(np.random.default_rng(4)))
+    for level in pose.levels:
+        parents = pose.parents[level]
+        assert (parents < level.start).all()
+    assert (pose.parents[pose.levels[0]] == -1).all()
+    assert sorted(pose.order.tolist()) == list(range(len(pose.order)))
+
+
+def test_pose_overrides_replace_local_matrices():
+    rng = np.random.default_rng(5)
+    gltf = random_gltf(rng)
+    skin = random_skin(rng, gltf)
+    m = np.eye(4, dtype='f4')
+    m[:3, :3] = Rotation.from_euler('xyz', [0.3, -0.2, 0.9]).as_matrix()
+    m[:3, 3] = (0.5, 1.0, -2.0)
+    overrides = {skin.joint_nodes[0]: m, skin.joint_nodes[3]: np.eye(4, dtype='f4')}
+    expected = reference_joint_matrices(gltf.nodes, skin.joint_nodes, skin.inverse_bind_matrices, overrides)
+    assert_close(compute_joint_matrices(gltf, skin, overrides), expected)
+
+
+def test_posing_the_cached_pose_and_invalidating_it():
+    rng = np.random.default_rng(6)
+    gltf = random_gltf(rng)
+    skin = random_skin(rng, gltf)
+    pose = skeleton_pose(gltf)
+    assert skeleton_pose(gltf) is pose
+
+    node = skin.joint_nodes[0]
+    gltf.nodes[node].translation = [3.0, -1.0, 0.5]
+    pose.translation[pose.slot[node]] = gltf.nodes[node].translation
+    expected = reference_joint_matrices(gltf.nodes, skin.joint_nodes, skin.inverse_bind_matrices)
+    assert_close(compute_joint_matrices(gltf, skin), expected)
+
+    # node edits are only seen after invalidate_pose()
+    gltf.nodes[node].rotation = [0.0, 0.0, np.sin(0.4), np.cos(0.4)]
+    expected = reference_joint_matrices(gltf.nodes, skin.joint_nodes, skin.inverse_bind_matrices)
+    assert not np.allclose(compute_joint_matrices(gltf, skin), expected, atol=1e-4)
+    invalidate_pose(gltf)
+    assert_close(compute_joint_matrices(gltf, skin), expected)
+
+
+def test_batched_crowd_matches_each_character():
+    rng = np.random.default_rng(7)
+    gltf = random_gltf(rng)
+    skin = random_skin(rng, gltf)
+    crowd = SkeletonPose.from_gltf(gltf).batch(5)
+    crowd.rotation[:] = Rotation.random(5 * len(gltf.nodes), random_state=8).as_quat().reshape(5, -1, 4)
+    palettes = crowd.joint_matrices(skin.joint_nodes, skin.inverse_bind_matrices)
+    assert palettes.shape == (5, len(skin.joint_nodes), 4, 4)
+
+    for c in range(5):
+        for i, node in enumerate(gltf.nodes):
+            node.rotation = crowd.rotation[c, crowd.slot[i]].tolist()
+        expected = reference_joint_matrices(gltf.nodes, skin.joint_nodes, skin.inverse_bind_matrices)
+        assert_close(palettes[c], expected)
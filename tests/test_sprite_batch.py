@@ -0,0 +1,111 @@
+# tests/test_sprite_batch.py
+
+import math
+
+import numpy as np
+import pytest
+
+from zengine.ecs.systems.sprite_batch_system import build_vertices
+
+
+def make_scene(ctx, count=6):
+    from zengine.core.scene import Scene
+    from zengine.ecs.components import Transform
+    from zengine.ecs.components.camera import CameraComponent
+    from zengine.ecs.components.sprite_renderer import SpriteRenderer
+    from zengine.ecs.systems.camera_system import CameraSystem
+    from zengine.ecs.systems.sprite_batch_system import SpriteBatchSystem
+
+    scene = Scene()
+    em = scene.entity_manager
+    scene.add_system(CameraSystem())
+    eids = []
+    for i in range(count):
+        e = em.create_entity()
+        em.add_component(e, Transform(x=i - count / 2, y=0.0))
+        em.add_component(e, SpriteRenderer(texture=None, size=(0.5, 0.5), layer=i % 2))
+        eids.append(e)
+    cam = em.create_entity()
+    em.add_component(cam, Transform(z=6.0))
+    em.add_component(cam, CameraComponent(aspect=4 / 3))
+    sprites = SpriteBatchSystem(ctx, scene)
+    scene.add_system(sprites)
+    return scene, sprites, eids
+
+
+def quad(sprites, eid):
+    """(4, 9) vertices of a sprite as they are in the GPU buffer."""
+    slot = sprites._slot[eid]
+    data = np.frombuffer(sprites.vbo.read(), dtype='f4').reshape(-1, 4, 9)
+    return data[slot]
+
+
+def test_build_vertices_rotates_about_the_pivot():
+    angle = 0.7
+    v = build_vertices(np.array([[1.0, 2.0, 0.5]], dtype='f4'), np.array([[math.cos(angle), math.sin(angle)]], dtype='f4'),
+                       np.array([[2.0, 1.0]], dtype='f4'), np.array([[0.5, 0.5]], dtype='f4'),
+                       np.array([[0.0, 0.0, 1.0, 1.0]], dtype='f4'), np.ones((1, 4), dtype='f4'))[0]
+    c, s = math.cos(angle), math.sin(angle)
+    for corner, (lx, ly) in zip(v, [(-1.0, -0.5), (1.0, -0.5), (1.0, 0.5), (-1.0, 0.5)]):
+        assert corner[0] == pytest.approx(1.0 + lx * c - ly * s, abs=1e-6)
+        assert corner[1] == pytest.approx(2.0 + lx * s + ly * c, abs=1e-6)
+        assert corner[2] == pytest.approx(0.5)
+
+
+def test_moved_and_edited_sprites_are_redrawn_without_hints(offscreen):
+    from zengine.ecs.components import Transform
+    from zengine.ecs.components.sprite_renderer import SpriteRenderer
+
+    scene, sprites, eids = make_scene(offscreen.ctx)
+    em = scene.entity_manager
+    offscreen.render(scene)
+    assert sprites.stats["updated"] == len(eids)
+    offscreen.render(scene)
+    assert sprites.stats["updated"] == 0
+
+    em.get_component(eids[1], Transform).x += 1.0
+    em.get_component(eids[3], SpriteRenderer).tint = (1.0, 0.0, 0.0, 1.0)
+    before = quad(sprites, eids[1]).copy()
+    offscreen.render(scene)
+    assert sprites.stats["updated"] == 2
+    assert np.allclose(quad(sprites, eids[1])[:, 0], before[:, 0] + 1.0)
+    assert np.allclose(quad(sprites, eids[3])[:, 5:9], (1.0, 0.0, 0.0, 1.0))
+
+    # a layer change reorders the draws
+    em.get_component(eids[0], SpriteRenderer).layer = 5
+    offscreen.render(scene)
+    assert sprites._runs[-1][0] is sprites.white and sprites._runs[-1][2] == 6
+
+
+def test_removed_components_free_their_slots(offscreen):
+    from zengine.ecs.components import Transform
+    from zengine.ecs.components.sprite_renderer import SpriteRenderer
+
+    scene, sprites, eids = make_scene(offscreen.ctx)
+    em = scene.entity_manager
+    offscreen.render(scene)
+    del em.components[SpriteRenderer][eids[0]]
+    del em.components[Transform][eids[2]]
+    offscreen.render(scene)
+    assert sprites.count == len(eids) - 2
+    assert set(sprites._slot) == set(eids) - {eids[0], eids[2]}
+    for eid, slot in sprites._slot.items():
+        assert sprites.eids[slot] == eid
+        assert np.allclose(quad(sprites, eid)[:, 0].mean(), em.get_component(eid, Transform).x)
+
+
+def test_mark_dirty_drives_updates_when_detection_is_off(offscreen):
+    from zengine.ecs.components import Transform
+
+    scene, sprites, eids = make_scene(offscreen.ctx)
+    sprites.detect_changes = False
+    em = scene.entity_manager
+    offscreen.render(scene)
+    tr = em.get_component(eids[2], Transform)
+    tr.y = 1.0
+    offscreen.render(scene)
+    assert sprites.stats["updated"] == 0
+    sprites.mark_dirty(eids[2])
+    offscreen.render(scene)
+    assert sprites.stats["updated"] == 1
+    assert np.allclose(quad(sprites, eids[2])[:, 1].mean(), 1.0)
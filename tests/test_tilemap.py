@@ -0,0 +1,65 @@
+# tests/test_tilemap.py
+
+import numpy as np
+import pytest
+
+from zengine.ecs.components import Tilemap
+from zengine.ecs.components.tilemap import EMPTY
+from zengine.ecs.systems.tilemap_system import build_chunk_vertices
+
+PALETTE = [(0.0, 0.0, 0.5, 0.5), (0.5, 0.0, 0.5, 0.5), (0.0, 0.5, 0.5, 0.5)]
+
+
+def test_set_tile_rejects_ids_outside_the_palette():
+    tm = Tilemap(palette=list(PALETTE), chunk_size=4)
+    tm.set_tile(1, 2, 2)
+    tm.set_tile(1, 2, EMPTY)
+    assert tm.get_tile(1, 2) == EMPTY
+    for tile in (3, 99, -2):
+        with pytest.raises(ValueError):
+            tm.set_tile(5, 5, tile)
+    assert tm.get_tile(5, 5) == EMPTY
+    assert (1, 1) not in tm.chunks, "a rejected write creates no chunk"
+
+
+def test_fill_is_rejected_as_a_whole():
+    tm = Tilemap(palette=list(PALETTE), chunk_size=4)
+    tiles = np.zeros((3, 6), dtype=np.int32)
+    tiles[2, 5] = len(PALETTE)
+    with pytest.raises(ValueError):
+        tm.fill(2, 2, tiles)
+    assert not tm.chunks and not tm.dirty
+
+    tiles[2, 5] = EMPTY
+    tm.fill(2, 2, tiles)
+    assert tm.get_tile(2, 2) == 0 and tm.get_tile(7, 4) == EMPTY
+    assert tm.dirty == {(0, 0), (1, 0), (0, 1), (1, 1)}
+
+
+def test_chunk_vertices_use_each_tiles_rect():
+    block = np.full((2, 2), EMPTY, dtype=np.int32)
+    block[0, 1] = 1
+    block[1, 0] = 2
+    rects = np.array(PALETTE, dtype='f4')
+    verts = build_chunk_vertices(block, (4, 6), (2.0, 1.0), rects)
+    assert verts.shape == (2, 4, 4)
+
+    # tiles come out row by row: (x=1, y=0) then (x=0, y=1), offset by the chunk origin
+    lo = verts[..., 0:2].min(axis=1)
+    hi = verts[..., 0:2].max(axis=1)
+    assert np.allclose(lo, [(10.0, 6.0), (8.0, 7.0)])
+    assert np.allclose(hi - lo, [(2.0, 1.0), (2.0, 1.0)])
+    for quad, tile in zip(verts, (1, 2)):
+        u, v, w, h = PALETTE[tile]
+        assert np.allclose(quad[:, 2:4].min(axis=0), (u, v))
+        assert np.allclose(quad[:, 2:4].max(axis=0), (u + w, v + h))
+
+
+def test_ids_left_behind_by_a_shrunk_palette_draw_nothing():
+    tm = Tilemap(palette=list(PALETTE), chunk_size=4)
+    tm.fill(0, 0, [[0, 1, 2]])
+    tm.palette = PALETTE[:2]
+    tm.mark_dirty()
+    verts = build_chunk_vertices(tm.chunks[(0, 0)], (0, 0), tm.tile_size,
+                                 np.array(tm.palette, dtype='f4'))
+    assert len(verts) == 2, "tile 2 is no longer in the palette and is skipped, not drawn as tile 1"
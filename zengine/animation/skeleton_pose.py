@@ -0,0 +1,129 @@
+# zengine/animation/skeleton_pose.py
+
+import numpy as np
+
+from zengine.util.transforms import quats_to_mat3
+
+
+def node_trs(nodes):
+    """Local (translation, rotation xyzw, scale) of glTF nodes as (N,3), (N,4), (N,3) f4 arrays."""
+    n = len(nodes)
+    t = np.zeros((n, 3), dtype='f4')
+    r = np.zeros((n, 4), dtype='f4')
+    r[:, 3] = 1.0
+    s = np.ones((n, 3), dtype='f4')
+    for i, node in enumerate(nodes):
+        if node.translation:
+            t[i] = node.translation
+        if node.rotation:
+            r[i] = node.rotation
+        if node.scale:
+            s[i] = node.scale
+    return t, r, s
+
+
+def trs_matrices(translation, rotation, scale) -> np.ndarray:
+    """Batched T @ R @ S from (..., 3), (..., 4) xyzw and (..., 3) arrays -> (..., 4, 4)."""
+    translation = np.asarray(translation, dtype='f4')
+    rotation = np.asarray(rotation, dtype='f4')
+    scale = np.asarray(scale, dtype='f4')
+    lead = translation.shape[:-1]
+
+    q = rotation.reshape(-1, 4)
+    q = q / np.maximum(np.linalg.norm(q, axis=1, keepdims=True), 1e-12)
+    m = np.zeros((*lead, 4, 4), dtype='f4')
+    m[..., :3, :3] = quats_to_mat3(q).reshape(*lead, 3, 3) * scale[..., None, :]
+    m[..., :3, 3] = translation
+    m[..., 3, 3] = 1.0
+    return m
+
+
+class SkeletonPose:
+    """
+    A node hierarchy compiled for batched evaluation.
+
+    Nodes are stored parent-before-child, grouped by depth, with a
+    `parents` index array (-1 for roots) and local TRS in flat arrays.
+    Global matrices are then one batched matmul per depth level instead
+    of a recursive walk:
+
+        pose = SkeletonPose.from_gltf(gltf)
+        pose.rotation[pose.slot[node]] = quat
+        palette = pose.joint_matrices(skin.joint_nodes, skin.inverse_bind_matrices)
+
+    The TRS arrays may carry leading batch dimensions (see batch()), so
+    many characters sharing a skeleton evaluate in the same few calls.
+    """
+    def __init__(self, parents, translation, rotation, scale, order):
+        self.parents = np.asarray(parents, dtype=np.int64)     # per slot, slot of the parent or -1
+        self.order = np.asarray(order, dtype=np.int64)         # per slot, original node index
+        self.slot = np.empty(len(self.order), dtype=np.int64)  # per node index, its slot
+        self.slot[self.order] = np.arange(len(self.order))
+        self.translation = np.asarray(translation, dtype='f4')
+        self.rotation = np.asarray(rotation, dtype='f4')
+        self.scale = np.asarray(scale, dtype='f4')
+
+        # contiguous slot ranges of equal depth; roots first
+        depth = np.zeros(len(self.parents), dtype=np.int64)
+        for i, p in enumerate(self.parents.tolist()):
+            if p >= 0:
+                depth[i] = depth[p] + 1
+        bounds = np.flatnonzero(np.diff(depth)) + 1
+        starts = np.concatenate(([0], bounds)).tolist()
+        ends = np.concatenate((bounds, [len(depth)])).tolist()
+        self.levels = [slice(a, b) for a, b in zip(starts, ends)] if len(depth) else []
+
+    @staticmethod
+    def hierarchy(nodes):
+        """(order, parent node per node) of glTF nodes, order listing nodes breadth-first."""
+        parent = np.full(len(nodes), -1, dtype=np.int64)
+        for i, node in enumerate(nodes):
+            for c in node.children or []:
+                parent[c] = i
+        order = []
+        level = [i for i in range(len(nodes)) if parent[i] < 0]
+        while level:
+            order.extend(level)
+            level = [c for i in level for c in (nodes[i].children or [])]
+        return np.array(order, dtype=np.int64), parent
+
+    @classmethod
+    def from_gltf(cls, gltf) -> 'SkeletonPose':
+        """Compiles a glTF's node tree with its current local TRS."""
+        order, parent = cls.hierarchy(gltf.nodes)
+        slot = np.empty(len(order), dtype=np.int64)
+        slot[order] = np.arange(len(order))
+        parents = np.where(parent[order] >= 0, slot[np.maximum(parent[order], 0)], -1)
+        t, r, s = node_trs(gltf.nodes)
+        return cls(parents, t[order], r[order], s[order], order)
+
+    def read_nodes(self, nodes):
+        """Reloads the local TRS from glTF nodes (same hierarchy), discarding any posing."""
+        t, r, s = node_trs(nodes)
+        self.translation, self.rotation, self.scale = t[self.order], r[self.order], s[self.order]
+
+    def batch(self, count: int) -> 'SkeletonPose':
+        """`count` copies of this pose stacked along a leading axis, for a crowd."""
+        pose = SkeletonPose.__new__(SkeletonPose)
+        pose.__dict__.update(self.__dict__)
+        pose.translation = np.repeat(self.translation[None], count, axis=0)
+        pose.rotation = np.repeat(self.rotation[None], count, axis=0)
+        pose.scale = np.repeat(self.scale[None], count, axis=0)
+        return pose
+
+    def local_matrices(self) -> np.ndarray:
+        """(..., N, 4, 4) local matrices in slot order."""
+        return trs_matrices(self.translation, self.rotation, self.scale)
+
+    def global_matrices(self, local=None) -> np.ndarray:
+        """(..., N, 4, 4) global matrices in slot order, one batched matmul per depth level."""
+        g = np.array(self.local_matrices() if local is None else local, dtype='f4')
+        for level in self.levels[1:]:
+            g[..., level, :, :] = g[..., self.parents[level], :, :] @ g[..., level, :, :]
+        return g
+
+    def joint_matrices(self, joint_nodes, inverse_bind_matrices, local=None) -> np.ndarray:
+        """(..., J, 4, 4) skinning matrices: global joint transform @ inverse bind matrix."""
+        g = self.global_matrices(local)
+        joints = self.slot[np.asarray(joint_nodes, dtype=np.int64)]
+        return g[..., joints, :, :] @ np.asarray(inverse_bind_matrices, dtype='f4')
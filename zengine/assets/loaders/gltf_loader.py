@@ -69,52 +69,17 @@ def load_accessor_data(gltf, accessor_idx):
     return np.frombuffer(data, dtype=component_type).reshape((count, type_count))
 
 import numpy as np
-from scipy.spatial.transform import Rotation as R
 from zengine.assets.skin_asset import SkinAsset  # Adjust path if needed
-
-def build_local_matrix(node):
-    T = np.eye(4, dtype=np.float32)
-    Rm = np.eye(4, dtype=np.float32)
-    S = np.eye(4, dtype=np.float32)
-
-    if node.translation:
-        T[:3, 3] = node.translation
-    if node.rotation:
-        r = R.from_quat(node.rotation)
-        Rm[:3, :3] = r.as_matrix()
-    if node.scale:
-        S = np.diag(node.scale + [1.0])
-
-    return T @ Rm @ S
-
-def compute_global_transforms(gltf, node_transforms):
-    global_transforms = [None] * len(gltf.nodes)
-
-    def traverse(node_idx, parent_mat):
-        local = node_transforms[node_idx]
-        global_transforms[node_idx] = parent_mat @ local
-        children = gltf.nodes[node_idx].children or []
-        for child in children:
-            traverse(child, global_transforms[node_idx])
-
-    all_children = set(c for n in gltf.nodes if n.children for c in n.children)
-    root_nodes = [i for i in range(len(gltf.nodes)) if i not in all_children]
-    for root in root_nodes:
-        traverse(root, np.eye(4, dtype=np.float32))
-
-    return global_transforms
+from zengine.animation.skeleton_pose import SkeletonPose
 
 def load_skin_data(gltf, skin):
     skin_obj = gltf.skins[skin] if isinstance(skin, int) else skin
     joint_nodes = skin_obj.joints
     joint_names = [gltf.nodes[j].name for j in joint_nodes]
 
-    # Build transforms
-    node_transforms = [build_local_matrix(n) for n in gltf.nodes]
-    global_transforms = compute_global_transforms(gltf, node_transforms)
-
     # Lock in inverse bind matrices from rest pose
-    inverse_binds = [np.linalg.inv(global_transforms[j]) for j in joint_nodes]
+    pose = SkeletonPose.from_gltf(gltf)
+    inverse_binds = np.linalg.inv(pose.global_matrices()[pose.slot[joint_nodes]])
 
     return SkinAsset(
         joint_names=joint_names,
@@ -1,6 +1,6 @@
 # zengine/assets/mesh_asset.py
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import numpy as np
 
 @dataclass
@@ -14,3 +14,45 @@ class MeshAsset:
     tangents: np.ndarray | None = None    # (N,3) or None
     joints:   np.ndarray | None = None    # (N,4) or None
     weights:  np.ndarray | None = None    # (N,4) or None
+
+    _bounds: tuple | None = field(default=None, init=False, repr=False, compare=False)
+
+    # bumped whenever the vertex data is replaced, by update() or by assigning
+    # a stream; GPU buffers and other per-mesh caches are keyed on it
+    revision: int = field(default=0, init=False, repr=False, compare=False)
+
+    STREAMS = ('vertices', 'normals', 'indices', 'uvs', 'tangents', 'joints', 'weights')
+
+    def __post_init__(self):
+        object.__setattr__(self, 'revision', 0)     # __init__'s stream assignments don't count
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in self.STREAMS:
+            object.__setattr__(self, '_bounds', None)
+            object.__setattr__(self, 'revision', self.revision + 1)
+
+    def update(self, **arrays):
+        """Replaces vertex data in place (e.g. on hot-reload) and invalidates derived caches."""
+        for name in arrays:
+            if name not in self.STREAMS:
+                raise AttributeError(f"MeshAsset has no vertex stream '{name}'")
+        for name, value in arrays.items():
+            object.__setattr__(self, name, value)
+        self._bounds = None
+        self.revision += 1
+
+    def bounds(self):
+        """
+        Local-space AABB (lo, hi) of the vertices, computed once and cached.
+        Reset by update() or by assigning a stream; after editing the vertex
+        array in place, call update() to refresh it.
+        """
+        if self._bounds is None:
+            v = self.vertices
+            if v is not None and len(v) > 0:
+                v = np.asarray(v, dtype='f4').reshape(-1, 3)
+                self._bounds = (v.min(axis=0), v.max(axis=0))
+            else:
+                self._bounds = (np.zeros(3, dtype='f4'), np.zeros(3, dtype='f4'))
+        return self._bounds
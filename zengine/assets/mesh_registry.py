@@ -3,10 +3,17 @@
 from zengine.assets.mesh_asset import MeshAsset
 class MeshRegistry:
     _meshes: dict[str, MeshAsset] = {}
+    _sources: dict[str, tuple] = {}     # name -> (path, loader) for file-backed meshes
 
     @classmethod
-    def register(cls, mesh: MeshAsset):
+    def register(cls, mesh: MeshAsset, path: str | None = None, loader=None):
+        """
+        `path` and `loader(path) -> MeshAsset` mark a mesh as file-backed, so it
+        can be reloaded (see HotReloadSystem). The loader must not touch GL.
+        """
         cls._meshes[mesh.name] = mesh
+        if path is not None and loader is not None:
+            cls._sources[mesh.name] = (path, loader)
 
     @classmethod
     def get(cls, name: str) -> MeshAsset:
@@ -15,3 +22,8 @@ class MeshRegistry:
     @classmethod
     def all_names(cls) -> list[str]:
         return list(cls._meshes.keys())
+
+    @classmethod
+    def source(cls, name: str):
+        """(path, loader) of a file-backed mesh, or None."""
+        return cls._sources.get(name)
@@ -21,6 +21,7 @@ uniform float smoothness;          // 0..1
 // ambient + camera
 uniform vec3 u_ambient_color;
 uniform vec3 camera_position;
+uniform mat4 view;
 
 // lights (keep names you already use)
 #define MAX_LIGHTS 16
@@ -28,7 +29,25 @@ uniform int   light_count;
 uniform vec3  light_position[MAX_LIGHTS];
 uniform vec3  light_color[MAX_LIGHTS];
 uniform float light_intensity[MAX_LIGHTS];
-uniform float light_range[MAX_LIGHTS];
+uniform float light_range[MAX_LIGHTS];     // < 0: directional, no falloff
+uniform int   light_shadow[MAX_LIGHTS];    // -1 none, 0 cascades, n > 0 point shadow n - 1
+
+// shadows (see zengine/ecs/systems/shadow_system.py)
+#define MAX_CASCADES 4
+#define MAX_POINT_SHADOWS 4
+uniform bool u_receive_shadows;
+
+uniform sampler2DShadow u_cascade_atlas;   // cascades side by side
+uniform int   u_cascade_count;
+uniform mat4  u_cascade_vp[MAX_CASCADES];
+uniform float u_cascade_split[MAX_CASCADES];
+uniform float u_cascade_bias;
+
+uniform sampler2DShadow u_point_shadow_atlas;            // one row of six faces per light
+uniform mat4  u_point_shadow_vp[MAX_POINT_SHADOWS * 6];  // +X -X +Y -Y +Z -Z
+uniform vec4  u_point_shadow_rect[MAX_POINT_SHADOWS];    // uv origin and size of face 0
+uniform vec4  u_point_shadow_face[MAX_POINT_SHADOWS * 6]; // position, range each face was rendered from
+uniform float u_point_shadow_bias[MAX_POINT_SHADOWS];
 
 vec3 apply_normal_map(vec3 N, vec3 T) {
     vec3 n = normalize(N);
@@ -38,6 +57,55 @@ vec3 apply_normal_map(vec3 N, vec3 T) {
     return normalize(mat3(t, b, n) * nn);
 }
 
+float cascade_shadow(vec3 P) {
+    float depth = -(view * vec4(P, 1.0)).z;
+    int c = 0;
+    while (c < u_cascade_count && depth > u_cascade_split[c]) ++c;
+    if (c >= u_cascade_count) return 1.0;
+
+    vec4 clip = u_cascade_vp[c] * vec4(P, 1.0);
+    vec3 ndc = clip.xyz / clip.w * 0.5 + 0.5;
+    if (ndc.z > 1.0) return 1.0;
+
+    // stay inside this cascade's tile so filtering never reads a neighbour
+    float tiles = float(u_cascade_count);
+    vec2 texel = 1.0 / vec2(textureSize(u_cascade_atlas, 0));
+    vec2 uv = vec2((float(c) + clamp(ndc.x, 0.0, 1.0)) / tiles, clamp(ndc.y, 0.0, 1.0));
+    uv = clamp(uv, vec2(float(c) / tiles, 0.0) + texel, vec2(float(c + 1) / tiles, 1.0) - texel);
+    return texture(u_cascade_atlas, vec3(uv, ndc.z - u_cascade_bias));
+}
+
+float point_shadow(int s, vec3 P) {
+    // a map reused from an earlier frame holds distances from where the light was
+    // then; a light's faces are rendered together, so face 0 has that position
+    vec3  d = P - u_point_shadow_face[s * 6].xyz;
+    vec3  a = abs(d);
+    int face;
+    if (a.x >= a.y && a.x >= a.z) face = d.x > 0.0 ? 0 : 1;
+    else if (a.y >= a.z)          face = d.y > 0.0 ? 2 : 3;
+    else                          face = d.z > 0.0 ? 4 : 5;
+
+    vec4 clip = u_point_shadow_vp[s * 6 + face] * vec4(P, 1.0);
+    vec2 uv = clamp(clip.xy / clip.w * 0.5 + 0.5, 0.0, 1.0);
+
+    vec4 rect = u_point_shadow_rect[s];
+    vec2 texel = 1.0 / vec2(textureSize(u_point_shadow_atlas, 0));
+    vec2 lo = rect.xy + vec2(float(face) * rect.z, 0.0);
+    uv = clamp(lo + uv * rect.zw, lo + texel, lo + rect.zw - texel);
+
+    vec4 origin = u_point_shadow_face[s * 6 + face];
+    float ref = length(P - origin.xyz) / origin.w - u_point_shadow_bias[s];
+    return texture(u_point_shadow_atlas, vec3(uv, ref));
+}
+
+float shadow_factor(int i, vec3 P) {
+    if (!u_receive_shadows) return 1.0;
+    int s = light_shadow[i];
+    if (s == 0) return cascade_shadow(P);
+    if (s > 0)  return point_shadow(s - 1, P);
+    return 1.0;
+}
+
 void main() {
     // base color (preserve alpha)
     vec4 base = u_has_albedo_map ? texture(albedo_texture, frag_uv) : albedo;
@@ -63,9 +131,14 @@ void main() {
         float dist = length(Ldir);
         vec3  L    = (dist > 0.0) ? Ldir / dist : vec3(0.0, 0.0, 1.0);
 
-        float r = max(light_range[i], 0.0001);
-        float att = clamp(1.0 - (dist / r), 0.0, 1.0);
-        att *= att;
+        float att = 1.0;
+        if (light_range[i] >= 0.0) {
+            float r = max(light_range[i], 0.0001);
+            att = clamp(1.0 - (dist / r), 0.0, 1.0);
+            att *= att;
+        }
+        if (att <= 0.0) continue;
+        att *= shadow_factor(i, frag_pos);
 
         float ndl = max(dot(N, L), 0.0);
         vec3  diffuse  = light_color[i] * light_intensity[i] * ndl;
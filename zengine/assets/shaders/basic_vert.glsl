@@ -11,7 +11,7 @@ in vec4 in_weights;
 uniform mat4 model;
 uniform mat4 view;
 uniform mat4 projection;
-uniform mat4 joint_matrices[64];
+uniform vec4 u_uv_rect;     // (offset, size) of the material's atlas region, (0, 0, 1, 1) otherwise
 
 // varyings
 out vec3 frag_pos;
@@ -19,29 +19,37 @@ out vec3 frag_normal;
 out vec3 frag_tangent;
 out vec2 frag_uv;
 
+// depth pre-pass and shading pass must produce bit-identical depth
+invariant gl_Position;
+
+// SKINNED = 0 compiles the joint loop out (ShaderLibrary variant for static meshes)
+#ifndef SKINNED
+#define SKINNED 1
+#endif
+
+#if SKINNED
+#include "include/joint_palette.glsl"
+#endif
+
 void main() {
-    // ----- Safe 0..4 bone skinning -----
-    float wsum = in_weights.x + in_weights.y + in_weights.z + in_weights.w;
-    mat4 skin = (wsum > 0.0) ? mat4(0.0) : mat4(1.0);
-    if (wsum > 0.0) {
-        for (int i = 0; i < 4; ++i) {
-            int ji = int(in_joints[i]);
-            if (ji >= 0 && ji < 64) {
-                skin += joint_matrices[ji] * in_weights[i];
-            }
-        }
-    }
+#if SKINNED
+    mat4 skin = skin_matrix(in_joints, in_weights);
 
     vec4 skinned_pos     = skin * vec4(in_position, 1.0);
     vec3 skinned_normal  = mat3(skin) * in_normal;
     vec3 skinned_tangent = mat3(skin) * in_tangent;
+#else
+    vec4 skinned_pos     = vec4(in_position, 1.0);
+    vec3 skinned_normal  = in_normal;
+    vec3 skinned_tangent = in_tangent;
+#endif
 
     vec4 world = model * skinned_pos;
 
     frag_pos     = world.xyz;
     frag_normal  = normalize(mat3(model) * skinned_normal);
     frag_tangent = normalize(mat3(model) * skinned_tangent);
-    frag_uv      = in_uv;
+    frag_uv      = u_uv_rect.xy + in_uv * u_uv_rect.zw;
 
     gl_Position = projection * view * world;
 }
@@ -0,0 +1,14 @@
+#version 330 core
+// world-space debug lines with per-vertex color, batched into one draw
+uniform mat4 view;
+uniform mat4 projection;
+
+in vec3 in_position;
+in vec3 in_color;
+
+out vec3 v_color;
+
+void main() {
+    v_color = in_color;
+    gl_Position = projection * view * vec4(in_position, 1.0);
+}
@@ -0,0 +1,38 @@
+#version 330 core
+in vec2 frag_uv;
+
+out vec4 frag_color;
+
+// G-buffer (see zengine/graphics/gbuffer.py)
+uniform sampler2D g_albedo;      // rgb albedo, a smoothness
+uniform sampler2D g_normal;
+uniform sampler2D g_position;
+uniform sampler2D g_depth;
+
+// ambient + camera
+uniform vec3 u_ambient_color;
+uniform vec3 camera_position;
+uniform mat4 view;
+
+#include "include/clustered_lights.glsl"
+
+void main() {
+    // background: keep whatever was cleared underneath
+    float z = texture(g_depth, frag_uv).r;
+    if (z >= 1.0) discard;
+    gl_FragDepth = z;
+
+    vec4 albedo_smooth = texture(g_albedo, frag_uv);
+    vec3 N = normalize(texture(g_normal, frag_uv).xyz);
+    vec3 P = texture(g_position, frag_uv).xyz;
+
+    vec3 V = normalize(camera_position - P);
+    float shininess = mix(8.0, 128.0, albedo_smooth.a);
+
+    vec3 lighting = u_ambient_color;
+
+    add_directional_lights(lighting, N, V, shininess);
+    add_clustered_lights(lighting, P, -(view * vec4(P, 1.0)).z, N, V, shininess);
+
+    frag_color = vec4(albedo_smooth.rgb * lighting, 1.0);
+}
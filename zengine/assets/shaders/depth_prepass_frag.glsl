@@ -0,0 +1,12 @@
+#version 330 core
+in vec2 frag_uv;
+
+// only what's needed to reproduce basic_frag's alpha discard
+uniform sampler2D albedo_texture;
+uniform bool u_has_albedo_map;
+uniform vec4 albedo;
+
+void main() {
+    float a = u_has_albedo_map ? texture(albedo_texture, frag_uv).a : albedo.a;
+    if (a <= 0.001) discard;
+}
@@ -0,0 +1,43 @@
+#version 330 core
+in vec3 frag_pos;
+in vec3 frag_normal;
+in vec3 frag_tangent;
+in vec2 frag_uv;
+
+layout(location = 0) out vec4 g_albedo;     // rgb albedo, a smoothness
+layout(location = 1) out vec4 g_normal;     // world normal
+layout(location = 2) out vec4 g_position;   // world position
+
+// textures
+uniform sampler2D albedo_texture;
+uniform sampler2D normal_map;
+
+// flags
+uniform bool u_has_albedo_map;
+uniform bool u_has_normal_map;
+
+// material
+uniform vec4  albedo;
+uniform float smoothness;
+
+vec3 apply_normal_map(vec3 N, vec3 T) {
+    vec3 n = normalize(N);
+    vec3 t = normalize(T - n * dot(T, n));
+    vec3 b = normalize(cross(n, t));
+    vec3 nn = texture(normal_map, frag_uv).xyz * 2.0 - 1.0;
+    return normalize(mat3(t, b, n) * nn);
+}
+
+void main() {
+    vec4 base = u_has_albedo_map ? texture(albedo_texture, frag_uv) : albedo;
+    if (base.a <= 0.001) discard;
+
+    vec3 N = normalize(frag_normal);
+    if (u_has_normal_map) {
+        N = apply_normal_map(N, frag_tangent);
+    }
+
+    g_albedo   = vec4(base.rgb, clamp(smoothness, 0.0, 1.0));
+    g_normal   = vec4(N, 0.0);
+    g_position = vec4(frag_pos, 1.0);
+}
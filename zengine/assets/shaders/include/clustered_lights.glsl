@@ -0,0 +1,71 @@
+// Directional + clustered point lighting shared by clustered_frag.glsl and
+// deferred_light_frag.glsl (see zengine/graphics/clustered_lighting.py)
+
+// directional lights (few, applied everywhere)
+#define MAX_DIR_LIGHTS 4
+uniform int   dir_light_count;
+uniform vec3  dir_light_direction[MAX_DIR_LIGHTS];
+uniform vec3  dir_light_color[MAX_DIR_LIGHTS];
+uniform float dir_light_intensity[MAX_DIR_LIGHTS];
+
+// clustered point lights
+uniform sampler2D  u_light_data;     // row 0: position, range; row 1: color, intensity
+uniform isampler2D u_cluster_grid;   // (offset, count) per cluster
+uniform isampler2D u_light_indices;  // light index list grouped by cluster
+uniform ivec3 u_cluster_dims;
+uniform vec4  u_cluster_depth;       // near, far, log(far / near), orthographic
+uniform vec4  u_viewport;            // x, y, width, height
+
+vec3 blinn_phong(vec3 N, vec3 L, vec3 V, vec3 radiance, float shininess) {
+    float ndl = max(dot(N, L), 0.0);
+    vec3  H = normalize(L + V);
+    float spec = pow(max(dot(N, H), 0.0), shininess);
+    return radiance * (ndl + spec);
+}
+
+int cluster_slice(float depth) {
+    float s;
+    if (u_cluster_depth.w > 0.5) {
+        s = (depth - u_cluster_depth.x) / (u_cluster_depth.y - u_cluster_depth.x);
+    } else {
+        s = log(max(depth, u_cluster_depth.x) / u_cluster_depth.x) / u_cluster_depth.z;
+    }
+    return clamp(int(s * float(u_cluster_dims.z)), 0, u_cluster_dims.z - 1);
+}
+
+void add_directional_lights(inout vec3 lighting, vec3 N, vec3 V, float shininess) {
+    int dcount = min(dir_light_count, MAX_DIR_LIGHTS);
+    for (int i = 0; i < dcount; ++i) {
+        vec3 L = -normalize(dir_light_direction[i]);
+        lighting += blinn_phong(N, L, V, dir_light_color[i] * dir_light_intensity[i], shininess);
+    }
+}
+
+// P: world position, view_depth: distance along the camera's -Z
+void add_clustered_lights(inout vec3 lighting, vec3 P, float view_depth, vec3 N, vec3 V, float shininess) {
+    // find this fragment's cluster
+    vec2  tile_uv = (gl_FragCoord.xy - u_viewport.xy) / u_viewport.zw;
+    ivec2 tile = clamp(ivec2(tile_uv * vec2(u_cluster_dims.xy)), ivec2(0), u_cluster_dims.xy - 1);
+    int   slice = cluster_slice(view_depth);
+
+    ivec2 cell = texelFetch(u_cluster_grid, ivec2(tile.x + tile.y * u_cluster_dims.x, slice), 0).xy;
+    int index_width = textureSize(u_light_indices, 0).x;
+
+    for (int k = 0; k < cell.y; ++k) {
+        int i = cell.x + k;
+        int li = texelFetch(u_light_indices, ivec2(i % index_width, i / index_width), 0).x;
+        vec4 pos_range = texelFetch(u_light_data, ivec2(li, 0), 0);
+        vec4 col_int   = texelFetch(u_light_data, ivec2(li, 1), 0);
+
+        vec3  Ldir = pos_range.xyz - P;
+        float dist = length(Ldir);
+        float r    = max(pos_range.w, 0.0001);
+        if (dist >= r) continue;
+        vec3  L    = (dist > 0.0) ? Ldir / dist : vec3(0.0, 0.0, 1.0);
+
+        float att = 1.0 - dist / r;
+        att *= att;
+
+        lighting += blinn_phong(N, L, V, col_int.rgb * col_int.a, shininess) * att;
+    }
+}
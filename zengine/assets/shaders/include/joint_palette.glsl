@@ -0,0 +1,33 @@
+// Skinning from the joint palette texture, shared by basic_vert.glsl and
+// shadow_depth_vert.glsl (see zengine/graphics/joint_palette.py)
+
+// joint palette of this draw's skeleton: u_joint_count matrices from u_joint_offset,
+// 4 RGBA32F texels each; count 0 = no skin
+uniform sampler2D u_joint_palette;
+uniform int u_joint_offset;
+uniform int u_joint_count;
+
+mat4 joint_matrix(int index) {
+    int texel = index * 4;
+    int width = textureSize(u_joint_palette, 0).x;
+    return mat4(texelFetch(u_joint_palette, ivec2((texel    ) % width, (texel    ) / width), 0),
+                texelFetch(u_joint_palette, ivec2((texel + 1) % width, (texel + 1) / width), 0),
+                texelFetch(u_joint_palette, ivec2((texel + 2) % width, (texel + 2) / width), 0),
+                texelFetch(u_joint_palette, ivec2((texel + 3) % width, (texel + 3) / width), 0));
+}
+
+// ----- Safe 0..4 bone skinning; identity for unskinned vertices or draws -----
+mat4 skin_matrix(vec4 joints, vec4 weights) {
+    float wsum = weights.x + weights.y + weights.z + weights.w;
+    if (wsum <= 0.0 || u_joint_count <= 0) {
+        return mat4(1.0);
+    }
+    mat4 skin = mat4(0.0);
+    for (int i = 0; i < 4; ++i) {
+        int ji = int(joints[i]);
+        if (ji >= 0 && ji < u_joint_count) {
+            skin += joint_matrix(u_joint_offset + ji) * weights[i];
+        }
+    }
+    return skin;
+}
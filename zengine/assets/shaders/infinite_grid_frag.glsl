@@ -0,0 +1,56 @@
+#version 330 core
+// Procedural ground grid on the XY plane (Z = 0), drawn as a fullscreen pass.
+// Each pixel's view ray is intersected with the plane; line width comes from
+// screen-space derivatives, spacing steps by 10x with camera height and the
+// grid fades out with distance, so there is no edge and cost doesn't depend
+// on the view.
+in vec2 frag_uv;
+out vec4 frag_color;
+
+uniform mat4 inv_view_projection;
+uniform mat4 view_projection;
+uniform vec3 camera_position;
+uniform vec3 color;
+uniform float u_grid_step;      // finest spacing, used close to the plane
+uniform float u_fade_distance;  // minimum fade distance; grows with height
+
+vec3 unproject(vec2 ndc, float z) {
+    vec4 p = inv_view_projection * vec4(ndc, z, 1.0);
+    return p.xyz / p.w;
+}
+
+float grid_lines(vec2 p, float spacing) {
+    vec2 coord = p / spacing;
+    vec2 width = fwidth(coord);
+    vec2 g = abs(fract(coord - 0.5) - 0.5) / max(width, vec2(1e-6));
+    return 1.0 - min(min(g.x, g.y), 1.0);
+}
+
+void main() {
+    vec2 ndc = frag_uv * 2.0 - 1.0;
+    vec3 near_p = unproject(ndc, -1.0);
+    vec3 far_p = unproject(ndc, 1.0);
+    float denom = far_p.z - near_p.z;
+    if (abs(denom) < 1e-8) discard;
+    float t = -near_p.z / denom;
+    if (t <= 0.0) discard;
+    vec3 p = near_p + t * (far_p - near_p);
+
+    // Spacing: the finest level whose cells stay a reasonable size at this height,
+    // cross-faded into the next one as the camera climbs
+    float height = max(abs(camera_position.z), u_grid_step);
+    float level = max(0.0, log(height / u_grid_step) / log(10.0) - 1.0);
+    float spacing = u_grid_step * pow(10.0, floor(level));
+    float blend = fract(level);
+    float line = max(grid_lines(p.xy, spacing * 10.0), grid_lines(p.xy, spacing) * (1.0 - blend));
+
+    float fade_distance = max(u_fade_distance, height * 20.0);
+    float fade = 1.0 - smoothstep(fade_distance * 0.5, fade_distance, length(p.xy - camera_position.xy));
+    float alpha = line * fade;
+    if (alpha <= 0.001) discard;
+
+    // Real depth, so scene geometry occludes the grid
+    vec4 clip = view_projection * vec4(p, 1.0);
+    gl_FragDepth = (clip.z / clip.w) * 0.5 + 0.5;
+    frag_color = vec4(color, alpha);
+}
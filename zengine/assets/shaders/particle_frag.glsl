@@ -0,0 +1,22 @@
+#version 330 core
+in vec2 frag_uv;
+in vec4 frag_color_in;
+
+uniform sampler2D u_texture;
+uniform bool u_has_texture;
+
+out vec4 frag_color;
+
+void main() {
+    vec4 base;
+    if (u_has_texture) {
+        base = texture(u_texture, frag_uv);
+    } else {
+        // soft round dot
+        float r = length(frag_uv - 0.5) * 2.0;
+        base = vec4(1.0, 1.0, 1.0, 1.0 - smoothstep(0.5, 1.0, r));
+    }
+    vec4 color = base * frag_color_in;
+    if (color.a < 0.01) discard;
+    frag_color = color;
+}
@@ -0,0 +1,23 @@
+#version 330 core
+// one instance per particle; the quad faces the camera (ParticleSystem)
+uniform mat4 view;
+uniform mat4 projection;
+
+in vec2 in_corner;          // per vertex, -0.5..0.5
+in vec3 in_center;          // per instance
+in float in_size;
+in vec4 in_color;
+
+out vec2 frag_uv;
+out vec4 frag_color_in;
+
+void main() {
+    // camera right / up are the first two rows of the view rotation
+    vec3 right = vec3(view[0][0], view[1][0], view[2][0]);
+    vec3 up    = vec3(view[0][1], view[1][1], view[2][1]);
+    vec3 world = in_center + (right * in_corner.x + up * in_corner.y) * in_size;
+
+    frag_uv = in_corner + 0.5;
+    frag_color_in = in_color;
+    gl_Position = projection * view * vec4(world, 1.0);
+}
@@ -0,0 +1,14 @@
+#version 330 core
+in vec3 world_pos;
+
+// point lights store linear distance / range; directional lights keep hardware depth
+uniform bool u_linear_depth;
+uniform vec4 u_light;   // position, range
+
+void main() {
+    if (u_linear_depth) {
+        gl_FragDepth = length(world_pos - u_light.xyz) / u_light.w;
+    } else {
+        gl_FragDepth = gl_FragCoord.z;
+    }
+}
@@ -0,0 +1,18 @@
+#version 330 core
+in vec3 in_position;
+in vec4 in_joints;
+in vec4 in_weights;
+
+uniform mat4 model;
+uniform mat4 light_vp;
+
+out vec3 world_pos;
+
+// skinned casters are posed like in the color pass; static meshes get count 0
+#include "include/joint_palette.glsl"
+
+void main() {
+    vec4 world = model * skin_matrix(in_joints, in_weights) * vec4(in_position, 1.0);
+    world_pos = world.xyz;
+    gl_Position = light_vp * world;
+}
@@ -0,0 +1,13 @@
+#version 330 core
+in vec2 frag_uv;
+in vec4 frag_color_in;
+
+uniform sampler2D u_texture;
+
+out vec4 frag_color;
+
+void main() {
+    vec4 color = texture(u_texture, frag_uv) * frag_color_in;
+    if (color.a < 0.01) discard;
+    frag_color = color;
+}
@@ -0,0 +1,17 @@
+#version 330 core
+// sprite corners are expanded on the CPU (SpriteBatchSystem); world space in, nothing per-draw
+uniform mat4 view;
+uniform mat4 projection;
+
+in vec3 in_position;
+in vec2 in_uv;
+in vec4 in_color;
+
+out vec2 frag_uv;
+out vec4 frag_color_in;
+
+void main() {
+    frag_uv = in_uv;
+    frag_color_in = in_color;
+    gl_Position = projection * view * vec4(in_position, 1.0);
+}
@@ -0,0 +1,18 @@
+#version 330 core
+// tilemap chunk meshes are built in the map's local space (TilemapSystem)
+uniform mat4 model;
+uniform mat4 view;
+uniform mat4 projection;
+uniform vec4 u_tint;
+
+in vec2 in_position;
+in vec2 in_uv;
+
+out vec2 frag_uv;
+out vec4 frag_color_in;
+
+void main() {
+    frag_uv = in_uv;
+    frag_color_in = u_tint;
+    gl_Position = projection * view * model * vec4(in_position, 0.0, 1.0);
+}
@@ -6,3 +6,13 @@ from typing import Any
 class TextureAsset:
     name: str
     texture: Any   # your moderngl.Texture
+    path: str | None = None   # source image, watched by HotReloadSystem when set
+    uv_rect: tuple = (0.0, 0.0, 1.0, 1.0)   # (u, v, width, height) of this image within `texture`
+
+    @property
+    def is_region(self) -> bool:
+        """True for a sub-image of a shared (atlas) texture."""
+        return tuple(self.uv_rect) != (0.0, 0.0, 1.0, 1.0)
+
+    def use(self, location=0):
+        self.texture.use(location=location)
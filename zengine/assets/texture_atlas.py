@@ -0,0 +1,157 @@
+# zengine/assets/texture_atlas.py
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import moderngl
+import numpy as np
+
+from zengine.assets.texture_asset import TextureAsset
+from zengine.assets.texture_registry import TextureRegistry
+from zengine.util.rect_packer import SkylinePacker
+
+CACHE_VERSION = 1
+
+
+@dataclass
+class TextureAtlas:
+    name: str
+    pages: list = field(default_factory=list)      # TextureAsset per atlas texture
+    regions: dict = field(default_factory=dict)    # image name -> TextureAsset (page texture + uv_rect)
+
+    def __getitem__(self, name) -> TextureAsset:
+        return self.regions[name]
+
+
+def _next_pow2(n: int) -> int:
+    return 1 << max(0, int(n) - 1).bit_length()
+
+
+def pack_images(images: dict, max_size: int = 2048, padding: int = 4):
+    """
+    Packs {name: (H, W, 4) uint8} images into as few max_size pages as possible.
+
+    Every image is surrounded by `padding` pixels copied from its own edge
+    (extruded), so filtering and mip levels up to about log2(padding) never
+    sample a neighbour. Page heights are trimmed to the next power of two.
+
+    Returns (pages: list of (H, W, 4) uint8, layout: {name: (page, x, y, w, h)}),
+    with images and pages bottom row first as GL textures are.
+    """
+    order = sorted(images, key=lambda n: (-images[n].shape[0], -images[n].shape[1], n))
+    packers = []
+    placed = {}
+    for name in order:
+        h, w = images[name].shape[:2]
+        pw, ph = w + 2 * padding, h + 2 * padding
+        if pw > max_size or ph > max_size:
+            raise ValueError(f"Image '{name}' ({w}x{h}) does not fit a {max_size}px atlas page")
+        for page, packer in enumerate(packers):
+            pos = packer.insert(pw, ph)
+            if pos is not None:
+                break
+        else:
+            packers.append(SkylinePacker(max_size, max_size))
+            page = len(packers) - 1
+            pos = packers[page].insert(pw, ph)
+        placed[name] = (page, pos[0] + padding, pos[1] + padding, w, h)
+
+    pages = [np.zeros((min(max_size, _next_pow2(p.used_height)), max_size, 4), dtype=np.uint8)
+             for p in packers]
+    for name, (page, x, y, w, h) in placed.items():
+        img = images[name]
+        pad = np.pad(img, ((padding, padding), (padding, padding), (0, 0)), mode='edge')
+        pages[page][y - padding:y + h + padding, x - padding:x + w + padding] = pad
+    return pages, placed
+
+
+def _source_hash(sources: dict, max_size, padding) -> str:
+    h = hashlib.sha1(f"v{CACHE_VERSION}:{max_size}:{padding}".encode())
+    for name in sorted(sources):
+        h.update(name.encode())
+        h.update(hashlib.sha1(Path(sources[name]).read_bytes()).digest())
+    return h.hexdigest()
+
+
+def _read_images(sources: dict) -> dict:
+    from zengine.graphics.texture_loader import read_image_rgba
+    images = {}
+    for name, path in sources.items():
+        (w, h), data = read_image_rgba(str(path))
+        images[name] = np.frombuffer(data, dtype=np.uint8).reshape(h, w, 4)
+    return images
+
+
+def _load_cache(path: Path):
+    try:
+        with np.load(path) as data:
+            layout = {k: tuple(v) for k, v in json.loads(str(data["layout"])).items()}
+            pages = [data[f"page{i}"] for i in range(int(data["page_count"]))]
+        return pages, layout
+    except (OSError, KeyError, ValueError) as e:
+        print(f"⚠️ Ignoring atlas cache {path}: {e}")
+        return None
+
+
+def _save_cache(path: Path, pages, layout):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    arrays = {f"page{i}": p for i, p in enumerate(pages)}
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, layout=json.dumps(layout), page_count=len(pages), **arrays)
+    tmp.replace(path)
+
+
+def build_atlas(ctx, sources, name: str = "atlas", max_size: int = 2048, padding: int = 4,
+                cache_dir=None, filter=(moderngl.NEAREST, moderngl.NEAREST),
+                register: bool = True) -> TextureAtlas:
+    """
+    Packs image files into shared atlas textures.
+
+    `sources` is {name: path} or a list of paths (named by file stem). With
+    `cache_dir`, the packed pages are stored there keyed by a hash of the
+    input files and settings, and later builds with unchanged inputs skip
+    decoding and packing.
+
+    Each image becomes a TextureAsset region (the page texture plus its
+    `uv_rect`) registered under its name in TextureRegistry, so it can be
+    used wherever a texture is: SpriteRenderer.texture, Material maps.
+    Pages are registered as "<name>#<index>".
+    """
+    if not isinstance(sources, dict):
+        sources = {Path(p).stem: p for p in sources}
+
+    pages = layout = None
+    cache_path = None
+    if cache_dir is not None:
+        key = _source_hash(sources, max_size, padding)
+        cache_path = Path(cache_dir) / f"{name}-{key[:16]}.npz"
+        if cache_path.exists():
+            cached = _load_cache(cache_path)
+            if cached is not None:
+                pages, layout = cached
+
+    if pages is None:
+        pages, layout = pack_images(_read_images(sources), max_size, padding)
+        if cache_path is not None:
+            _save_cache(cache_path, pages, layout)
+
+    atlas = TextureAtlas(name)
+    for i, img in enumerate(pages):
+        h, w = img.shape[:2]
+        tex = ctx.texture((w, h), 4, np.ascontiguousarray(img).tobytes())
+        tex.build_mipmaps()
+        tex.filter = filter
+        atlas.pages.append(TextureAsset(f"{name}#{i}", tex))
+
+    for region, (page, x, y, w, h) in layout.items():
+        ph, pw = pages[page].shape[:2]
+        atlas.regions[region] = TextureAsset(
+            region, atlas.pages[page].texture, uv_rect=(x / pw, y / ph, w / pw, h / ph))
+
+    if register:
+        for asset in (*atlas.pages, *atlas.regions.values()):
+            TextureRegistry.register(asset)
+    return atlas
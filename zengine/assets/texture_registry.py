@@ -12,3 +12,7 @@ class TextureRegistry:
     @classmethod
     def get(cls, name: str) -> TextureAsset:
         return cls._textures[name]
+
+    @classmethod
+    def all(cls) -> list[TextureAsset]:
+        return list(cls._textures.values())
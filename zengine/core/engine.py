@@ -2,42 +2,53 @@ import time
 from pathlib import Path
 
 from .window   import Window
+from .offscreen import OffscreenTarget
 from .renderer import Renderer
 from zengine.core.scene import Scene
 from zengine.graphics.shader import Shader # Ensure Shader is imported
+from zengine.graphics.shader_library import ShaderLibrary
+from zengine.graphics.program_cache import enable_driver_shader_cache
 
 class Engine:
-    def __init__(self, size=(800, 600), title="Zengine"):
-        self.window = Window(size, title)
+    def __init__(self, size=(800, 600), title="Zengine", shader_cache_dir=None, headless=False):
+        # Must happen before the GL context exists for the driver to pick it up
+        if shader_cache_dir is not None:
+            enable_driver_shader_cache(shader_cache_dir)
+
+        # headless: no window, frames go to an offscreen framebuffer (see core/offscreen.py)
+        self.window = OffscreenTarget(size) if headless else Window(size, title)
         self.window.ctx.clear(0.0, 0.0, 0.0, depth=1.0) # Clear once on init
 
         # --- CRITICAL FIX: Initialize shaders correctly here ---
         # Base directory for shaders, using your specified path structure
         shader_dir = Path(__file__).parent.parent / "assets" / "shaders"
 
+        # One program cache per context: systems asking for the same sources share programs
+        self.shaders = ShaderLibrary.for_context(self.window.ctx)
+
         # Load default_shader (for main game objects, like your cube)
         default_vert_path = shader_dir / "basic_vert.glsl"
         default_frag_path = shader_dir / "basic_frag.glsl"
         try:
-            self.default_shader = Shader(
-                self.window.ctx,
-                str(default_vert_path),
-                str(default_frag_path),
-            )
+            self.default_shader = self.shaders.load(str(default_vert_path), str(default_frag_path))
 
         except Exception as e:
             print(f"ERROR: Failed to load default_shader: {e}")
             self.default_shader = None # Set to None to prevent further errors
 
+        # Load clustered_shader (same vertex stage, clustered forward lighting for many point lights)
+        clustered_frag_path = shader_dir / "clustered_frag.glsl"
+        try:
+            self.clustered_shader = self.shaders.load(str(default_vert_path), str(clustered_frag_path))
+        except Exception as e:
+            print(f"ERROR: Failed to load clustered_shader: {e}")
+            self.clustered_shader = None # Set to None to prevent further errors
+
         # Load debug_shader (for gizmos)
         debug_vert_path = shader_dir / "debug_vert.glsl"
         debug_frag_path = shader_dir / "debug_frag.glsl"
         try:
-            self.debug_shader = Shader(
-                self.window.ctx,
-                str(debug_vert_path),
-                str(debug_frag_path),
-            )
+            self.debug_shader = self.shaders.load(str(debug_vert_path), str(debug_frag_path))
         except Exception as e:
             print(f"ERROR: Failed to load debug_shader: {e}")
             self.debug_shader = None # Set to None to prevent further errors
@@ -54,25 +65,42 @@ class Engine:
         if make_current or not self.current:
             self.current = scene
 
-    def run(self):
+    def run(self, frames=None):
         if not self.current:
             raise RuntimeError(
                 "No current scene—did you forget add_scene(..., make_current=True)?"
             )
 
         last = time.time()
-        while self.window.running:
-            events = self.window.get_events()
-            for e in events:
-                self.current.on_event(e)
+        frame = 0
+        try:
+            while self.window.running and (frames is None or frame < frames):
+                frame += 1
+                events = self.window.get_events()
+                for e in events:
+                    self.current.on_event(e)
 
-            now = time.time(); dt = now - last; last = now
-            self.current.on_update(dt)
+                now = time.time(); dt = now - last; last = now
+                self.current.on_update(dt)
 
-            # Clear the screen each frame
-            self.window.ctx.clear(.3,.3,.3, depth=1.0) # Black background, clear depth
-            self.current.on_render(self.renderer)
+                # Clear the screen each frame
+                if isinstance(self.window, OffscreenTarget):
+                    self.window.fbo.use()
+                self.window.ctx.clear(*self.current.clear_color, depth=1.0) # Scene background, clear depth
+                self.current.on_render(self.renderer)
 
-            self.window.on_late_update(dt)
-            self.current.on_late_update(dt)
+                self.window.on_late_update(dt)
+                self.current.on_late_update(dt)
+        except BaseException:
+            self.shutdown()
+            raise
+        if not self.window.running:
+            self.shutdown()     # window closed; a run(frames=...) can be resumed instead
 
+    def shutdown(self):
+        """Closes every system holding open resources (frame captures, file watchers)."""
+        for scene in self.scenes.values():
+            for system in scene.systems:
+                close = getattr(system, 'close', None)
+                if callable(close):
+                    close()
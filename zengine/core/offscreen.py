@@ -0,0 +1,164 @@
+# zengine/core/offscreen.py
+
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+
+import moderngl
+import numpy as np
+
+
+def create_standalone_context(backend: str = None):
+    """
+    A window-less GL 3.3 context. Without an explicit backend, EGL is tried
+    first on Linux machines without a display (software rasterizers such as
+    llvmpipe work there), then the platform default.
+    """
+    if backend is not None:
+        return moderngl.create_context(standalone=True, require=330, backend=backend)
+    candidates = [None]
+    if sys.platform.startswith('linux'):
+        candidates = ['egl', None] if not os.environ.get('DISPLAY') else [None, 'egl']
+    error = None
+    for candidate in candidates:
+        try:
+            if candidate is None:
+                return moderngl.create_context(standalone=True, require=330)
+            return moderngl.create_context(standalone=True, require=330, backend=candidate)
+        except Exception as e:
+            error = e
+    raise RuntimeError(f"Could not create a standalone GL context: {error}")
+
+
+@dataclass
+class OffscreenResult:
+    """Last frame's pixels plus per-frame timings of an OffscreenTarget.render() run."""
+    color: np.ndarray                   # (h, w, 4) uint8, top row first
+    depth: np.ndarray                   # (h, w) float32 window-space depth, top row first
+    frame_ms: np.ndarray                # wall time per measured frame, GPU work included
+    cpu_ms: np.ndarray                  # time until the frame's commands were submitted
+    info: dict = field(default_factory=dict)
+
+    @property
+    def mean_ms(self) -> float:
+        return float(self.frame_ms.mean()) if len(self.frame_ms) else 0.0
+
+    @property
+    def median_ms(self) -> float:
+        return float(np.median(self.frame_ms)) if len(self.frame_ms) else 0.0
+
+    @property
+    def p95_ms(self) -> float:
+        return float(np.percentile(self.frame_ms, 95)) if len(self.frame_ms) else 0.0
+
+    @property
+    def fps(self) -> float:
+        return 1000.0 / self.mean_ms if self.mean_ms > 0 else 0.0
+
+    def summary(self) -> dict:
+        return {
+            "frames": len(self.frame_ms),
+            "mean_ms": self.mean_ms,
+            "median_ms": self.median_ms,
+            "p95_ms": self.p95_ms,
+            "cpu_mean_ms": float(self.cpu_ms.mean()) if len(self.cpu_ms) else 0.0,
+            "fps": self.fps,
+            **self.info,
+        }
+
+
+class OffscreenTarget:
+    """
+    Renders scenes without a window, for benchmarks and image-regression tests.
+
+    Owns a standalone moderngl context and a framebuffer with a color and a
+    depth texture. It stands in for Window where systems look at
+    `scene.window` (width, height, ctx), so a Scene built for the engine
+    renders unchanged:
+
+        target = OffscreenTarget((640, 480))
+        scene = build_scene(target.ctx)
+        result = target.render(scene, frames=120, warmup=10)
+        result.color, result.depth, result.summary()
+
+    Frames step with a fixed dt so runs are deterministic, and each frame ends
+    with ctx.finish() so frame_ms includes the GPU's work.
+    """
+    def __init__(self, size=(800, 600), backend: str = None, ctx=None, alpha_blending=True):
+        self.ctx = ctx or create_standalone_context(backend)
+        self.width, self.height = size
+        self.window_size = size
+        self.running = True
+
+        self.color_texture = self.ctx.texture(size, 4)
+        self.depth_texture = self.ctx.depth_texture(size)
+        self.depth_texture.compare_func = ''
+        self.fbo = self.ctx.framebuffer([self.color_texture], self.depth_texture)
+        self.fbo.use()
+
+        # Same default state as Window
+        if alpha_blending:
+            self.ctx.enable(moderngl.BLEND)
+            self.ctx.blend_func = (moderngl.SRC_ALPHA, moderngl.ONE_MINUS_SRC_ALPHA)
+        self.ctx.enable(moderngl.DEPTH_TEST)
+
+    # Window interface -----------------------------------------------------------
+
+    def get_events(self):
+        return []
+
+    def on_late_update(self, dt):
+        pass
+
+    # rendering ------------------------------------------------------------------
+
+    def render_frame(self, scene, dt: float, renderer=None, clear_color=None):
+        scene.on_update(dt)
+        self.fbo.use()
+        r, g, b, *a = clear_color if clear_color is not None else scene.clear_color
+        self.fbo.clear(r, g, b, a[0] if a else 1.0, depth=1.0)
+        scene.on_render(renderer)
+        scene.on_late_update(dt)
+
+    def render(self, scene, frames: int = 1, dt: float = 1.0 / 60.0, warmup: int = 0,
+               renderer=None, clear_color=None) -> OffscreenResult:
+        """Steps and renders `scene` for warmup + frames frames; returns the last image and timings."""
+        scene.window = self
+        for _ in range(warmup):
+            self.render_frame(scene, dt, renderer, clear_color)
+        self.ctx.finish()
+
+        frame_ms = np.zeros(frames)
+        cpu_ms = np.zeros(frames)
+        for i in range(frames):
+            start = time.perf_counter()
+            self.render_frame(scene, dt, renderer, clear_color)
+            cpu_ms[i] = (time.perf_counter() - start) * 1000.0
+            self.ctx.finish()
+            frame_ms[i] = (time.perf_counter() - start) * 1000.0
+
+        info = self.ctx.info
+        return OffscreenResult(
+            color=self.read_color(), depth=self.read_depth(),
+            frame_ms=frame_ms, cpu_ms=cpu_ms,
+            info={"size": (self.width, self.height), "renderer": info.get("GL_RENDERER", "")},
+        )
+
+    def read_color(self) -> np.ndarray:
+        data = self.fbo.read(components=4, dtype='f1')
+        return np.frombuffer(data, dtype=np.uint8).reshape(self.height, self.width, 4)[::-1].copy()
+
+    def read_depth(self) -> np.ndarray:
+        data = self.depth_texture.read()
+        return np.frombuffer(data, dtype=np.float32).reshape(self.height, self.width)[::-1].copy()
+
+    def release(self):
+        for obj in (self.fbo, self.color_texture, self.depth_texture):
+            obj.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
@@ -4,8 +4,8 @@ import numpy as np
 class Renderer:
     def __init__(self, ctx, program):
         self.ctx = ctx
-        self.prog = getattr(program, 'program',
-                    getattr(program, 'prog', program))
+        self.program = program
+        self.prog = self._current_program()
 
         # Simple quad: only position
         verts = np.array([
@@ -19,13 +19,23 @@ class Renderer:
 
         self.vbo = ctx.buffer(verts.tobytes())
         self.ibo = ctx.buffer(idxs.tobytes())
-        self.vao = ctx.vertex_array(
+        self.vao = self._vertex_array()
+
+    def _current_program(self):
+        return getattr(self.program, 'program', getattr(self.program, 'prog', self.program))
+
+    def _vertex_array(self):
+        return self.ctx.vertex_array(
             self.prog,
             [(self.vbo, '3f', 'in_position')],  # ✅ Only bind what shader declares
             self.ibo
         )
 
     def draw_quad(self, model, vp):
+        if self._current_program() is not self.prog:   # the Shader was hot-reloaded
+            self.vao.release()
+            self.prog = self._current_program()
+            self.vao = self._vertex_array()
         # You can add a dummy texture bind if needed, but here we just color
         self.prog['model'].write(model.T.tobytes())
         self.prog['view_projection'].write(vp.T.tobytes())
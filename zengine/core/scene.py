@@ -6,6 +6,7 @@ class Scene:
         self.entity_manager      = EntityManager()
         self.systems       = []            # list[System]
         self.active_camera = None
+        self.clear_color   = (0.3, 0.3, 0.3, 1.0)  # background the frame starts from
         self._systems_by_type = {}
 
     def add_system(self, system: System):
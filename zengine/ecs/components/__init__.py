@@ -10,4 +10,6 @@ from zengine.ecs.components.light import LightComponent
 from zengine.ecs.components.animation import Animation
 from zengine.ecs.components.material import Material
 from zengine.ecs.components.mesh_renderer import MeshRenderer
-from zengine.ecs.components.top_down_car_controller import TopDownCarController
\ No newline at end of file
+from zengine.ecs.components.top_down_car_controller import TopDownCarController
+from zengine.ecs.components.tilemap import Tilemap
+from zengine.ecs.components.particle_emitter import ParticleEmitter
\ No newline at end of file
@@ -15,4 +15,11 @@ class LightComponent:
     color: tuple = (1.0, 1.0, 1.0)
     intensity: float = 1.0
     range: float = 10.0  # for point lights
-    casts_shadows: bool = False  # for future extension
+    casts_shadows: bool = False
+
+    # shadow settings (used by ShadowSystem when casts_shadows is set)
+    shadow_resolution: int = 1024        # texels per cascade / per cube face
+    shadow_update_interval: int = 1      # min frames between re-renders of a changed shadow map
+    shadow_cascades: int = 3             # directional only, 1..4
+    shadow_distance: float = 50.0        # directional only, view depth covered by the cascades
+    shadow_bias: float = 0.005
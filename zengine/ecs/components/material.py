@@ -27,6 +27,7 @@ class Material:
     use_texture: bool = True
     use_lighting: bool = True
     receive_shadows: bool = True
+    cast_shadows: bool = True
 
     # Shader-specific overrides
     custom_uniforms: Dict[str, Any] = field(default_factory=dict)
@@ -46,7 +47,10 @@ class Material:
             "u_has_albedo_map": int(self.albedo_texture is not None),
             "u_has_normal_map": int(self.normal_map is not None),
             "u_has_metallic_map": float(self.metallic_map is not None),
-            "u_has_roughness_map": float(self.roughness_map is not None)
+            "u_has_roughness_map": float(self.roughness_map is not None),
+            "u_receive_shadows": int(self.receive_shadows),
+            # atlas region of the albedo map; the other maps share its layout
+            "u_uv_rect": tuple(getattr(self.albedo_texture, "uv_rect", (0.0, 0.0, 1.0, 1.0))),
         }
 
         uniforms.update(self.custom_uniforms)
@@ -0,0 +1,44 @@
+# zengine/ecs/components/particle_emitter.py
+
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+
+@dataclass
+class ParticleEmitter:
+    """
+    Spawns and simulates particles at the entity's Transform (ParticleSystem).
+
+    Particles live in the emitter's ParticlePool, created on first update
+    with `capacity` slots; emission beyond that is dropped, never grown.
+    Particles are simulated in world space, so moving the emitter leaves a
+    trail. Call emit(n) for a burst.
+    """
+    capacity: int = 2048
+    rate: float = 100.0                     # particles per second while `emitting`
+    emitting: bool = True
+    lifetime: tuple = (1.0, 2.0)            # seconds, uniform range
+    speed: tuple = (1.0, 2.0)               # world units/s, uniform range
+    direction: tuple = (0.0, 0.0, 1.0)      # emitter-local, rotated by the Transform
+    spread: float = 30.0                    # cone half-angle in degrees
+    gravity: tuple = (0.0, 0.0, -9.81)
+    drag: float = 0.0                       # velocity decay per second
+    noise_strength: float = 0.0             # curl-noise acceleration
+    noise_scale: float = 1.0
+    start_size: float = 0.2
+    end_size: float = 0.0
+    start_color: tuple = (1.0, 1.0, 1.0, 1.0)
+    end_color: tuple = (1.0, 1.0, 1.0, 0.0)
+    texture: Any = None                     # moderngl.Texture / TextureAsset; None draws soft dots
+    additive: bool = False
+    seed: Optional[int] = None
+
+    pool: Any = field(default=None, repr=False)     # ParticlePool, owned by ParticleSystem
+    pending: int = 0                                # burst particles waiting for the next update
+
+    def emit(self, count: int):
+        self.pending += int(count)
+
+    @property
+    def alive(self) -> int:
+        return 0 if self.pool is None else self.pool.count
@@ -2,4 +2,14 @@ from dataclasses import dataclass
 
 @dataclass
 class SpriteRenderer:
-    texture: any
+    """
+    A textured quad drawn by SpriteBatchSystem, placed by the entity's Transform
+    on its local XY plane.
+    """
+    texture: any                            # moderngl.Texture, TextureAsset / atlas region, or None for a plain tinted quad
+    size: tuple = (1.0, 1.0)                # world units before Transform scale
+    pivot: tuple = (0.5, 0.5)               # point of the quad at the Transform position, 0..1
+    uv_rect: tuple = (0.0, 0.0, 1.0, 1.0)   # (u, v, width, height) within the texture (or atlas region)
+    tint: tuple = (1.0, 1.0, 1.0, 1.0)
+    layer: int = 0                          # lower layers draw first
+    visible: bool = True
@@ -0,0 +1,76 @@
+# zengine/ecs/components/tilemap.py
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+EMPTY = -1
+
+
+@dataclass
+class Tilemap:
+    """
+    A grid of tiles on the entity's local XY plane, drawn by TilemapSystem.
+
+    Tiles are stored in chunk_size x chunk_size int32 blocks keyed by chunk
+    coordinates, so a sparse or huge map only holds the chunks it uses.
+    A tile value indexes `palette`; EMPTY (-1) draws nothing. Writing any
+    other id outside the palette raises ValueError. Edits mark their chunks
+    dirty and only those chunk meshes are rebuilt.
+    """
+    palette: list                           # tile id -> atlas region (TextureAsset) or (u, v, w, h)
+    texture: any = None                     # moderngl.Texture; defaults to the palette regions' page
+    tile_size: tuple = (1.0, 1.0)           # world units before Transform scale
+    chunk_size: int = 32
+    tint: tuple = (1.0, 1.0, 1.0, 1.0)
+    layer: int = 0                          # lower layers draw first
+    visible: bool = True
+
+    chunks: dict = field(default_factory=dict)  # (cx, cy) -> (chunk_size, chunk_size) int32, [y, x]
+    dirty: set = field(default_factory=set)     # chunk coords whose mesh is out of date
+
+    def _chunk(self, cx, cy, create):
+        block = self.chunks.get((cx, cy))
+        if block is None and create:
+            block = np.full((self.chunk_size, self.chunk_size), EMPTY, dtype=np.int32)
+            self.chunks[(cx, cy)] = block
+        return block
+
+    def _check(self, tiles: np.ndarray):
+        bad = (tiles < EMPTY) | (tiles >= len(self.palette))
+        if bad.any():
+            raise ValueError(f"Tile id {int(tiles[bad].flat[0])} is not in the palette "
+                             f"(0..{len(self.palette) - 1}, or EMPTY)")
+
+    def get_tile(self, x: int, y: int) -> int:
+        cs = self.chunk_size
+        block = self._chunk(x // cs, y // cs, False)
+        return EMPTY if block is None else int(block[y % cs, x % cs])
+
+    def set_tile(self, x: int, y: int, tile: int):
+        self._check(np.asarray(tile))
+        cs = self.chunk_size
+        self._chunk(x // cs, y // cs, True)[y % cs, x % cs] = tile
+        self.dirty.add((x // cs, y // cs))
+
+    def fill(self, x: int, y: int, tiles):
+        """Writes a 2D array of tile ids ([row, column] = [y, x]) with its corner at tile (x, y)."""
+        tiles = np.asarray(tiles, dtype=np.int32)
+        self._check(tiles)
+        h, w = tiles.shape
+        cs = self.chunk_size
+        for cy in range(y // cs, (y + h - 1) // cs + 1):
+            for cx in range(x // cs, (x + w - 1) // cs + 1):
+                # overlap of the chunk and the written area, in tile coordinates
+                x0, x1 = max(x, cx * cs), min(x + w, (cx + 1) * cs)
+                y0, y1 = max(y, cy * cs), min(y + h, (cy + 1) * cs)
+                src = tiles[y0 - y:y1 - y, x0 - x:x1 - x]
+                block = self._chunk(cx, cy, bool((src != EMPTY).any()))
+                if block is None:
+                    continue
+                block[y0 - cy * cs:y1 - cy * cs, x0 - cx * cs:x1 - cx * cs] = src
+                self.dirty.add((cx, cy))
+
+    def mark_dirty(self):
+        """Forces every chunk to rebuild, e.g. after changing the palette or tile_size."""
+        self.dirty.update(self.chunks.keys())
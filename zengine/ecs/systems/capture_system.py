@@ -0,0 +1,40 @@
+# zengine/ecs/systems/capture_system.py
+
+import atexit
+
+from zengine.ecs.systems.system import System
+from zengine.graphics.frame_capture import FrameCapture
+
+
+class CaptureSystem(System):
+    """
+    Records rendered frames to disk through a FrameCapture (PNG sequence or raw video).
+
+    Captures in on_render, so add it after every system that draws: by
+    on_late_update the window has already been flipped. `every` captures
+    only every n-th frame; `recording` pauses and resumes.
+
+    close() flushes the outstanding frames and stops the writer. Engine.run()
+    calls it on exit; otherwise it runs from an atexit hook.
+    """
+    def __init__(self, ctx, directory, mode: str = "png", every: int = 1, **capture_options):
+        super().__init__()
+        self.ctx = ctx
+        self.capture = FrameCapture(ctx, directory, mode=mode, **capture_options)
+        self.every = max(1, every)
+        self.recording = True
+        self._frame = 0
+        atexit.register(self.close)
+
+    @property
+    def stats(self) -> dict:
+        return self.capture.stats
+
+    def on_render(self, renderer):
+        if self.recording and self._frame % self.every == 0:
+            self.capture.capture(self.ctx.fbo)
+        self._frame += 1
+
+    def close(self):
+        atexit.unregister(self.close)
+        self.capture.close()
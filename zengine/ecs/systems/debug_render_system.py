@@ -2,47 +2,21 @@ from pathlib import Path
 
 import moderngl
 import numpy as np
-import math
 
 from zengine.ecs.systems.system import System
 from zengine.ecs.components import Transform
 from zengine.ecs.components.camera import CameraComponent # Assuming this path is correct based on your RenderSystem
-from zengine.graphics.shader import Shader
-from zengine.util.quaternion import quat_to_mat4 # Assuming this path is correct based on your RenderSystem
+from zengine.ecs.systems.profiler_system import profile_pass
+from zengine.ecs.systems.render_graph_system import RenderGraphSystem
+from zengine.graphics import render_graph
+from zengine.graphics.debug_draw import DebugDraw, AXES_LINES, AXES_COLORS, BOX_LINES, transform_lines
+from zengine.graphics.line_batch import LineBatch
+from zengine.graphics.shader_library import ShaderLibrary
+from zengine.util.intersection import transform_aabbs
+from zengine.util.transforms import compute_model_matrices, quats_to_mat3
 
 
-def translate_matrix(offset):
-    mat = np.eye(4, dtype='f4')
-    mat[:3, 3] = offset
-    return mat
-
-
-def scale_matrix(scale):
-    mat = np.eye(4, dtype='f4')
-    mat[0, 0], mat[1, 1], mat[2, 2] = scale
-    return mat
-
-
-
-# Helper function to compute a model matrix from a Transform component.
-# This is crucial for positioning and orienting debug elements.
-# Copied from your RenderSystem for self-containment, but ideally shared.
-def compute_model_matrix(tr: Transform) -> np.ndarray:
-    """
-    Computes a 4x4 model matrix from a Transform component's position, rotation, and scale.
-    """
-    # Translation matrix
-    T = np.eye(4, dtype='f4')
-    T[:3, 3] = (tr.x, tr.y, tr.z)
-
-    # Rotation matrix from quaternion
-    R_mat = quat_to_mat4(tr.rotation_x, tr.rotation_y, tr.rotation_z, tr.rotation_w)
-
-    # Scale matrix
-    S = np.diag([tr.scale_x, tr.scale_y, tr.scale_z, 1.0]).astype('f4')
-
-    # Model matrix is T @ R @ S
-    return T @ R_mat @ S
+BOX_COLOR = (1.0, 1.0, 0.0)
 
 
 class DebugRenderSystem(System):
@@ -60,27 +34,34 @@ class DebugRenderSystem(System):
             "bones": False, # Bones rendering would require skeleton data and is not implemented here
             "bounding_boxes": False
         }
+        # "oriented" (box follows the entity's rotation) or "aligned" (world AABB)
+        self.bounding_box_mode = "oriented"
 
         # --- Debug Shaders Initialization ---
         shader_dir = Path(__file__).parent.parent.parent / "assets" / "shaders"
 
-        # Load the shader programs using your existing debug_vert.glsl and debug_frag.glsl.
-        # All debug elements will share these shaders and rely on setting the 'color' uniform.
-        self.grid_shader = Shader(self.ctx, str(shader_dir / "debug_vert.glsl"), str(shader_dir / "debug_frag.glsl"))
-        self.axes_shader = Shader(self.ctx, str(shader_dir / "debug_vert.glsl"), str(shader_dir / "debug_frag.glsl"))
-        self.bbox_shader = Shader(self.ctx, str(shader_dir / "debug_vert.glsl"), str(shader_dir / "debug_frag.glsl"))
+        shaders = ShaderLibrary.for_context(self.ctx)
 
-        # --- VAOs for Debug Geometry ---
-        # Initialize Vertex Array Objects (VAOs) for the static debug geometries.
-        # These are created once and reused for rendering.
-        self._grid_vao = None
-        self._init_grid_vao()
+        # The ground grid is procedural: a fullscreen pass intersecting each pixel's
+        # view ray with the Z=0 plane, so its cost doesn't depend on the view
+        self.grid_shader = shaders.load(str(shader_dir / "fullscreen_vert.glsl"), str(shader_dir / "infinite_grid_frag.glsl"))
+        self.grid_step = 0.25           # finest line spacing, used near the plane
+        self.grid_fade_distance = 50.0  # minimum distance over which the grid fades out
 
-        self._axes_vao = None
-        self._init_axes_vao()
+        # Per-entity axes and boxes are transformed on the CPU in one batch and
+        # drawn as a single line list per category
+        self.lines_shader = shaders.load(str(shader_dir / "debug_lines_vert.glsl"), str(shader_dir / "debug_lines_frag.glsl"))
+        self._lines = LineBatch(self.ctx, self.lines_shader)
 
-        self._bbox_vao = None
-        self._init_bbox_vao()
+        # Immediate-mode API for gameplay code (lines, boxes, spheres, markers...);
+        # everything submitted is flushed through the same ring buffer each frame
+        self.draw = DebugDraw()
+
+        # --- VAO for the Grid ---
+        # Created once and reused for rendering.
+        self._grid_vao = None
+        self._grid_program = None   # program _grid_vao was built for; a hot-reload replaces it
+        self._init_grid_vao()
 
         # --- ModernGL Context Settings ---
         # Enable depth testing to ensure debug elements are correctly occluded by scene geometry.
@@ -91,194 +72,166 @@ class DebugRenderSystem(System):
 
     def _init_grid_vao(self):
         """
-        Initializes the VAO for drawing a large floor grid on the XY plane (Z=0).
-        The grid is composed of lines parallel to the X and Y axes.
-        """
-        size = 50.0 # Grid extends from -size to +size on X and Y
-        step = .25  # Spacing between grid lines
-        lines = []
-        # Generate lines parallel to the Y-axis (fixed X, varying Y, Z=0)
-        for i in range(int(-size / step), int(size / step) + 1):
-            lines.append((i * step, -size, 0.0)) # Start point (X, Y, Z=0)
-            lines.append((i * step, size, 0.0))  # End point (X, Y, Z=0)
-
-        # Generate lines parallel to the X-axis (varying X, fixed Y, Z=0)
-        for i in range(int(-size / step), int(size / step) + 1):
-            lines.append((-size, i * step, 0.0)) # Start point (X, Y, Z=0)
-            lines.append((size, i * step, 0.0))  # End point (X, Y, Z=0)
-
-        vertices = np.array(lines, dtype='f4')
-        vbo = self.ctx.buffer(vertices.tobytes())
-        self._grid_vao = self.ctx.vertex_array(
-            self.grid_shader.program,
-            [(vbo, '3f', 'in_position')] # '3f' for 3 floats (x, y, z)
-        )
-
-    def _init_axes_vao(self):
-        """
-        Initializes the VAO for drawing XYZ axes (Red=X, Green=Y, Blue=Z).
-        Each axis is a line segment from the origin to a unit length along its direction.
-        Since the shared fragment shader uses a uniform color, the vertex data
-        only needs to contain position.
-        """
-        # Vertices for X, Y, Z axes. No color data here.
-        axes_vertices = np.array([
-            # X-axis
-            0.0, 0.0, 0.0,
-            1.0, 0.0, 0.0,
-
-            # Y-axis
-            0.0, 0.0, 0.0,
-            0.0, 1.0, 0.0,
-
-            # Z-axis
-            0.0, 0.0, 0.0,
-            0.0, 0.0, 1.0,
-        ], dtype='f4')
-        vbo = self.ctx.buffer(axes_vertices.tobytes())
-        self._axes_vao = self.ctx.vertex_array(
-            self.axes_shader.program,
-            [(vbo, '3f', 'in_position')] # Only 'in_position' attribute is needed
-        )
-
-    def _init_bbox_vao(self):
-        """
-        Initializes the VAO for drawing a unit wireframe cube, representing a bounding box.
-        The cube is centered at the origin, with sides of length 1 (from -0.5 to 0.5).
+        Initializes the VAO for the fullscreen grid pass. The vertex stage builds
+        one oversized triangle from gl_VertexID, so no vertex buffer is needed.
         """
-        # Vertices for the 12 edges of a unit cube wireframe.
-        # Each pair of consecutive vertices forms a line segment.
-        bbox_vertices = np.array([
-            # Bottom face (Z=-0.5)
-            -0.5, -0.5, -0.5,   0.5, -0.5, -0.5,
-             0.5, -0.5, -0.5,   0.5,  0.5, -0.5,
-             0.5,  0.5, -0.5,  -0.5,  0.5, -0.5,
-            -0.5,  0.5, -0.5,  -0.5, -0.5, -0.5,
-
-            # Top face (Z=0.5)
-            -0.5, -0.5,  0.5,   0.5, -0.5,  0.5,
-             0.5, -0.5,  0.5,   0.5,  0.5,  0.5,
-             0.5,  0.5,  0.5,  -0.5,  0.5,  0.5,
-            -0.5,  0.5,  0.5,  -0.5, -0.5,  0.5,
-
-            # Connecting vertical edges (along Z)
-            -0.5, -0.5, -0.5,  -0.5, -0.5,  0.5,
-             0.5, -0.5, -0.5,   0.5, -0.5,  0.5,
-             0.5,  0.5, -0.5,   0.5,  0.5,  0.5,
-            -0.5,  0.5, -0.5,  -0.5,  0.5,  0.5,
-        ], dtype='f4')
-        vbo = self.ctx.buffer(bbox_vertices.tobytes())
-        self._bbox_vao = self.ctx.vertex_array(
-            self.bbox_shader.program,
-            [(vbo, '3f', 'in_position')] # '3f' for 3 floats (x, y, z)
-        )
+        if self._grid_vao is not None:
+            self._grid_vao.release()
+        self._grid_program = self.grid_shader.program
+        self._grid_vao = self.ctx.vertex_array(self._grid_program, [])
 
-    def on_render(self, renderer):
-        """
-        Called each frame to render the enabled debug visualizations.
-        """
+    def _camera(self):
         # Get the active camera's projection and view matrices.
         # These are essential for correctly projecting 3D debug elements onto the 2D screen.
         cam_e = self.scene.active_camera
         if cam_e is None:
             # If no active camera is set, debug rendering cannot proceed.
-            return
+            return None
 
         cp_cam = self.scene.entity_manager.get_component(cam_e, CameraComponent)
         if cp_cam is None:
             # If the active camera entity lacks a CameraComponent, debug rendering cannot proceed.
+            return None
+        return cp_cam
+
+    def on_render(self, renderer):
+        """
+        Called each frame to render the enabled debug visualizations.
+        """
+        if self.scene.get_system(RenderGraphSystem) is not None:
+            return  # drawn through add_render_passes()
+        cp_cam = self._camera()
+        if cp_cam is None:
             return
+        with profile_pass(self.scene, "debug"):
+            self._render_debug(cp_cam.projection_matrix, cp_cam.view_matrix)
+
+    def on_update(self, dt):
+        self.draw.update(dt)
 
-        proj = cp_cam.projection_matrix
-        view = cp_cam.view_matrix
+    def on_late_update(self, dt):
+        self.draw.end_frame()
 
+    def add_render_passes(self, graph):
+        """Declares the debug overlay as a pass drawing over the scene color and depth."""
+        cp_cam = self._camera()
+        if cp_cam is None:
+            return
+        proj, view = cp_cam.projection_matrix, cp_cam.view_matrix
+        graph.add_pass("debug", lambda g: self._render_debug(proj, view),
+                       order=render_graph.DEBUG, color=("color",), depth="depth")
+
+    def _render_debug(self, proj: np.ndarray, view: np.ndarray):
         # Render the grid if enabled.
         if self.enabled["grid"] and self._grid_vao is not None:
             self.draw_grid(proj, view)
 
-        # Iterate over all entities that have a Transform component.
-        # Axes and bounding boxes are drawn per entity.
-        for eid in self.scene.entity_manager.get_entities_with(Transform):
-            tr = self.scene.entity_manager.get_component(eid, Transform)
+        self._render_entities(proj, view)
+        self.draw.flush(self._lines, view, proj, self.ctx)
 
-            # Render axes for the entity's transform if enabled.
-            if self.enabled["axes"] and self._axes_vao is not None:
-                self.draw_axes(tr, proj, view)
+    def _render_entities(self, proj: np.ndarray, view: np.ndarray):
+        if not (self.enabled["axes"] or self.enabled["bounding_boxes"]):
+            return
 
-            # Render a bounding box for the entity's transform if enabled.
-            if self.enabled["bounding_boxes"] and self._bbox_vao is not None:
-                self.draw_bounding_box(eid, tr, proj, view, [])
+        em = self.scene.entity_manager
+        eids = sorted(em.get_entities_with(Transform))
+        if not eids:
+            return
+        transforms = [em.get_component(eid, Transform) for eid in eids]
+        models = compute_model_matrices(transforms)
 
-    def draw_grid(self, proj: np.ndarray, view: np.ndarray):
+        # One line list per category: every entity's axes, then every entity's box
+        if self.enabled["axes"]:
+            self._lines.draw(transform_lines(models, AXES_LINES),
+                             np.tile(AXES_COLORS, (len(eids), 1)), view, proj)
 
-        prog = self.grid_shader.program
-        if 'view' in prog:       prog['view'].write(view.T.astype('f4').tobytes())
-        if 'projection' in prog: prog['projection'].write(proj.T.astype('f4').tobytes())
-        if 'model' in prog:      prog['model'].write(np.eye(4, dtype='f4').T.tobytes()) # Grid is at world origin
-        if 'color' in prog:      prog['color'].value = (0.2, 0.2, 0.2) # Dark grey for grid
-        self._grid_vao.render(moderngl.LINES)
+        if self.enabled["bounding_boxes"]:
+            boxes = self._box_matrices(eids, transforms, models)
+            self._lines.draw(transform_lines(boxes, BOX_LINES),
+                             np.broadcast_to(np.array(BOX_COLOR, dtype='f4'), (len(eids) * len(BOX_LINES), 3)),
+                             view, proj)
 
-    def draw_axes(self, tr: Transform, proj: np.ndarray, view: np.ndarray):
+    def _local_boxes(self, eids, transforms, models):
         """
-        Draws RGB axes at the position and orientation of the given Transform component.
-        Each axis is drawn separately, setting the uniform color before each draw call.
+        Per entity: the matrix placing its box and the box's local (lo, hi). Mesh
+        bounds come from MeshAsset.bounds() (cached per asset, reset on edits);
+        entities without a mesh get a half-unit box at their position and rotation.
         """
-        prog = self.axes_shader.program
-        # Compute the model matrix for the axes based on the entity's transform.
-        model = compute_model_matrix(tr)
-
-        # Pass the model, view, and projection matrices to the shader.
-        if 'model' in prog:      prog['model'].write(model.T.astype('f4').tobytes())
-        if 'view' in prog:       prog['view'].write(view.T.astype('f4').tobytes())
-        if 'projection' in prog: prog['projection'].write(proj.T.astype('f4').tobytes())
-
-        # Draw X-axis (Red)
-        if 'color' in prog: prog['color'].value = (1.0, 0.0, 0.0) # Red
-        self._axes_vao.render(moderngl.LINES, vertices=2, first=0) # First 2 vertices are X-axis
-
-        # Draw Y-axis (Green)
-        if 'color' in prog: prog['color'].value = (0.0, 1.0, 0.0) # Green
-        self._axes_vao.render(moderngl.LINES, vertices=2, first=2) # Next 2 vertices are Y-axis
-
-        # Draw Z-axis (Blue)
-        if 'color' in prog: prog['color'].value = (0.0, 0.0, 1.0) # Blue
-        self._axes_vao.render(moderngl.LINES, vertices=2, first=4) # Next 2 vertices are Z-axis
-
-    def draw_bounding_box(self, eid, tr: Transform, proj: np.ndarray, view: np.ndarray, ignore: bool):
         from zengine.ecs.components import MeshFilter
-
-        if eid in ignore:
-            print("Ignoring bounding box for {}".format(eid))
+        em = self.scene.entity_manager
+        n = len(eids)
+        placement = np.array(models, dtype='f4', copy=True)
+        lo = np.full((n, 3), -0.25, dtype='f4')
+        hi = np.full((n, 3), 0.25, dtype='f4')
+        meshless = []
+        for i, eid in enumerate(eids):
+            mf = em.get_component(eid, MeshFilter)
+            if mf is None:
+                meshless.append(i)
+                continue
+            lo[i], hi[i] = mf.asset.bounds()
+
+        if meshless:
+            # rotation and position only; their scale doesn't apply
+            trs = [transforms[i] for i in meshless]
+            quats = [(tr.rotation_x, tr.rotation_y, tr.rotation_z, tr.rotation_w) for tr in trs]
+            placement[meshless, :3, :3] = quats_to_mat3(quats)
+            placement[meshless, :3, 3] = [(tr.x, tr.y, tr.z) for tr in trs]
+        return placement, lo, hi
+
+    def world_aabbs(self, eids=None):
+        """(eids, lo, hi): world-space AABBs of entities (default: all with a Transform), in one batch."""
+        em = self.scene.entity_manager
+        eids = sorted(em.get_entities_with(Transform)) if eids is None else list(eids)
+        if not eids:
+            return eids, np.zeros((0, 3), dtype='f4'), np.zeros((0, 3), dtype='f4')
+        transforms = [em.get_component(eid, Transform) for eid in eids]
+        placement, lo, hi = self._local_boxes(eids, transforms, compute_model_matrices(transforms))
+        w_lo, w_hi = transform_aabbs(lo, hi, placement)
+        return eids, w_lo, w_hi
+
+    @staticmethod
+    def _unit_box_to(lo, hi) -> np.ndarray:
+        """(N,4,4) matrices mapping the unit cube onto boxes (lo, hi)."""
+        m = np.zeros((len(lo), 4, 4), dtype='f4')
+        m[:, [0, 1, 2], [0, 1, 2]] = hi - lo
+        m[:, :3, 3] = (lo + hi) * 0.5
+        m[:, 3, 3] = 1.0
+        return m
+
+    def _box_matrices(self, eids, transforms, models) -> np.ndarray:
+        """Unit cube -> world matrix per entity, oriented or axis-aligned per bounding_box_mode."""
+        placement, lo, hi = self._local_boxes(eids, transforms, models)
+        if self.bounding_box_mode == "aligned":
+            return self._unit_box_to(*transform_aabbs(lo, hi, placement))
+        return placement @ self._unit_box_to(lo, hi)
+
+    def set_bounding_box_mode(self, mode: str):
+        """'oriented' boxes follow each entity's rotation; 'aligned' draws the enclosing world AABB."""
+        if mode not in ("oriented", "aligned"):
+            print(f"Warning: Bounding box mode '{mode}' not recognized.")
             return
+        self.bounding_box_mode = mode
 
-        # Try to get the actual mesh bounds
-        mf = self.scene.entity_manager.get_component(eid, MeshFilter)
-
-        if mf:
-            v = mf.asset.vertices
-            if v is not None and len(v) > 0:
-                min_bounds = np.min(v, axis=0)
-                max_bounds = np.max(v, axis=0)
-                center = (min_bounds + max_bounds) * 0.5
-                size = (max_bounds - min_bounds)
-
-                # Center the unit cube and scale it to fit the mesh
-                model = compute_model_matrix(tr)
-                model = model @ translate_matrix(center) @ scale_matrix(size)
-            else:
-                model = compute_model_matrix(tr)
-        else:
-            tr.scale_x=.5
-            tr.scale_y=.5
-            tr.scale_z=.5
-            model = compute_model_matrix(tr)
-
-        prog = self.bbox_shader.program
-        if 'model' in prog:      prog['model'].write(model.T.astype('f4').tobytes())
-        if 'view' in prog:       prog['view'].write(view.T.astype('f4').tobytes())
-        if 'projection' in prog: prog['projection'].write(proj.T.astype('f4').tobytes())
-        if 'color' in prog:      prog['color'].value = (1.0, 1.0, 0.0)
-        self._bbox_vao.render(moderngl.LINES)
+    def draw_grid(self, proj: np.ndarray, view: np.ndarray):
+        """
+        Draws the infinite ground grid on the XY plane (Z=0). Line spacing adapts to
+        the camera height and the grid fades with distance; depth is written per
+        pixel, so scene geometry occludes it.
+        """
+        vp = (np.asarray(proj, dtype='f8') @ np.asarray(view, dtype='f8'))
+        camera_position = np.linalg.inv(np.asarray(view, dtype='f8'))[:3, 3]
+
+        prog = self.grid_shader.program
+        if prog is not self._grid_program:
+            self._init_grid_vao()
+        if 'view_projection' in prog:     prog['view_projection'].write(vp.T.astype('f4').tobytes())
+        if 'inv_view_projection' in prog: prog['inv_view_projection'].write(np.linalg.inv(vp).T.astype('f4').tobytes())
+        if 'camera_position' in prog:     prog['camera_position'].value = tuple(camera_position)
+        if 'color' in prog:               prog['color'].value = (0.2, 0.2, 0.2) # Dark grey for grid
+        if 'u_grid_step' in prog:         prog['u_grid_step'].value = self.grid_step
+        if 'u_fade_distance' in prog:     prog['u_fade_distance'].value = self.grid_fade_distance
+        self._grid_vao.render(moderngl.TRIANGLES, vertices=3)
 
     def set_enabled(self, name: str, state: bool = True):
         """
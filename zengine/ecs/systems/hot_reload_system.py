@@ -0,0 +1,142 @@
+# zengine/ecs/systems/hot_reload_system.py
+
+from zengine.ecs.systems.system import System
+from zengine.ecs.components import Material
+from zengine.assets.mesh_asset import MeshAsset
+from zengine.assets.mesh_registry import MeshRegistry
+from zengine.assets.texture_asset import TextureAsset
+from zengine.assets.texture_registry import TextureRegistry
+from zengine.graphics.shader_library import ShaderLibrary
+from zengine.util.file_watcher import FileWatcher
+
+# Vertex streams copied from a reloaded MeshAsset into the live one
+MESH_STREAMS = ('vertices', 'normals', 'indices', 'uvs', 'tangents', 'joints', 'weights')
+
+
+def _read_texture(path):
+    from zengine.graphics.texture_loader import read_image_rgba
+    return read_image_rgba(path)
+
+
+class HotReloadSystem(System):
+    """
+    Reloads shaders, textures and meshes when their files change on disk.
+
+    Watched sources:
+    - every shader the context's ShaderLibrary built, including its #includes
+    - TextureRegistry textures that have a `path`
+    - MeshRegistry meshes registered with a path and loader
+
+    A FileWatcher thread polls the files, debounces bursts of writes and does
+    the file work (preprocessing GLSL, decoding images, parsing meshes) off the
+    render thread. The GL side (compiling, uploading) is applied in
+    on_late_update, i.e. between frames, so a frame never sees a half-swapped
+    resource. Anything that fails to load or compile is reported and the old
+    resource stays in place.
+
+    Resources loaded after the system was added are picked up by rescan(),
+    which on_update calls every `rescan_interval` seconds.
+    """
+    def __init__(self, ctx, interval: float = 0.25, debounce: float = 0.2, rescan_interval: float = 1.0):
+        super().__init__()
+        self.ctx = ctx
+        self.shaders = ShaderLibrary.for_context(ctx)
+        self.watcher = FileWatcher(interval=interval, debounce=debounce)
+        self.rescan_interval = rescan_interval
+        self._since_rescan = 0.0
+        self.stats = {"shaders": 0, "textures": 0, "meshes": 0, "failed": 0}
+
+    def on_added(self, scene):
+        super().on_added(scene)
+        self.rescan()
+        self.watcher.start()
+
+    def close(self):
+        self.watcher.stop()
+
+    # --- registration ---------------------------------------------------------
+
+    def rescan(self):
+        """Starts watching any library shader, texture or mesh not watched yet."""
+        for shader in self.shaders.loaded():
+            for path in shader.files:
+                self.watcher.watch(path, self.shaders, self._prepare_shaders)
+
+        for asset in TextureRegistry.all():
+            if asset.path:
+                self.watcher.watch(asset.path, asset, _read_texture)
+
+        for name in MeshRegistry.all_names():
+            source = MeshRegistry.source(name)
+            if source is not None:
+                path, loader = source
+                self.watcher.watch(path, MeshRegistry.get(name), loader)
+
+    def _prepare_shaders(self, path):
+        """Watcher thread: new sources for every shader built from `path`."""
+        return {s: self.shaders.prepare_reload(s) for s in self.shaders.shaders_using(path)}
+
+    # --- frame boundary -------------------------------------------------------
+
+    def on_update(self, dt):
+        self._since_rescan += dt
+        if self._since_rescan >= self.rescan_interval:
+            self._since_rescan = 0.0
+            self.rescan()
+
+    def on_late_update(self, dt):
+        swapped = set()
+        for key, path, payload in self.watcher.poll():
+            if key is self.shaders:
+                for shader, (vs, fs, files) in payload.items():
+                    if shader in swapped:
+                        continue    # saving several of its files at once reloads it once
+                    swapped.add(shader)
+                    self._apply(path, self._swap_shader, shader, vs, fs, files)
+            elif isinstance(key, TextureAsset):
+                self._apply(path, self._swap_texture, key, payload)
+            elif isinstance(key, MeshAsset):
+                self._apply(path, self._swap_mesh, key, payload)
+
+    def _apply(self, path, swap, *args):
+        try:
+            swap(*args)
+        except Exception as e:
+            self.stats["failed"] += 1
+            self.watcher.on_error(path, e)
+            return
+        print(f"🔄 Reloaded '{path}'")
+
+    def _swap_shader(self, shader, vs, fs, files):
+        self.shaders.swap(shader, vs, fs, files)
+        self.stats["shaders"] += 1
+        # a new #include starts being watched right away
+        for path in files:
+            self.watcher.watch(path, self.shaders, self._prepare_shaders)
+
+    def _swap_texture(self, asset, payload):
+        size, data = payload
+        old = asset.texture
+        if tuple(old.size) == tuple(size) and old.components == 4:
+            old.write(data)
+            old.build_mipmaps()
+            self.stats["textures"] += 1
+            return
+
+        # New dimensions need a new texture; repoint every material using the old one
+        new = self.ctx.texture(size, 4, data)
+        new.build_mipmaps()
+        new.filter = old.filter
+        asset.texture = new
+        for eid in self.em.get_entities_with(Material):
+            mat = self.em.get_component(eid, Material)
+            for field in ('albedo_texture', 'normal_map', 'metallic_map', 'roughness_map'):
+                if getattr(mat, field) is old:
+                    setattr(mat, field, new)
+        self.stats["textures"] += 1
+
+    def _swap_mesh(self, asset, loaded):
+        if isinstance(loaded, (list, tuple)):
+            loaded = next((m for m in loaded if getattr(m, 'name', None) == asset.name), loaded[0])
+        asset.update(**{name: getattr(loaded, name) for name in MESH_STREAMS})
+        self.stats["meshes"] += 1
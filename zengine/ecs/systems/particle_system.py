@@ -0,0 +1,166 @@
+# zengine/ecs/systems/particle_system.py
+
+import moderngl
+import numpy as np
+
+from zengine.assets.texture_asset import TextureAsset
+from zengine.ecs.systems.system import System
+from zengine.ecs.components import Transform, ParticleEmitter
+from zengine.ecs.components.camera import CameraComponent
+from zengine.ecs.systems.profiler_system import profile_pass
+from zengine.ecs.systems.render_graph_system import RenderGraphSystem
+from zengine.graphics import render_graph
+from zengine.graphics.shader_library import ShaderLibrary
+from zengine.util.particles import ParticlePool, cone_directions
+from zengine.util.transforms import quats_to_mat3
+
+# billboard quad as a triangle strip, shared by every instance
+BILLBOARD = np.array([(-0.5, -0.5), (0.5, -0.5), (-0.5, 0.5), (0.5, 0.5)], dtype='f4')
+INSTANCE_FLOATS = 8     # center 3, size 1, color 4
+
+
+class ParticleSystem(System):
+    """
+    Simulates ParticleEmitter components and draws them as instanced billboards.
+
+    on_update spawns from each emitter's rate and pending bursts, then runs
+    the vectorized kernels over its pool (gravity and drag, curl noise,
+    size/color over life) and compacts out dead particles. on_render packs
+    the live particles into the emitter's instance buffer with one write
+    and draws them all in one instanced call per emitter.
+
+    Particles blend over the scene with depth testing but no depth writes,
+    and are not sorted; `additive` emitters are order-independent.
+    """
+    def __init__(self, ctx, scene=None):
+        super().__init__()
+        self.ctx = ctx
+        self.scene = scene
+        self.shader = ShaderLibrary.for_context(ctx).load("particle_vert.glsl", "particle_frag.glsl")
+        self.quad = ctx.buffer(BILLBOARD.tobytes())
+        self._buffers = {}      # eid -> (instance vbo, vao, capacity, program)
+        self.stats = {"emitters": 0, "particles": 0, "draws": 0}
+
+    # --- simulation -------------------------------------------------------------------
+
+    def _spawn(self, em: ParticleEmitter, tr: Transform, dt: float):
+        pool = em.pool
+        owed = pool.spawn_carry + (em.rate * dt if em.emitting else 0.0)
+        n = int(owed)
+        pool.spawn_carry = owed - n
+        n += em.pending
+        em.pending = 0
+        n = min(n, pool.capacity - pool.count)
+        if n <= 0:
+            return
+
+        rng = pool.rng
+        rot = quats_to_mat3((tr.rotation_x, tr.rotation_y, tr.rotation_z, tr.rotation_w))[0]
+        axis = rot @ np.asarray(em.direction, dtype='f4')
+        speed = rng.uniform(em.speed[0], em.speed[1], n).astype('f4')
+        velocity = cone_directions(rng, n, axis, em.spread) * speed[:, None]
+        lifetime = rng.uniform(em.lifetime[0], em.lifetime[1], n).astype('f4')
+        pool.spawn(n, (tr.x, tr.y, tr.z), velocity, lifetime)
+
+    def simulate(self, em: ParticleEmitter, tr: Transform, dt: float):
+        if em.pool is None or em.pool.capacity != em.capacity:
+            em.pool = ParticlePool(em.capacity, em.seed)
+        pool = em.pool
+        pool.swirl(dt, em.noise_strength, em.noise_scale)
+        pool.integrate(dt, em.gravity, em.drag)
+        pool.compact()
+        self._spawn(em, tr, dt)
+        pool.over_life(em.start_size, em.end_size, em.start_color, em.end_color)
+
+    def on_update(self, dt):
+        em = self.scene.entity_manager
+        transforms = em.components.get(Transform, {})
+        for eid, emitter in em.components.get(ParticleEmitter, {}).items():
+            tr = transforms.get(eid)
+            if tr is not None:
+                self.simulate(emitter, tr, dt)
+
+    # --- drawing ----------------------------------------------------------------------
+
+    def _instances(self, eid, capacity):
+        prog = self.shader.program
+        entry = self._buffers.get(eid)
+        if entry is not None and entry[2] == capacity and entry[3] is prog:
+            return entry
+        vbo = None
+        if entry is not None:
+            entry[1].release()
+            if entry[2] == capacity:
+                vbo = entry[0]      # only the program changed (hot-reload)
+            else:
+                entry[0].release()
+        if vbo is None:
+            vbo = self.ctx.buffer(reserve=capacity * INSTANCE_FLOATS * 4, dynamic=True)
+        vao = self.ctx.vertex_array(prog, [
+            (self.quad, '2f', 'in_corner'),
+            (vbo, '3f 1f 4f/i', 'in_center', 'in_size', 'in_color'),
+        ])
+        entry = self._buffers[eid] = (vbo, vao, capacity, prog)
+        return entry
+
+    def _camera(self):
+        cam_e = self.scene.active_camera
+        if cam_e is None:
+            return None
+        return self.scene.entity_manager.get_component(cam_e, CameraComponent)
+
+    def _render(self, cam):
+        emitters = self.scene.entity_manager.components.get(ParticleEmitter, {})
+        for eid in self._buffers.keys() - emitters.keys():
+            vbo, vao, _, _ = self._buffers.pop(eid)
+            vao.release()
+            vbo.release()
+
+        prog = self.shader.program
+        if 'view' in prog:       prog['view'].write(np.asarray(cam.view_matrix, dtype='f4').T.tobytes())
+        if 'projection' in prog: prog['projection'].write(np.asarray(cam.projection_matrix, dtype='f4').T.tobytes())
+        if 'u_texture' in prog:  prog['u_texture'].value = 0
+
+        self.stats.update(emitters=len(emitters), particles=0, draws=0)
+        self.ctx.depth_mask = False
+        for eid, em in emitters.items():
+            pool = em.pool
+            if pool is None or pool.count == 0:
+                continue
+            n = pool.count
+            vbo, vao, _, _ = self._instances(eid, pool.capacity)
+            data = np.empty((n, INSTANCE_FLOATS), dtype='f4')
+            data[:, 0:3] = pool.position[:n]
+            data[:, 3] = pool.size[:n]
+            data[:, 4:8] = pool.color[:n]
+            vbo.orphan()
+            vbo.write(data.tobytes())
+
+            tex = em.texture.texture if isinstance(em.texture, TextureAsset) else em.texture
+            if tex is not None:
+                tex.use(location=0)
+            if 'u_has_texture' in prog: prog['u_has_texture'].value = tex is not None
+            if em.additive:
+                self.ctx.blend_func = (moderngl.SRC_ALPHA, moderngl.ONE)
+            vao.render(moderngl.TRIANGLE_STRIP, vertices=4, instances=n)
+            if em.additive:
+                self.ctx.blend_func = (moderngl.SRC_ALPHA, moderngl.ONE_MINUS_SRC_ALPHA)
+            self.stats["particles"] += n
+            self.stats["draws"] += 1
+        self.ctx.depth_mask = True
+
+    def on_render(self, renderer):
+        if self.scene.get_system(RenderGraphSystem) is not None:
+            return      # drawn through add_render_passes()
+        cam = self._camera()
+        if cam is None or cam.view_matrix is None:
+            return
+        with profile_pass(self.scene, "particles"):
+            self._render(cam)
+
+    def add_render_passes(self, graph):
+        cam = self._camera()
+        if cam is None or cam.view_matrix is None:
+            return
+        graph.add_pass("particles", lambda g: self._render(cam),
+                       order=render_graph.TRANSPARENT + 10, color=("color",), depth="depth")
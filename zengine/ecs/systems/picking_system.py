@@ -0,0 +1,176 @@
+# zengine/ecs/systems/picking_system.py
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from zengine.ecs.systems.system import System
+from zengine.ecs.systems.input_system import InputSystem
+from zengine.ecs.systems.spatial_index_system import SpatialIndexSystem
+from zengine.ecs.components import Transform, MeshFilter
+from zengine.ecs.components.camera import CameraComponent
+from zengine.util.intersection import ray_aabbs, ray_triangles
+from zengine.util.transforms import compute_model_matrices
+
+
+@dataclass
+class RaycastHit:
+    entity: int
+    distance: float
+    point: np.ndarray      # world-space hit point
+    triangle: int = -1     # triangle index in the mesh, -1 for bounds-only hits
+
+
+def screen_to_ray(x, y, width, height, proj: np.ndarray, view: np.ndarray):
+    """
+    Unprojects a window position (pixels, origin top-left as pygame reports it)
+    into a world-space ray. Returns (origin on the near plane, unit direction).
+    """
+    ndc_x = 2.0 * x / width - 1.0
+    ndc_y = 1.0 - 2.0 * y / height
+
+    inv_vp = np.linalg.inv(np.asarray(proj, dtype='f8') @ np.asarray(view, dtype='f8'))
+    near = inv_vp @ np.array([ndc_x, ndc_y, -1.0, 1.0])
+    far = inv_vp @ np.array([ndc_x, ndc_y, 1.0, 1.0])
+    near = near[:3] / near[3]
+    far = far[:3] / far[3]
+
+    direction = far - near
+    return near, direction / np.linalg.norm(direction)
+
+
+class PickingSystem(System):
+    """
+    Finds what is under the cursor (or along any ray). Candidates come from the
+    scene's SpatialIndexSystem; their tight bounds are tested, then optionally
+    every triangle of their MeshAsset with a vectorized Möller–Trumbore pass
+    done in the entity's local space.
+
+    Skinned meshes are tested in their bind pose.
+    """
+    def __init__(self, exact: bool = True):
+        super().__init__()
+        self.exact = exact
+        self._triangles = {}   # id(MeshAsset) -> (asset, v0, e1, e2)
+
+    @property
+    def input(self):
+        """The scene's InputSystem, looked up on each use so it may be added after this system."""
+        return self.scene.get_system(InputSystem) if self.scene is not None else None
+
+    def _spatial(self) -> SpatialIndexSystem:
+        spatial = self.scene.get_system(SpatialIndexSystem)
+        if spatial is None:
+            raise RuntimeError("PickingSystem needs a SpatialIndexSystem in the scene")
+        return spatial
+
+    def _mesh_triangles(self, asset):
+        entry = self._triangles.get(id(asset))
+        if entry is None or entry[0] is not asset or entry[1] != asset.revision:
+            v = np.asarray(asset.vertices, dtype='f8').reshape(-1, 3)
+            tris = np.asarray(asset.indices, dtype='i8').reshape(-1, 3)
+            v0 = v[tris[:, 0]]
+            entry = (asset, asset.revision, v0, v[tris[:, 1]] - v0, v[tris[:, 2]] - v0)
+            self._triangles[id(asset)] = entry
+        return entry[2:]
+
+    def screen_ray(self, x, y):
+        """World-space ray through a window position for the active camera."""
+        cam_e = self.scene.active_camera
+        cam = self.em.get_component(cam_e, CameraComponent) if cam_e is not None else None
+        if cam is None or cam.vp_matrix is None:
+            return None
+
+        window = getattr(self.scene, 'window', None)
+        width = window.width if window else 1
+        height = window.height if window else 1
+        return screen_to_ray(x, y, width, height, cam.projection_matrix, cam.view_matrix)
+
+    def raycast(self, origin, direction, max_distance: float = math.inf,
+                exact: bool = None, nearest_only: bool = False) -> list:
+        """
+        All hits along a world-space ray, nearest first. `direction` should be
+        normalized for distances to be in world units.
+        """
+        exact = self.exact if exact is None else exact
+        origin = np.asarray(origin, dtype='f8')
+        direction = np.asarray(direction, dtype='f8')
+
+        spatial = self._spatial()
+        candidates = [eid for _, eid in spatial.query_ray(origin, direction, max_distance)]
+        if not candidates:
+            return []
+
+        # Tight world bounds for every candidate at once
+        bounds = [spatial.get_bounds(eid) for eid in candidates]
+        lo = np.array([b[0] for b in bounds])
+        hi = np.array([b[1] for b in bounds])
+        hit, t_box = ray_aabbs(origin, direction, lo, hi, max_distance)
+
+        order = np.argsort(t_box)
+        candidates = [candidates[i] for i in order if hit[i]]
+        t_box = t_box[order][hit[order]]
+
+        if not exact:
+            hits = [RaycastHit(eid, float(t), origin + direction * t)
+                    for eid, t in zip(candidates, t_box)]
+            return hits[:1] if nearest_only else hits
+
+        transforms = [self.em.get_component(eid, Transform) for eid in candidates]
+        models = compute_model_matrices(transforms).astype('f8')
+
+        hits = []
+        best = max_distance
+        for eid, t_entry, model in zip(candidates, t_box, models):
+            # Boxes are sorted by entry distance, so nothing further can be nearer
+            if nearest_only and t_entry > best:
+                break
+
+            mf = self.em.get_component(eid, MeshFilter)
+            v0, e1, e2 = self._mesh_triangles(mf.asset)
+            if len(v0) == 0:
+                continue
+
+            # Test in local space; t is preserved by the affine transform
+            inv = np.linalg.inv(model)
+            l_origin = inv[:3, :3] @ origin + inv[:3, 3]
+            l_dir = inv[:3, :3] @ direction
+            tri_hit, t = ray_triangles(l_origin, l_dir, v0, e1, e2)
+            if not tri_hit.any():
+                continue
+
+            tri = int(np.argmin(t))
+            t_hit = float(t[tri])
+            if t_hit > max_distance:
+                continue
+            hits.append(RaycastHit(eid, t_hit, origin + direction * t_hit, tri))
+            best = min(best, t_hit)
+
+        hits.sort(key=lambda h: h.distance)
+        return hits[:1] if nearest_only else hits
+
+    def pick_all(self, x=None, y=None, exact: bool = None) -> list:
+        """Every hit under a window position (defaults to the mouse), nearest first."""
+        if x is None or y is None:
+            input_system = self.input
+            if input_system is None:
+                return []
+            x, y = input_system.get_mouse_pos()
+        ray = self.screen_ray(x, y)
+        if ray is None:
+            return []
+        return self.raycast(ray[0], ray[1], exact=exact)
+
+    def pick(self, x=None, y=None, exact: bool = None):
+        """Nearest RaycastHit under a window position (defaults to the mouse), or None."""
+        if x is None or y is None:
+            input_system = self.input
+            if input_system is None:
+                return None
+            x, y = input_system.get_mouse_pos()
+        ray = self.screen_ray(x, y)
+        if ray is None:
+            return None
+        hits = self.raycast(ray[0], ray[1], exact=exact, nearest_only=True)
+        return hits[0] if hits else None
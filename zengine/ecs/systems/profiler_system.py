@@ -0,0 +1,49 @@
+# zengine/ecs/systems/profiler_system.py
+
+from contextlib import nullcontext
+
+from zengine.ecs.systems.system import System
+from zengine.graphics.gpu_profiler import GPUProfiler
+
+
+def profile_pass(scene, name: str):
+    """`with profile_pass(self.scene, "name"):` times a pass if the scene has a ProfilerSystem."""
+    system = scene.get_system(ProfilerSystem) if scene is not None else None
+    if system is None or not system.enabled:
+        return nullcontext()
+    return system.profiler.scope(name)
+
+
+class ProfilerSystem(System):
+    """
+    Frame timeline for the scene: RenderSystem, ShadowSystem and DebugRenderSystem
+    wrap their passes in profile_pass() when this system is present.
+
+    A frame runs from one on_late_update to the next, so its CPU time covers
+    update, render and present. GPU results arrive `latency` frames late; see
+    GPUProfiler.
+    """
+    def __init__(self, ctx, latency: int = 3, history: int = 240, gpu: bool = True):
+        super().__init__()
+        self.profiler = GPUProfiler(ctx, latency=latency, history=history, gpu=gpu)
+        self.enabled = True
+
+    @property
+    def timeline(self):
+        return self.profiler.timeline
+
+    def on_added(self, scene):
+        super().on_added(scene)
+        self.profiler.begin_frame()
+
+    def on_late_update(self, dt):
+        self.profiler.end_frame()
+        if self.enabled:
+            self.profiler.begin_frame()
+
+    def summary(self, frames: int = None) -> dict:
+        return self.profiler.summary(frames)
+
+    def export_chrome_trace(self, path, frames: int = None):
+        self.profiler.flush()
+        self.profiler.export_chrome_trace(path, frames)
@@ -0,0 +1,104 @@
+# zengine/ecs/systems/render_graph_system.py
+
+import moderngl
+
+from zengine.ecs.systems.system import System
+from zengine.ecs.systems.profiler_system import profile_pass
+from zengine.graphics import render_graph
+from zengine.graphics.render_graph import RenderGraph, FramebufferPool, TextureDesc, BACKBUFFER
+from zengine.graphics.shader import Shader
+from zengine.graphics.shader_library import ShaderLibrary
+
+
+class RenderGraphSystem(System):
+    """
+    Renders the scene through a RenderGraph instead of system order.
+
+    Each frame every system with an `add_render_passes(graph)` method declares
+    its passes (ShadowSystem, RenderSystem, DebugRenderSystem do; their own
+    on_render then does nothing). Passes are declared in system order but run
+    in pass order (shadow, pre-pass, opaque, transparent, debug, post), and
+    passes whose output nothing uses are culled.
+
+    Scene passes draw into "color" and "depth". Without post effects those
+    are the target framebuffer itself; with post effects they are pooled
+    offscreen textures, and each effect is a fullscreen pass sampling the
+    previous result as `u_source`, the last one writing to the target.
+    Extra passes can be declared by any system or by `extra_passes` callbacks.
+    """
+    def __init__(self, ctx, pool: FramebufferPool = None, hdr: bool = False, clear_color=None):
+        super().__init__()
+        self.ctx = ctx
+        self.pool = pool or FramebufferPool(ctx)
+        self.shaders = ShaderLibrary.for_context(ctx)
+        self.color_dtype = 'f2' if hdr else 'f1'
+        self.clear_color = clear_color     # offscreen "color" background; None = the scene's
+        self.post_effects = []      # (Shader, uniforms)
+        self.extra_passes = []      # callables taking the graph
+        self.graph = None           # last frame's graph, for inspection
+        self._fullscreen = {}       # Shader -> (program, attribute-less vao)
+
+    def add_post_effect(self, fragment, **uniforms) -> Shader:
+        """Appends a fullscreen effect (fragment file name or Shader) to the post chain."""
+        shader = fragment if isinstance(fragment, Shader) else self.shaders.load("fullscreen_vert.glsl", fragment)
+        self.post_effects.append((shader, uniforms))
+        return shader
+
+    def _add_post_passes(self, graph, size):
+        source = "color"
+        for i, (shader, uniforms) in enumerate(self.post_effects):
+            last = i == len(self.post_effects) - 1
+            target = BACKBUFFER if last else f"post_{i}"
+            if not last:
+                graph.create(target, TextureDesc(size, 4, self.color_dtype))
+            graph.add_pass(f"post_{i}", self._post_pass(shader, uniforms, source),
+                           order=render_graph.POST, color=(target,), reads=(source,))
+            source = target
+
+    def _post_pass(self, shader, uniforms, source):
+        def execute(graph):
+            prog = shader.program
+            entry = self._fullscreen.get(shader)
+            if entry is None or entry[0] is not prog:     # new, or the effect was hot-reloaded
+                if entry is not None:
+                    entry[1].release()
+                entry = self._fullscreen[shader] = (prog, self.ctx.vertex_array(prog, []))
+            vao = entry[1]
+            graph.texture(source).use(location=0)
+            if 'u_source' in prog:
+                prog['u_source'].value = 0
+            if 'u_texel_size' in prog:
+                w, h = graph.texture(source).size
+                prog['u_texel_size'].value = (1.0 / w, 1.0 / h)
+            for name, value in uniforms.items():
+                if name in prog:
+                    prog[name].value = value
+            self.ctx.disable(moderngl.DEPTH_TEST)
+            vao.render(moderngl.TRIANGLES, vertices=3)
+            self.ctx.enable(moderngl.DEPTH_TEST)
+        return execute
+
+    def on_render(self, renderer):
+        target = self.ctx.fbo
+        size = tuple(self.ctx.viewport[2:])
+
+        clear_color = self.clear_color if self.clear_color is not None else self.scene.clear_color
+        graph = RenderGraph(self.ctx, self.pool, clear_color=clear_color)
+        graph.import_resource(BACKBUFFER, target)
+        if self.post_effects:
+            graph.create("color", TextureDesc(size, 4, self.color_dtype))
+            graph.create("depth", TextureDesc(size, depth=True))
+        else:
+            graph.import_resource("color", target)
+            graph.import_resource("depth", target)
+
+        for system in self.scene.systems:
+            if system is not self and hasattr(system, 'add_render_passes'):
+                system.add_render_passes(graph)
+        for declare in self.extra_passes:
+            declare(graph)
+        self._add_post_passes(graph, size)
+
+        graph.execute(scope=lambda name: profile_pass(self.scene, name))
+        self.pool.end_frame()
+        self.graph = graph
@@ -1,6 +1,8 @@
 # zengine/ecs/systems/render_system.py
 import struct
 import time
+from dataclasses import dataclass
+from enum import Enum
 
 import moderngl
 import numpy as np
@@ -8,11 +10,23 @@ import math
 
 from zengine.ecs.systems.system import System
 from zengine.ecs.components import Transform, MeshFilter, Material, MeshRenderer
-from zengine.ecs.components.camera import CameraComponent
-from zengine.ecs.components.light import LightComponent, LightType
+from zengine.ecs.components.camera import CameraComponent, ProjectionType
+from zengine.ecs.components.light import LightType
+from zengine.ecs.systems.spatial_index_system import SpatialIndexSystem
+from zengine.ecs.systems.shadow_system import ShadowSystem
+from zengine.ecs.systems.profiler_system import profile_pass
+from zengine.ecs.systems.render_graph_system import RenderGraphSystem
 from zengine.util.quaternion import quat_to_mat4
-from zengine.animation.skin_utils import compute_joint_matrices
-from scipy.spatial.transform import Rotation as R
+from zengine.graphics.clustered_lighting import ClusteredLightGrid
+from zengine.graphics import render_graph
+from zengine.graphics.gbuffer import GBuffer
+from zengine.graphics.joint_palette import JointPaletteTexture
+from zengine.graphics.shader import Shader
+from zengine.graphics.shader_library import ShaderLibrary
+from zengine.graphics.light_cache import LightCache
+from zengine.graphics.light_selection import light_influence, select_lights
+from zengine.util.intersection import transform_aabbs, screen_coverage
+from zengine.util.transforms import compute_model_matrices
 
 def compute_model_matrix(tr: Transform) -> np.ndarray:
     T = np.eye(4, dtype='f4'); T[:3, 3] = (tr.x, tr.y, tr.z)
@@ -21,12 +35,71 @@ def compute_model_matrix(tr: Transform) -> np.ndarray:
     return T @ Rm @ S
 
 
+class RenderPath(Enum):
+    FORWARD         = 0   # shade every rasterized fragment
+    FORWARD_PREPASS = 1   # depth-only pass first, then shade with depth-equal testing
+    DEFERRED        = 2   # G-buffer, then light each screen pixel once (FORWARD_PREPASS while shadows are cast)
+    AUTO            = 3   # pick per frame from light count and estimated overdraw
+
+
 class RenderSystem(System):
-    def __init__(self, ctx, scene):
+    # Texture units reserved for the joint palette, the G-buffer (4 units) and the clustered lighting tables
+    JOINT_PALETTE_UNIT = 6
+    GBUFFER_UNIT = 7
+    LIGHT_DATA_UNIT = 13
+    CLUSTER_GRID_UNIT = 14
+    LIGHT_INDEX_UNIT = 15
+    MAX_LIGHTS = 16
+    MAX_DIR_LIGHTS = 4
+
+    # RenderPath.AUTO thresholds
+    DEFERRED_MIN_LIGHTS = 16
+    PREPASS_MIN_OVERDRAW = 2.0
+
+    def __init__(self, ctx, scene, cluster_dims=(16, 9, 24), lights_per_object=None,
+                 render_path: 'RenderPath' = None):
         super().__init__()
         self.ctx = ctx
         self.scene = scene
-        self._vao_cache = {}
+        self._vao_cache = {}    # (mesh name, program glo) -> (revision, program, vao, vbo, ibo)
+
+        # How opaque geometry is shaded; see RenderPath. Can be changed at any time.
+        self.render_path = render_path or RenderPath.FORWARD
+        self.active_path = self.render_path     # what the last frame actually used
+
+        # Programs come from the context's shared library: static meshes get the
+        # SKINNED=0 variant of their material's shader, and the pre-pass / G-buffer
+        # programs reuse each material's own vertex stage (so depth matches exactly)
+        self.shaders = ShaderLibrary.for_context(ctx)
+        self._prepass_frag = self.shaders.source("depth_prepass_frag.glsl")
+        self._gbuffer_frag = self.shaders.source("gbuffer_frag.glsl")
+        self._pass_programs = {}    # (vertex source, fragment source) -> Shader
+        self._shader_generation = self.shaders.generation
+
+        # Every skeleton's joints for the frame in one texture, shared by all its primitives
+        self.joint_palettes = JointPaletteTexture(ctx)
+
+        # Deferred lighting: built lazily with the G-buffer
+        self._deferred = None
+        self._fullscreen = None     # (program, attribute-less vao) for the lighting pass
+        self._gbuffer = None
+
+        # When set, each draw gets only its K most influential lights instead
+        # of the first 16 in the scene (cheaper alternative to clustering)
+        self.lights_per_object = lights_per_object
+
+        # Packed light arrays, re-packed only for lights that changed
+        self.light_cache = LightCache()
+        self._light_upload = (np.zeros((self.MAX_LIGHTS, 3), dtype='f4'),
+                              np.zeros((self.MAX_LIGHTS, 3), dtype='f4'),
+                              np.zeros(self.MAX_LIGHTS, dtype='f4'),
+                              np.zeros(self.MAX_LIGHTS, dtype='f4'))
+        self._shadow_upload = np.full(self.MAX_LIGHTS, -1, dtype='i4')
+
+        # Clustered forward lighting: built lazily, only once a material's
+        # shader declares the cluster tables (see clustered_frag.glsl)
+        self.cluster_dims = cluster_dims
+        self.light_grid = None
 
         # Depth/cull as you had
         self.ctx.enable(moderngl.DEPTH_TEST)
@@ -40,195 +113,573 @@ class RenderSystem(System):
     def on_update(self, dt):
         pass
 
-    def _collect_lights(self):
-        """Collect lights once per frame, return padded arrays ready for upload and used count."""
-        MAX_LIGHTS = 16
-        positions = []
-        colors = []
-        intensities = []
-        ranges = []
-
-        # Use entity_manager consistently
-        for eid in self.scene.entity_manager.get_entities_with(Transform, LightComponent):
-            lc = self.scene.entity_manager.get_component(eid, LightComponent)
-            tr = self.scene.entity_manager.get_component(eid, Transform)
-            if lc is None or tr is None:
-                continue
-
-            if lc.type == LightType.DIRECTIONAL:
-                # derive forward from quaternion (x, y, z, w)
-                fwd = R.from_quat([tr.rotation_x, tr.rotation_y, tr.rotation_z, tr.rotation_w]).apply([0.0, 0.0, -1.0])
-                far = 1e6
-                pos = (-np.asarray(fwd, dtype='f4') * far)
-                positions.append((float(pos[0]), float(pos[1]), float(pos[2])))
-                ranges.append(float(far))
-            else:
-                positions.append((float(tr.x), float(tr.y), float(tr.z)))
-                ranges.append(float(lc.range))
-
-            colors.append((float(lc.color[0]), float(lc.color[1]), float(lc.color[2])))
-            intensities.append(float(lc.intensity))
-
-        used = min(len(positions), MAX_LIGHTS)
-
-        # pad/clip
-        if used < MAX_LIGHTS:
-            pad = MAX_LIGHTS - used
-            positions += [(0.0, 0.0, 0.0)] * pad
-            colors    += [(0.0, 0.0, 0.0)] * pad
-            intensities += [0.0] * pad
-            ranges      += [0.0] * pad
-
-        positions = positions[:MAX_LIGHTS]
-        colors    = colors[:MAX_LIGHTS]
-        intensities = intensities[:MAX_LIGHTS]
-        ranges      = ranges[:MAX_LIGHTS]
-
-        # pack to contiguous arrays
-        pos_arr = np.asarray(positions, dtype='f4').reshape(MAX_LIGHTS, 3)
-        col_arr = np.asarray(colors, dtype='f4').reshape(MAX_LIGHTS, 3)
-        int_arr = np.asarray(intensities, dtype='f4').reshape(MAX_LIGHTS)
-        rng_arr = np.asarray(ranges, dtype='f4').reshape(MAX_LIGHTS)
+    @property
+    def gbuffer(self) -> GBuffer:
+        if self._gbuffer is None:
+            self._gbuffer = GBuffer(self.ctx)
+        return self._gbuffer
+
+    @property
+    def _deferred_light(self) -> Shader:
+        if self._deferred is None:
+            self._deferred = self.shaders.load("fullscreen_vert.glsl", "deferred_light_frag.glsl")
+        if self._fullscreen is None or self._fullscreen[0] is not self._deferred.program:
+            # first use, or the lighting shader was hot-reloaded
+            if self._fullscreen is not None:
+                self._fullscreen[1].release()
+            self._fullscreen = (self._deferred.program, self.ctx.vertex_array(self._deferred.program, []))
+        return self._deferred
+
+    def _gather_lights(self):
+        """
+        All lights as packed arrays: (kinds, positions, directions, colors, intensities, ranges).
+        Only lights whose Transform or LightComponent changed are re-packed (see LightCache).
+        """
+        return self.light_cache.update(self.scene.entity_manager)
+
+    def _collect_lights(self, lights, indices=None):
+        """
+        Pack gathered lights into padded arrays ready for upload, plus the used count.
+        Takes the first MAX_LIGHTS lights, or the given light indices (per-object selection).
+        """
+        _, positions, _, colors, intensities, ranges = lights
+        if indices is None:
+            indices = slice(0, min(len(positions), self.MAX_LIGHTS))
+        positions = positions[indices]
+        used = min(len(positions), self.MAX_LIGHTS)
+
+        # pad/clip into the reused upload arrays
+        pos_arr, col_arr, int_arr, rng_arr = self._light_upload
+        pos_arr[:used] = positions[:used]
+        col_arr[:used] = colors[indices][:used]
+        int_arr[:used] = intensities[indices][:used]
+        rng_arr[:used] = ranges[indices][:used]
+        pos_arr[used:] = 0.0
+        col_arr[used:] = 0.0
+        int_arr[used:] = 0.0
+        rng_arr[used:] = 0.0
         return used, pos_arr, col_arr, int_arr, rng_arr
 
-    def on_render(self, renderer):
+    def _light_shadows(self, shadows):
+        """Shadow slot of every gathered light (see ShadowSystem.shadow_index), -1 without one."""
+        entities = self.light_cache.entities
+        if shadows is None:
+            return np.full(len(entities), -1, dtype='i4')
+        return np.array([shadows.shadow_index(eid) for eid in entities], dtype='i4')
+
+    def _collect_shadows(self, light_shadows, indices=None):
+        """Shadow slots for the lights _collect_lights packed, padded with -1."""
+        if indices is None:
+            indices = slice(0, min(len(light_shadows), self.MAX_LIGHTS))
+        selected = light_shadows[indices][:self.MAX_LIGHTS]
+        arr = self._shadow_upload
+        arr[:len(selected)] = selected
+        arr[len(selected):] = -1
+        return arr
+
+    def _select_object_lights(self, entities, lights):
+        """
+        Top-K light selection for every entity at once: bounding spheres come from
+        the cached mesh bounds, influences for all (entity, light) pairs are computed
+        in one vectorized pass. Returns {eid: light indices}.
+        """
+        kinds, positions, _, colors, intensities, ranges = lights
+        em = self.scene.entity_manager
+        entities = list(entities)
+        if not entities:
+            return {}
+
+        transforms = [em.get_component(eid, Transform) for eid in entities]
+        bounds = [em.get_component(eid, MeshFilter).asset.bounds() for eid in entities]
+        lo = np.array([b[0] for b in bounds])
+        hi = np.array([b[1] for b in bounds])
+        w_lo, w_hi = transform_aabbs(lo, hi, compute_model_matrices(transforms))
+        centers = (w_lo + w_hi) * 0.5
+        radii = np.linalg.norm(w_hi - w_lo, axis=1) * 0.5
+
+        influence = light_influence(centers, radii, positions, colors, intensities, ranges,
+                                    kinds == LightType.DIRECTIONAL.value)
+        top, counts = select_lights(influence, min(self.lights_per_object, self.MAX_LIGHTS))
+        return {eid: top[i, :counts[i]] for i, eid in enumerate(entities)}
+
+    def _build_light_clusters(self, lights, cp_cam, view, proj):
+        """Bins point lights for the clustered shader; directional lights go to small uniform arrays."""
+        kinds, positions, directions, colors, intensities, ranges = lights
+        if self.light_grid is None:
+            self.light_grid = ClusteredLightGrid(self.ctx, self.cluster_dims)
+
+        ortho = cp_cam.projection is ProjectionType.ORTHOGRAPHIC
+        near, far = (cp_cam.near, cp_cam.far) if ortho else (cp_cam.p_near, cp_cam.p_far)
+
+        point = kinds == LightType.POINT.value
+        self.light_grid.build(view, proj, near, far,
+                              positions[point], colors[point], intensities[point], ranges[point],
+                              ortho=ortho)
+
+        directional = np.nonzero(~point)[0][:self.MAX_DIR_LIGHTS]
+        n = len(directional)
+        dir_arr = np.zeros((self.MAX_DIR_LIGHTS, 3), dtype='f4')
+        col_arr = np.zeros((self.MAX_DIR_LIGHTS, 3), dtype='f4')
+        int_arr = np.zeros(self.MAX_DIR_LIGHTS, dtype='f4')
+        dir_arr[:n] = directions[directional]
+        col_arr[:n] = colors[directional]
+        int_arr[:n] = intensities[directional]
+        return n, dir_arr, col_arr, int_arr
+
+    # --- render path selection ------------------------------------------
+
+    def choose_render_path(self, light_count: int, overdraw: float, shadows_active: bool) -> 'RenderPath':
+        """
+        Resolves RenderPath.AUTO for this frame. Deferred shading pays off once
+        there are many lights (it lights each pixel once, however many surfaces
+        were drawn there) but doesn't sample shadow maps; a depth pre-pass
+        pays off once the estimated overdraw is high enough that shading hidden
+        fragments costs more than drawing the geometry twice.
+        """
+        if self.render_path is not RenderPath.AUTO:
+            return self.render_path
+        if light_count >= self.DEFERRED_MIN_LIGHTS and not shadows_active:
+            return RenderPath.DEFERRED
+        if overdraw >= self.PREPASS_MIN_OVERDRAW:
+            return RenderPath.FORWARD_PREPASS
+        return RenderPath.FORWARD
+
+    def _estimate_overdraw(self, entities, vp):
+        """Sum of the screen coverage of every entity's bounds: ~ average layers per pixel."""
+        if not entities:
+            return 0.0
+        em = self.scene.entity_manager
+        spatial = self.scene.get_system(SpatialIndexSystem)
+        bounds = [spatial.get_bounds(eid) if spatial is not None else None for eid in entities]
+        missing = [i for i, b in enumerate(bounds) if b is None]
+        if missing:
+            transforms = [em.get_component(entities[i], Transform) for i in missing]
+            local = [em.get_component(entities[i], MeshFilter).asset.bounds() for i in missing]
+            w_lo, w_hi = transform_aabbs(np.array([b[0] for b in local]), np.array([b[1] for b in local]),
+                                         compute_model_matrices(transforms))
+            for i, lo, hi in zip(missing, w_lo, w_hi):
+                bounds[i] = (lo, hi)
+        lo = np.array([b[0] for b in bounds])
+        hi = np.array([b[1] for b in bounds])
+        return float(screen_coverage(lo, hi, vp).sum())
+
+    @staticmethod
+    def _is_opaque(mat) -> bool:
+        return mat.render_queue < 3000 and (mat.albedo_texture is not None or mat.albedo[3] >= 1.0)
+
+    # --- per-draw state ---------------------------------------------------
+
+    def _shader_for(self, mat, mf) -> Shader:
+        """The material's shader, switched to its static variant for meshes without a skin."""
+        shader = mat.shader
+        if shader.library is None:
+            return shader
+        skinned = getattr(mf.asset, 'skin_asset', None) is not None
+        return shader.library.variant(shader, SKINNED=skinned)
+
+    def _companion_program(self, shader, fragment_source):
+        """Program sharing a shader's vertex stage with a pass-specific fragment stage."""
+        key = (shader.vertex_source, fragment_source)
+        companion = self._pass_programs.get(key)
+        if companion is None:
+            companion = self._pass_programs[key] = self.shaders.from_source(shader.vertex_source, fragment_source)
+        return companion.program
+
+    def _evict_stale_programs(self):
+        """After a shader hot-reload: frees companion programs and vertex arrays of replaced programs."""
+        if self._shader_generation == self.shaders.generation:
+            return
+        vertex_sources = {s.vertex_source for s in self.shaders.loaded()}
+        for key in [k for k in self._pass_programs if k[0] not in vertex_sources]:
+            self.shaders.release(self._pass_programs.pop(key))
+        live = {id(p) for p in self.shaders.programs()}
+        for key in [k for k, entry in self._vao_cache.items() if id(entry[1]) not in live]:
+            self._release_vao(key)
+        self._shader_generation = self.shaders.generation
+
+    def _release_vao(self, key):
+        _, _, vao, vbo, ibo = self._vao_cache.pop(key)
+        for obj in (vao, vbo, ibo):
+            obj.release()
+
+    def _apply_transform(self, prog, model, frame):
+        if 'model' in prog:      prog['model'].write(model.T.astype('f4').tobytes())
+        if 'view' in prog:       prog['view'].write(frame.view.T.astype('f4').tobytes())
+        if 'projection' in prog: prog['projection'].write(frame.proj.T.astype('f4').tobytes())
+
+    def _apply_lighting(self, prog, eid, frame):
+        # camera + ambient
+        if 'camera_position' in prog:
+            prog['camera_position'].write(np.asarray(frame.camera_position, dtype='f4').tobytes())
+        if 'u_ambient_color' in prog:
+            prog['u_ambient_color'].value = (0.0, 0.0, 0.0)
+
+        # lights
+        if 'light_count' in prog:
+            if frame.object_lights is not None:
+                used_lights, lp_arr, lc_arr, li_arr, lr_arr = self._collect_lights(frame.lights, frame.object_lights[eid])
+                ls_arr = self._collect_shadows(frame.light_shadows, frame.object_lights[eid])
+            else:
+                used_lights, lp_arr, lc_arr, li_arr, lr_arr = frame.packed
+                ls_arr = frame.packed_shadows
+            prog['light_count'].value = used_lights
+            if 'light_position' in prog:  prog['light_position'].write(lp_arr.tobytes())
+            if 'light_color' in prog:     prog['light_color'].write(lc_arr.tobytes())
+            if 'light_intensity' in prog: prog['light_intensity'].write(li_arr.tobytes())
+            if 'light_range' in prog:     prog['light_range'].write(lr_arr.tobytes())
+            if 'light_shadow' in prog:    prog['light_shadow'].write(ls_arr.tobytes())
+
+        # shadow maps; the sampler units are always assigned so the shadow
+        # samplers never alias a material texture's unit
+        if frame.shadows is not None:
+            frame.shadows.bind(prog)
+        else:
+            if 'u_cascade_count' in prog:      prog['u_cascade_count'].value = 0
+            if 'u_cascade_atlas' in prog:      prog['u_cascade_atlas'].value = ShadowSystem.CASCADE_UNIT
+            if 'u_point_shadow_atlas' in prog: prog['u_point_shadow_atlas'].value = ShadowSystem.POINT_UNIT
+
+        # clustered lights: bin once per frame, on first use
+        if 'u_cluster_grid' in prog:
+            if frame.clusters is None:
+                frame.clusters = self._build_light_clusters(frame.lights, frame.camera, frame.view, frame.proj)
+            dir_count, dir_arr, dcol_arr, dint_arr = frame.clusters
+            self.light_grid.bind(prog, self.LIGHT_DATA_UNIT, self.CLUSTER_GRID_UNIT,
+                                 self.LIGHT_INDEX_UNIT, self.ctx.viewport)
+            if 'dir_light_count' in prog:
+                prog['dir_light_count'].value = dir_count
+                if 'dir_light_direction' in prog: prog['dir_light_direction'].write(dir_arr.tobytes())
+                if 'dir_light_color' in prog:     prog['dir_light_color'].write(dcol_arr.tobytes())
+                if 'dir_light_intensity' in prog: prog['dir_light_intensity'].write(dint_arr.tobytes())
+
+    def _apply_material(self, prog, mat):
+        # material uniforms
+        for uname, val in mat.get_all_uniforms().items():
+            if uname in prog:
+                try:
+                    if isinstance(val, np.ndarray):
+                        prog[uname].value = tuple(val.tolist())
+                    elif isinstance(val, (tuple, list)):
+                        prog[uname].value = tuple(val)
+                    else:
+                        prog[uname].value = val
+                except (KeyError, struct.error, TypeError, AttributeError) as e:
+                    print(f"⚠️ Skipping uniform '{uname}': {e}")
+
+        # textures
+        for slot, (uname, tex) in enumerate(mat.get_all_textures().items()):
+            tex.use(location=slot)
+            if uname in prog:
+                prog[uname].value = slot
+
+    def _apply_skinning(self, prog, mf):
+        # Skeleton offset into the joint palette; static variants don't declare it
+        self.joint_palettes.bind(prog, mf.asset, self.JOINT_PALETTE_UNIT)
+
+    def _get_vao(self, mf, prog):
+        # build/reuse VAO; a new mesh revision or a replaced program rebuilds it
+        key = (mf.asset.name, prog.glo)
+        entry = self._vao_cache.get(key)
+        if entry is not None and entry[0] == mf.asset.revision and entry[1] is prog:
+            return entry[2]
+        if entry is not None:
+            # every program's arrays of an outdated revision go at once
+            stale = [k for k, e in self._vao_cache.items() if k[0] == key[0] and e[0] != mf.asset.revision]
+            for k in set(stale) | {key}:
+                self._release_vao(k)
+
+        v = mf.asset.vertices
+        n = mf.asset.normals
+        uv = mf.asset.uvs
+        j = getattr(mf.asset, 'joints', None)
+        w = getattr(mf.asset, 'weights', None)
+        t = getattr(mf.asset, 'tangents', None)
+
+        fmt = '3f'
+        attrs = ['in_position']
+        streams = [v]
+
+        # Only attach attributes the shader declares
+        members = getattr(prog, '_members', {})
+
+        if 'in_normal' in members and n is not None:
+            fmt += ' 3f'
+            attrs.append('in_normal')
+            streams.append(n)
+
+        if 'in_uv' in members and uv is not None:
+            if uv.ndim == 1:
+                uv = uv.reshape(-1, 2)
+            fmt += ' 2f'
+            attrs.append('in_uv')
+            streams.append(uv)
+
+        if 'in_tangent' in members:
+            if t is None:
+                t = np.zeros((v.shape[0], 3), dtype='f4')
+            fmt += ' 3f'
+            attrs.append('in_tangent')
+            streams.append(t)
+
+        if 'in_joints' in members:
+            if j is None:
+                j = np.zeros((v.shape[0], 4), dtype='f4')
+            fmt += ' 4f'
+            attrs.append('in_joints')
+            streams.append(j.astype('f4'))
+
+        if 'in_weights' in members:
+            if w is None:
+                w = np.zeros((v.shape[0], 4), dtype='f4')
+            fmt += ' 4f'
+            attrs.append('in_weights')
+            streams.append(w.astype('f4'))
+
+        # Concatenate all vertex data streams horizontally
+        if streams:
+            vertices_combined = np.hstack(streams).astype('f4')
+        else:
+            vertices_combined = v.astype('f4')  # Only position if no other streams
+
+        vbo = self.ctx.buffer(vertices_combined.tobytes())
+        ibo = self.ctx.buffer(mf.asset.indices.astype('i4').tobytes())
+        content = [(vbo, fmt, *attrs)]
+        vao = self.ctx.vertex_array(prog, content, ibo)
+        self._vao_cache[key] = (mf.asset.revision, prog, vao, vbo, ibo)
+        return vao
+
+    # --- passes -------------------------------------------------------------
+
+    def _draw_forward(self, eid, frame):
+        em = self.scene.entity_manager
+        tr = em.get_component(eid, Transform)
+        mf = em.get_component(eid, MeshFilter)
+        mat = em.get_component(eid, Material)
+        prog = self._shader_for(mat, mf).program
+
+        self._apply_transform(prog, compute_model_matrix(tr), frame)
+        self._apply_lighting(prog, eid, frame)
+        self._apply_material(prog, mat)
+        vao = self._get_vao(mf, prog)
+        self._apply_skinning(prog, mf)
+        vao.render()
+
+    def _draw_companion(self, eid, frame, fragment_source):
+        """Draws an entity with its material's vertex stage and a pass-specific fragment stage."""
+        em = self.scene.entity_manager
+        tr = em.get_component(eid, Transform)
+        mf = em.get_component(eid, MeshFilter)
+        mat = em.get_component(eid, Material)
+        prog = self._companion_program(self._shader_for(mat, mf), fragment_source)
+
+        self._apply_transform(prog, compute_model_matrix(tr), frame)
+        self._apply_material(prog, mat)
+        vao = self._get_vao(mf, prog)
+        self._apply_skinning(prog, mf)
+        vao.render()
+
+    # --- stages -------------------------------------------------------------------
+    # Each draws into whatever framebuffer is bound. on_render chains them
+    # directly; under a RenderGraphSystem they become graph passes.
+
+    def _split_opaque(self, entities):
+        em = self.scene.entity_manager
+        opaque = [e for e in entities if self._is_opaque(em.get_component(e, Material))]
+        opaque_set = set(opaque)
+        return opaque, [e for e in entities if e not in opaque_set]
+
+    def _split_deferred(self, entities):
+        # Engine-lit opaque materials go through the G-buffer; anything with its own
+        # lighting model, or that blends, is drawn forward on top afterwards
+        em = self.scene.entity_manager
+        deferred, rest = [], []
+        for eid in entities:
+            mat = em.get_component(eid, Material)
+            prog = mat.shader.program
+            lit = 'light_count' in prog or 'u_cluster_grid' in prog
+            (deferred if lit and self._is_opaque(mat) else rest).append(eid)
+        return deferred, rest
+
+    def _draw_all(self, entities, frame):
+        self.ctx.depth_mask = True
+        for eid in entities:
+            self._draw_forward(eid, frame)
+
+    def _draw_depth_prepass(self, opaque, frame):
+        # depth only: the cheapest possible fragments resolve visibility
+        self.ctx.depth_mask = True
+        self.ctx.color_mask = (False, False, False, False)
+        for eid in opaque:
+            self._draw_companion(eid, frame, self._prepass_frag)
+        self.ctx.color_mask = (True, True, True, True)
+
+    def _draw_visible(self, opaque, frame):
+        # shade only the visible fragment of each pixel
+        self.ctx.depth_func = '=='
+        self.ctx.depth_mask = False
+        for eid in opaque:
+            self._draw_forward(eid, frame)
+        self.ctx.depth_func = '<'
+        self.ctx.depth_mask = True
+
+    def _draw_gbuffer(self, deferred, frame, size):
+        # material attributes per pixel, no lighting; the G-buffer is its own target
+        target = self.ctx.fbo
+        self.gbuffer.ensure(size)
+        self.gbuffer.fbo.use()
+        self.gbuffer.fbo.clear(0.0, 0.0, 0.0, 0.0, depth=1.0)
+        self.ctx.disable(moderngl.BLEND)
+        self.ctx.depth_mask = True
+        for eid in deferred:
+            self._draw_companion(eid, frame, self._gbuffer_frag)
+        self.ctx.enable(moderngl.BLEND)
+        target.use()
+
+    def _draw_deferred_lighting(self, frame):
+        # once per covered pixel, depth written back for what follows
+        prog = self._deferred_light.program
+        self.gbuffer.bind(prog, self.GBUFFER_UNIT)
+        if 'view' in prog:
+            prog['view'].write(frame.view.T.astype('f4').tobytes())
+        self._apply_lighting(prog, None, frame)
+        self.ctx.disable(moderngl.BLEND)
+        self._fullscreen[1].render(moderngl.TRIANGLES, vertices=3)
+        self.ctx.enable(moderngl.BLEND)
+
+    def _render_forward(self, entities, frame, prepass):
+        if not prepass:
+            with profile_pass(self.scene, "forward"):
+                self._draw_all(entities, frame)
+            return
+
+        opaque, rest = self._split_opaque(entities)
+        with profile_pass(self.scene, "depth_prepass"):
+            self._draw_depth_prepass(opaque, frame)
+        with profile_pass(self.scene, "opaque"):
+            self._draw_visible(opaque, frame)
+        # blended / transparent geometry as usual
+        with profile_pass(self.scene, "transparent"):
+            self._draw_all(rest, frame)
+
+    def _render_deferred(self, entities, frame):
+        deferred, rest = self._split_deferred(entities)
+        viewport = self.ctx.viewport
+        with profile_pass(self.scene, "gbuffer"):
+            self._draw_gbuffer(deferred, frame, viewport[2:])
+        self.ctx.viewport = viewport
+        with profile_pass(self.scene, "deferred_lighting"):
+            self._draw_deferred_lighting(frame)
+        with profile_pass(self.scene, "forward"):
+            self._draw_all(rest, frame)
+
+    # --- frame ----------------------------------------------------------------------
+
+    def _pack_joint_palettes(self, entities):
+        """Uploads the joints of every skeleton about to be drawn, once each."""
+        self.joint_palettes.new_frame()
+        em = self.scene.entity_manager
+        for eid in entities:
+            asset = em.get_component(eid, MeshFilter).asset
+            if getattr(asset, 'skin_asset', None) is not None:
+                self.joint_palettes.add(asset)
+        self.joint_palettes.pack()
+
+    def _prepare_frame(self):
+        """Per-frame state, the visible entities and the render path to use."""
         cam_e = self.scene.active_camera
         tr_cam = self.scene.entity_manager.get_component(cam_e, Transform)
         cp_cam = self.scene.entity_manager.get_component(cam_e, CameraComponent)
 
-        proj = cp_cam.projection_matrix
-        view = cp_cam.view_matrix
-        camera_position = (tr_cam.x, tr_cam.y, tr_cam.z)
-
         # Collect lights once
-        used_lights, lp_arr, lc_arr, li_arr, lr_arr = self._collect_lights()
+        lights = self._gather_lights()
+        shadows = self.scene.get_system(ShadowSystem)
+        light_shadows = self._light_shadows(shadows)
+        frame = _Frame(
+            camera=cp_cam,
+            view=cp_cam.view_matrix,
+            proj=cp_cam.projection_matrix,
+            camera_position=(tr_cam.x, tr_cam.y, tr_cam.z),
+            lights=lights,
+            packed=self._collect_lights(lights),
+            light_shadows=light_shadows,
+            packed_shadows=self._collect_shadows(light_shadows),
+            shadows=shadows,
+        )
+
+        entities = self.scene.entity_manager.get_entities_with(Transform, MeshFilter, Material, MeshRenderer)
+
+        # Frustum-cull through the shared spatial index when the scene has one
+        spatial = self.scene.get_system(SpatialIndexSystem)
+        if spatial is not None and cp_cam.vp_matrix is not None:
+            entities = spatial.filter_visible(entities, cp_cam.vp_matrix)
+        entities = list(entities)
+        self._pack_joint_palettes(entities)
+        self._evict_stale_programs()
+
+        path = self.render_path
+        shadows_active = shadows is not None and (shadows.directional is not None or bool(shadows.points))
+        if path is RenderPath.AUTO:
+            vp = cp_cam.vp_matrix if cp_cam.vp_matrix is not None else frame.proj @ frame.view
+            path = self.choose_render_path(len(lights[0]), self._estimate_overdraw(entities, vp), shadows_active)
+        elif path is RenderPath.DEFERRED and shadows_active:
+            # deferred lighting doesn't sample shadow maps; don't drop the shadows
+            path = RenderPath.FORWARD_PREPASS
+        self.active_path = path
+
+        if self.lights_per_object and len(lights[0]) and path is not RenderPath.DEFERRED:
+            frame.object_lights = self._select_object_lights(entities, lights)
+        return frame, entities, path
 
-        for eid in self.scene.entity_manager.get_entities_with(Transform, MeshFilter, Material, MeshRenderer):
-            tr = self.scene.entity_manager.get_component(eid, Transform)
-            mf = self.scene.entity_manager.get_component(eid, MeshFilter)
-            mat = self.scene.entity_manager.get_component(eid, Material)
-
-            model = compute_model_matrix(tr)
-            prog = mat.shader.program
-
-            # matrices
-            if 'model' in prog:      prog['model'].write(model.T.astype('f4').tobytes())
-            if 'view' in prog:       prog['view'].write(view.T.astype('f4').tobytes())
-            if 'projection' in prog: prog['projection'].write(proj.T.astype('f4').tobytes())
-
-            # camera + ambient
-            if 'camera_position' in prog:
-                prog['camera_position'].write(np.asarray(camera_position, dtype='f4').tobytes())
-            if 'u_ambient_color' in prog:
-                prog['u_ambient_color'].value = (0.0, 0.0, 0.0)
-
-            # lights
-            if 'light_count' in prog:
-                prog['light_count'].value = used_lights
-                if 'light_position' in prog:  prog['light_position'].write(lp_arr.tobytes())
-                if 'light_color' in prog:     prog['light_color'].write(lc_arr.tobytes())
-                if 'light_intensity' in prog: prog['light_intensity'].write(li_arr.tobytes())
-                if 'light_range' in prog:     prog['light_range'].write(lr_arr.tobytes())
-
-            # material uniforms
-            for uname, val in mat.get_all_uniforms().items():
-                if uname in prog:
-                    try:
-                        if isinstance(val, np.ndarray):
-                            prog[uname].value = tuple(val.tolist())
-                        elif isinstance(val, (tuple, list)):
-                            prog[uname].value = tuple(val)
-                        else:
-                            prog[uname].value = val
-                    except (KeyError, struct.error, TypeError, AttributeError) as e:
-                        print(f"⚠️ Skipping uniform '{uname}': {e}")
-
-            # textures
-            for slot, (uname, tex) in enumerate(mat.get_all_textures().items()):
-                tex.use(location=slot)
-                if uname in prog:
-                    prog[uname].value = slot
-
-            # build/reuse VAO
-            key = (mf.asset.name, prog.glo)
-            if key not in self._vao_cache:
-                v = mf.asset.vertices
-                n = mf.asset.normals
-                uv = mf.asset.uvs
-                j = getattr(mf.asset, 'joints', None)
-                w = getattr(mf.asset, 'weights', None)
-                t = getattr(mf.asset, 'tangents', None)
-
-                fmt = '3f'
-                attrs = ['in_position']
-                streams = [v]
-
-                # Only attach attributes the shader declares
-                members = getattr(prog, '_members', {})
-
-                if 'in_normal' in members and n is not None:
-                    fmt += ' 3f'
-                    attrs.append('in_normal')
-                    streams.append(n)
-
-                if 'in_uv' in members and uv is not None:
-                    if uv.ndim == 1:
-                        uv = uv.reshape(-1, 2)
-                    fmt += ' 2f'
-                    attrs.append('in_uv')
-                    streams.append(uv)
-
-                if 'in_tangent' in members:
-                    if t is None:
-                        t = np.zeros((v.shape[0], 3), dtype='f4')
-                    fmt += ' 3f'
-                    attrs.append('in_tangent')
-                    streams.append(t)
-
-                if 'in_joints' in members:
-                    if j is None:
-                        j = np.zeros((v.shape[0], 4), dtype='f4')
-                    fmt += ' 4f'
-                    attrs.append('in_joints')
-                    streams.append(j.astype('f4'))
-
-                if 'in_weights' in members:
-                    if w is None:
-                        w = np.zeros((v.shape[0], 4), dtype='f4')
-                    fmt += ' 4f'
-                    attrs.append('in_weights')
-                    streams.append(w.astype('f4'))
-
-                # Concatenate all vertex data streams horizontally
-                if streams:
-                    vertices_combined = np.hstack(streams).astype('f4')
-                else:
-                    vertices_combined = v.astype('f4')  # Only position if no other streams
-
-                vbo = self.ctx.buffer(vertices_combined.tobytes())
-                ibo = self.ctx.buffer(mf.asset.indices.astype('i4').tobytes())
-                content = [(vbo, fmt, *attrs)]
-                vao = self.ctx.vertex_array(prog, content, ibo)
-                self._vao_cache[key] = vao
-            else:
-                vao = self._vao_cache[key]
-
-            # Skinning uniform (mat4[64])
-            if 'joint_matrices' in prog:
-                MAX_JOINTS = 64
-                if hasattr(mf.asset, 'skin_asset') and mf.asset.skin_asset is not None:
-                    joint_matrices = compute_joint_matrices(
-                        mf.asset.gltf_data,
-                        mf.asset.skin_asset,
-                        pose_overrides={}
-                    )
-                    jm = np.tile(np.eye(4, dtype='f4'), (MAX_JOINTS, 1)).reshape((MAX_JOINTS, 4, 4))
-                    jm[:len(joint_matrices)] = joint_matrices
-                    prog['joint_matrices'].write(jm.astype('f4').tobytes())
-                else:
-                    identity_joints = np.tile(np.eye(4, dtype='f4'), (MAX_JOINTS, 1)).reshape((MAX_JOINTS, 4, 4))
-                    prog['joint_matrices'].write(identity_joints.astype('f4').tobytes())
-
-            # Render
-            self.ctx.depth_mask = True
-            vao.render()
+    def on_render(self, renderer):
+        if self.scene.get_system(RenderGraphSystem) is not None:
+            return      # drawn through add_render_passes()
+        frame, entities, path = self._prepare_frame()
+        if path is RenderPath.DEFERRED:
+            self._render_deferred(entities, frame)
+        else:
+            self._render_forward(entities, frame, prepass=path is RenderPath.FORWARD_PREPASS)
+
+    def add_render_passes(self, graph):
+        """Declares this frame's scene passes on a RenderGraph (see RenderGraphSystem)."""
+        frame, entities, path = self._prepare_frame()
+        reads = ("shadow_maps",) if frame.shadows is not None else ()
+
+        if path is RenderPath.DEFERRED:
+            deferred, rest = self._split_deferred(entities)
+            size = tuple(self.ctx.viewport[2:])
+            graph.add_pass("gbuffer", lambda g: self._draw_gbuffer(deferred, frame, size),
+                           order=render_graph.PREPASS, writes=("gbuffer",))
+            graph.add_pass("deferred_lighting", lambda g: self._draw_deferred_lighting(frame),
+                           order=render_graph.OPAQUE, color=("color",), depth="depth",
+                           reads=("gbuffer", *reads))
+            graph.add_pass("transparent", lambda g: self._draw_all(rest, frame),
+                           order=render_graph.TRANSPARENT, color=("color",), depth="depth", reads=reads)
+            return
+
+        if path is RenderPath.FORWARD_PREPASS:
+            opaque, rest = self._split_opaque(entities)
+            graph.add_pass("depth_prepass", lambda g: self._draw_depth_prepass(opaque, frame),
+                           order=render_graph.PREPASS, depth="depth")
+            graph.add_pass("opaque", lambda g: self._draw_visible(opaque, frame),
+                           order=render_graph.OPAQUE, color=("color",), depth="depth", reads=reads)
+        else:
+            opaque, rest = self._split_opaque(entities)
+            graph.add_pass("opaque", lambda g: self._draw_all(opaque, frame),
+                           order=render_graph.OPAQUE, color=("color",), depth="depth", reads=reads)
+        graph.add_pass("transparent", lambda g: self._draw_all(rest, frame),
+                       order=render_graph.TRANSPARENT, color=("color",), depth="depth", reads=reads)
+
+
+@dataclass
+class _Frame:
+    """Per-frame state shared by every draw of RenderSystem.on_render."""
+    camera: CameraComponent
+    view: np.ndarray
+    proj: np.ndarray
+    camera_position: tuple
+    lights: tuple
+    packed: tuple
+    light_shadows: np.ndarray
+    packed_shadows: np.ndarray
+    shadows: object = None
+    object_lights: dict = None
+    clusters: tuple = None
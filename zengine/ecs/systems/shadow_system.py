@@ -0,0 +1,498 @@
+# zengine/ecs/systems/shadow_system.py
+
+from dataclasses import dataclass, field
+
+import moderngl
+import numpy as np
+
+from zengine.ecs.systems.system import System
+from zengine.ecs.systems.spatial_index_system import SpatialIndexSystem
+from zengine.ecs.systems.profiler_system import profile_pass
+from zengine.ecs.systems.render_graph_system import RenderGraphSystem
+from zengine.ecs.components import Transform, MeshFilter, Material
+from zengine.ecs.components.camera import CameraComponent, ProjectionType
+from zengine.ecs.components.light import LightComponent, LightType
+from zengine.graphics import render_graph
+from zengine.graphics.joint_palette import JointPaletteTexture
+from zengine.graphics.shader_library import ShaderLibrary
+from zengine.util.quaternion import quats_to_forward
+from zengine.util.transforms import transform_key, compute_model_matrices
+
+# Cube face directions and up vectors, in the order the shaders index them
+CUBE_FACES = (
+    ((1.0, 0.0, 0.0), (0.0, -1.0, 0.0)),
+    ((-1.0, 0.0, 0.0), (0.0, -1.0, 0.0)),
+    ((0.0, 1.0, 0.0), (0.0, 0.0, 1.0)),
+    ((0.0, -1.0, 0.0), (0.0, 0.0, -1.0)),
+    ((0.0, 0.0, 1.0), (0.0, -1.0, 0.0)),
+    ((0.0, 0.0, -1.0), (0.0, -1.0, 0.0)),
+)
+
+
+def look_at(eye, target, up) -> np.ndarray:
+    eye = np.asarray(eye, dtype='f8')
+    f = np.asarray(target, dtype='f8') - eye
+    f /= np.linalg.norm(f)
+    s = np.cross(f, up)
+    s /= np.linalg.norm(s)
+    u = np.cross(s, f)
+
+    m = np.eye(4)
+    m[0, :3], m[1, :3], m[2, :3] = s, u, -f
+    m[:3, 3] = -m[:3, :3] @ eye
+    return m
+
+
+def orthographic(left, right, bottom, top, near, far) -> np.ndarray:
+    return np.array([
+        [2/(right-left), 0, 0, -(right+left)/(right-left)],
+        [0, 2/(top-bottom), 0, -(top+bottom)/(top-bottom)],
+        [0, 0, 2/(near-far), -(far+near)/(far-near)],
+        [0, 0, 0, 1],
+    ])
+
+
+def perspective(fov_deg, aspect, near, far) -> np.ndarray:
+    f = 1.0 / np.tan(np.radians(fov_deg) * 0.5)
+    nf = 1 / (near - far)
+    return np.array([
+        [f / aspect, 0, 0, 0],
+        [0, f, 0, 0],
+        [0, 0, (far + near) * nf, (2 * far * near) * nf],
+        [0, 0, -1, 0],
+    ])
+
+
+@dataclass
+class ShadowMap:
+    """A shadow-casting light's depth texture(s) plus what is needed to reuse it."""
+    light: int
+    resolution: int
+    matrices: list = field(default_factory=list)      # light view-projection per cascade / face
+    signatures: list = field(default_factory=list)    # per cascade / face, None = never rendered
+    last_frame: list = field(default_factory=list)
+    splits: list = field(default_factory=list)        # directional: view depth each cascade ends at
+    rect: tuple = (0.0, 0.0, 1.0, 1.0)                # point: uv rect of face 0 in the atlas
+    bias: float = 0.005
+    position: tuple = (0.0, 0.0, 0.0)                 # point: the light this frame
+    range: float = 1.0
+    face_lights: list = field(default_factory=list)   # point: (x, y, z, range) each face was rendered from
+
+
+class ShadowSystem(System):
+    """
+    Renders depth-only shadow maps for lights with casts_shadows set.
+
+    - The first shadow-casting directional light gets cascaded shadow maps,
+      one tile per cascade in a single depth texture, fit around slices of the
+      active camera's frustum.
+    - Up to MAX_POINT_SHADOWS point lights get six 90° faces each, packed in a
+      shared depth atlas storing distance / range.
+
+    Casters are culled per cascade / per light through the SpatialIndexSystem
+    when the scene has one. Each cascade or face keeps a signature of its light
+    matrix and its casters' transforms; when nothing changed the previous
+    depth is reused, and changed maps are re-rendered at most every
+    LightComponent.shadow_update_interval frames.
+
+    Skinned casters are posed from their own joint palette, packed once per
+    frame; their joint matrices are part of the signature, so an animating
+    character re-renders the maps it falls in.
+
+    Add it before the RenderSystem so maps are ready when lighting samples them.
+    """
+    CASCADE_UNIT = 11
+    POINT_UNIT = 12
+    JOINT_PALETTE_UNIT = 0      # the depth program samples nothing else
+    MAX_CASCADES = 4
+    MAX_POINT_SHADOWS = 4
+
+    def __init__(self, ctx, scene, split_lambda: float = 0.75, caster_distance: float = 50.0):
+        super().__init__()
+        self.ctx = ctx
+        self.scene = scene
+        self.split_lambda = split_lambda
+        self.caster_distance = caster_distance   # how far behind a cascade casters are gathered
+
+        self.depth_shader = ShaderLibrary.for_context(ctx).load("shadow_depth_vert.glsl", "shadow_depth_frag.glsl")
+        self._vao_cache = {}    # id(mesh) -> (mesh, revision, program, vao, vbo, ibo)
+        self.joint_palettes = JointPaletteTexture(ctx)
+
+        self.directional = None
+        self._cascade_tex = None
+        self._cascade_fbo = None
+
+        self.points = []
+        self._point_layout = None
+        self._point_tex = None
+        self._point_fbo = None
+
+        self._frame = 0
+        self.stats = {"rendered": 0, "reused": 0}
+
+    # --- textures ----------------------------------------------------------
+
+    def _depth_target(self, size):
+        tex = self.ctx.depth_texture(size)
+        tex.filter = (moderngl.LINEAR, moderngl.LINEAR)
+        tex.compare_func = '<='
+        tex.repeat_x = False
+        tex.repeat_y = False
+        fbo = self.ctx.framebuffer(depth_attachment=tex)
+        fbo.clear(depth=1.0)
+        return tex, fbo
+
+    def _vao(self, asset):
+        key = id(asset)
+        prog = self.depth_shader.program
+        entry = self._vao_cache.get(key)
+        if entry is None or entry[0] is not asset or entry[1] != asset.revision or entry[2] is not prog:
+            # new mesh revision, or the depth shader was hot-reloaded
+            if entry is not None:
+                for obj in entry[3:]:
+                    obj.release()
+            fmt, attrs = '3f', ['in_position']
+            streams = [np.asarray(asset.vertices, dtype='f4')]
+            if getattr(asset, 'skin_asset', None) is not None:
+                fmt += ' 4f 4f'
+                attrs += ['in_joints', 'in_weights']
+                streams += [np.asarray(asset.joints, dtype='f4'), np.asarray(asset.weights, dtype='f4')]
+            vbo = self.ctx.buffer(np.hstack(streams).astype('f4').tobytes())
+            ibo = self.ctx.buffer(np.asarray(asset.indices, dtype='i4').tobytes())
+            vao = self.ctx.vertex_array(prog, [(vbo, fmt, *attrs)], ibo)
+            entry = (asset, asset.revision, prog, vao, vbo, ibo)
+            self._vao_cache[key] = entry
+        return entry[3]
+
+    # --- casters -----------------------------------------------------------
+
+    def _casters(self, candidates=None):
+        """(eid, Transform, MeshAsset) for shadow casters, optionally limited to candidates."""
+        em = self.em
+        ents = em.get_entities_with(Transform, MeshFilter, Material)
+        if candidates is not None:
+            ents = ents.intersection(candidates)
+        out = []
+        for eid in sorted(ents):
+            if not em.get_component(eid, Material).cast_shadows:
+                continue
+            out.append((eid, em.get_component(eid, Transform), em.get_component(eid, MeshFilter).asset))
+        return out
+
+    def _pack_joint_palettes(self):
+        """Uploads the joints of every skinned shadow caster, once per skeleton."""
+        self.joint_palettes.new_frame()
+        for _, _, asset in self._casters():
+            if getattr(asset, 'skin_asset', None) is not None:
+                self.joint_palettes.add(asset)
+        self.joint_palettes.pack()
+
+    def _pose_key(self, asset):
+        joints = self.joint_palettes.matrices(asset) if getattr(asset, 'skin_asset', None) is not None else None
+        return joints.tobytes() if joints is not None else None
+
+    def _signature(self, matrix, casters):
+        return (matrix.tobytes(), tuple((eid, transform_key(tr), id(asset), asset.revision, self._pose_key(asset))
+                                        for eid, tr, asset in casters))
+
+    def _draw(self, fbo, viewport, light_vp, casters, light=None):
+        prog = self.depth_shader.program
+        prog['light_vp'].write(light_vp.T.astype('f4').tobytes())
+        if 'u_linear_depth' in prog:
+            prog['u_linear_depth'].value = light is not None
+        if light is not None and 'u_light' in prog:
+            prog['u_light'].value = light
+
+        fbo.use()
+        fbo.clear(depth=1.0, viewport=viewport)
+        fbo.viewport = viewport
+        if not casters:
+            return
+        models = compute_model_matrices([tr for _, tr, _ in casters])
+        for (eid, tr, asset), model in zip(casters, models):
+            prog['model'].write(model.T.tobytes())
+            self.joint_palettes.bind(prog, asset, self.JOINT_PALETTE_UNIT)
+            self._vao(asset).render()
+
+    def _needs_render(self, shadow, index, signature, interval):
+        if shadow.signatures[index] == signature:
+            return False
+        if shadow.signatures[index] is not None and self._frame - shadow.last_frame[index] < interval:
+            return False
+        return True
+
+    # --- directional cascades ---------------------------------------------
+
+    def _cascade_splits(self, near, far, count):
+        i = np.arange(1, count + 1) / count
+        log = near * (far / near) ** i
+        uniform = near + (far - near) * i
+        return self.split_lambda * log + (1.0 - self.split_lambda) * uniform
+
+    @staticmethod
+    def _slice_corners(cam, view, d0, d1):
+        """World-space corners of the camera frustum between view depths d0 and d1."""
+        corners = []
+        for d in (d0, d1):
+            if cam.projection is ProjectionType.PERSPECTIVE:
+                h = np.tan(np.radians(cam.fov_deg) * 0.5) * d
+                w = h * cam.aspect
+                rect = (-w, w, -h, h)
+            else:
+                rect = (cam.left, cam.right, cam.bottom, cam.top)
+            for x in rect[:2]:
+                for y in rect[2:]:
+                    corners.append((x, y, -d, 1.0))
+        inv_view = np.linalg.inv(np.asarray(view, dtype='f8'))
+        return (np.array(corners) @ inv_view.T)[:, :3]
+
+    def _layout_directional(self, eid, lc):
+        """(Re)allocates the cascade atlas when the light or its settings change."""
+        count = int(np.clip(lc.shadow_cascades, 1, self.MAX_CASCADES))
+        res = int(lc.shadow_resolution)
+
+        shadow = self.directional
+        if shadow is None or shadow.light != eid or shadow.resolution != res or len(shadow.signatures) != count:
+            if self._cascade_tex is not None:
+                self._cascade_tex.release()
+                self._cascade_fbo.release()
+            self._cascade_tex, self._cascade_fbo = self._depth_target((res * count, res))
+            shadow = ShadowMap(light=eid, resolution=res, signatures=[None] * count,
+                               last_frame=[0] * count, matrices=[np.eye(4)] * count)
+            self.directional = shadow
+
+    def _update_directional(self, eid, lc, tr, cam, spatial):
+        shadow = self.directional
+        count = len(shadow.signatures)
+        res = shadow.resolution
+        shadow.bias = lc.shadow_bias
+
+        direction = quats_to_forward([tr.rotation_x, tr.rotation_y, tr.rotation_z, tr.rotation_w])[0].astype('f8')
+        up = (0.0, 0.0, 1.0) if abs(direction[1]) > 0.99 else (0.0, 1.0, 0.0)
+
+        ortho = cam.projection is ProjectionType.ORTHOGRAPHIC
+        near = cam.near if ortho else cam.p_near
+        far = min(cam.far if ortho else cam.p_far, lc.shadow_distance)
+        splits = self._cascade_splits(near, far, count)
+        shadow.splits = splits.tolist()
+
+        d0 = near
+        for c in range(count):
+            corners = self._slice_corners(cam, cam.view_matrix, d0, splits[c])
+            d0 = splits[c]
+
+            # Bounding sphere keeps the cascade size constant under camera rotation
+            center = corners.mean(axis=0)
+            radius = float(np.ceil(np.linalg.norm(corners - center, axis=1).max() * 16.0) / 16.0)
+
+            back = radius + self.caster_distance
+            light_view = look_at(center - direction * back, center, up)
+            # Snap to whole texels so the map doesn't shimmer (and stays cacheable) as the camera moves
+            texel = 2.0 * radius / res
+            snapped = light_view @ np.append(center, 1.0)
+            offset = np.floor(snapped[:2] / texel) * texel - snapped[:2]
+            light_view[:2, 3] += offset
+            light_proj = orthographic(-radius, radius, -radius, radius, 0.0, back + radius)
+            vp = light_proj @ light_view
+
+            candidates = None
+            if spatial is not None:
+                lo = np.minimum(center - radius, center - direction * back - radius)
+                hi = np.maximum(center + radius, center - direction * back + radius)
+                candidates = spatial.query_aabb(tuple(lo), tuple(hi))
+            casters = self._casters(candidates)
+
+            signature = self._signature(vp, casters)
+            if not self._needs_render(shadow, c, signature, lc.shadow_update_interval):
+                self.stats["reused"] += 1
+                continue
+            self._draw(self._cascade_fbo, (c * res, 0, res, res), vp, casters)
+            # a reused map keeps the matrix it was rendered with
+            shadow.matrices[c] = vp
+            shadow.signatures[c] = signature
+            shadow.last_frame[c] = self._frame
+            self.stats["rendered"] += 1
+
+    # --- point lights -------------------------------------------------------
+
+    def _layout_points(self, lights):
+        """(Re)builds the point shadow atlas: one row of six faces per light."""
+        layout = tuple((eid, int(lc.shadow_resolution)) for eid, lc, _ in lights)
+        if layout == self._point_layout:
+            return
+        self._point_layout = layout
+        if self._point_tex is not None:
+            self._point_tex.release()
+            self._point_fbo.release()
+            self._point_tex = None
+        self.points = []
+        if not layout:
+            return
+
+        width = 6 * max(res for _, res in layout)
+        height = sum(res for _, res in layout)
+        self._point_tex, self._point_fbo = self._depth_target((width, height))
+
+        y = 0
+        for eid, res in layout:
+            self.points.append(ShadowMap(
+                light=eid, resolution=res,
+                signatures=[None] * 6, last_frame=[0] * 6, matrices=[np.eye(4)] * 6,
+                face_lights=[(0.0, 0.0, 0.0, 1.0)] * 6,
+                rect=(0.0, y / height, res / width, res / height),
+            ))
+            y += res
+
+    def _update_point(self, shadow, lc, tr, spatial):
+        pos = np.array([tr.x, tr.y, tr.z], dtype='f8')
+        rng = max(float(lc.range), 1e-3)
+        shadow.position = tuple(pos.tolist())
+        shadow.range = rng
+        shadow.bias = lc.shadow_bias
+
+        candidates = spatial.query_sphere(pos, rng) if spatial is not None else None
+        casters = self._casters(candidates)
+        proj = perspective(90.0, 1.0, 0.05, rng)
+
+        res = shadow.resolution
+        y = int(round(shadow.rect[1] * self._point_tex.height))
+        for f, (direction, up) in enumerate(CUBE_FACES):
+            vp = proj @ look_at(pos, pos + direction, up)
+            signature = self._signature(vp, casters)
+            if not self._needs_render(shadow, f, signature, lc.shadow_update_interval):
+                self.stats["reused"] += 1
+                continue
+            self._draw(self._point_fbo, (f * res, y, res, res), vp, casters,
+                       light=(pos[0], pos[1], pos[2], rng))
+            # a reused face keeps the light it was rendered from, as it keeps its matrix
+            shadow.matrices[f] = vp
+            shadow.face_lights[f] = (pos[0], pos[1], pos[2], rng)
+            shadow.signatures[f] = signature
+            shadow.last_frame[f] = self._frame
+            self.stats["rendered"] += 1
+
+    # --- frame --------------------------------------------------------------
+
+    def _select_lights(self):
+        """Shadow-casting lights this frame: (directional or None, [point...]) as (eid, lc, tr)."""
+        em = self.em
+        directional = None
+        points = []
+        for eid in sorted(em.get_entities_with(Transform, LightComponent)):
+            lc = em.get_component(eid, LightComponent)
+            if not lc.casts_shadows:
+                continue
+            tr = em.get_component(eid, Transform)
+            if lc.type == LightType.DIRECTIONAL:
+                if directional is None:
+                    directional = (eid, lc, tr)
+            elif len(points) < self.MAX_POINT_SHADOWS:
+                points.append((eid, lc, tr))
+        return directional, points
+
+    def _layout(self, directional, points):
+        """Assigns maps to lights; after this shadow_index() answers for the frame."""
+        if directional is not None:
+            self._layout_directional(directional[0], directional[1])
+        else:
+            self.directional = None
+        self._layout_points(points)
+
+    def _render_maps(self, directional, points, cam):
+        previous_fbo = self.ctx.fbo
+        self.ctx.enable(moderngl.DEPTH_TEST)
+        spatial = self.scene.get_system(SpatialIndexSystem)
+        self._pack_joint_palettes()
+        if directional is not None:
+            self._update_directional(*directional, cam, spatial)
+        for shadow, (eid, lc, tr) in zip(self.points, points):
+            self._update_point(shadow, lc, tr, spatial)
+        previous_fbo.use()
+
+    def _camera(self):
+        cam_e = self.scene.active_camera
+        cam = self.em.get_component(cam_e, CameraComponent) if cam_e is not None else None
+        if cam is None or cam.view_matrix is None:
+            return None
+        return cam
+
+    def on_render(self, renderer):
+        if self.scene.get_system(RenderGraphSystem) is not None:
+            return      # drawn through add_render_passes()
+        cam = self._camera()
+        if cam is None:
+            return
+        self._frame += 1
+
+        directional, points = self._select_lights()
+        self._layout(directional, points)
+        with profile_pass(self.scene, "shadows"):
+            self._render_maps(directional, points, cam)
+
+    def add_render_passes(self, graph):
+        """
+        Lays out this frame's maps right away (so lighting passes declared after
+        this can look lights up) and renders them in a "shadows" pass, which the
+        graph culls if no pass reads "shadow_maps".
+        """
+        cam = self._camera()
+        if cam is None:
+            return
+        self._frame += 1
+
+        directional, points = self._select_lights()
+        self._layout(directional, points)
+        graph.import_resource("shadow_maps")
+        graph.add_pass("shadows", lambda g: self._render_maps(directional, points, cam),
+                       order=render_graph.SHADOW, writes=("shadow_maps",))
+
+    # --- lookup / binding for the lighting pass ---------------------------
+
+    def shadow_index(self, eid) -> int:
+        """Shader shadow slot for a light: -1 none, 0 directional cascades, n > 0 point map n - 1."""
+        if self.directional is not None and self.directional.light == eid:
+            return 0
+        for i, shadow in enumerate(self.points):
+            if shadow.light == eid:
+                return i + 1
+        return -1
+
+    def bind(self, prog):
+        """Binds the shadow textures and uniforms on a program that samples them."""
+        shadow = self.directional
+        if shadow is not None and self._cascade_tex is not None:
+            self._cascade_tex.use(location=self.CASCADE_UNIT)
+            count = len(shadow.matrices)
+            vps = np.zeros((self.MAX_CASCADES, 4, 4), dtype='f4')
+            splits = np.zeros(self.MAX_CASCADES, dtype='f4')
+            vps[:count] = np.array([m.T for m in shadow.matrices])
+            splits[:count] = shadow.splits
+            if 'u_cascade_count' in prog: prog['u_cascade_count'].value = count
+            if 'u_cascade_vp' in prog:    prog['u_cascade_vp'].write(vps.tobytes())
+            if 'u_cascade_split' in prog: prog['u_cascade_split'].write(splits.tobytes())
+            if 'u_cascade_bias' in prog:  prog['u_cascade_bias'].value = shadow.bias
+        elif 'u_cascade_count' in prog:
+            prog['u_cascade_count'].value = 0
+
+        if self.points and self._point_tex is not None:
+            self._point_tex.use(location=self.POINT_UNIT)
+            n = self.MAX_POINT_SHADOWS
+            vps = np.zeros((n * 6, 4, 4), dtype='f4')
+            rects = np.zeros((n, 4), dtype='f4')
+            lights = np.zeros((n, 4), dtype='f4')
+            faces = np.zeros((n * 6, 4), dtype='f4')
+            biases = np.zeros(n, dtype='f4')
+            for i, shadow in enumerate(self.points):
+                vps[i * 6:(i + 1) * 6] = np.array([m.T for m in shadow.matrices])
+                faces[i * 6:(i + 1) * 6] = shadow.face_lights
+                rects[i] = shadow.rect
+                lights[i] = (*shadow.position, shadow.range)
+                biases[i] = shadow.bias
+            if 'u_point_shadow_vp' in prog:    prog['u_point_shadow_vp'].write(vps.tobytes())
+            if 'u_point_shadow_rect' in prog:  prog['u_point_shadow_rect'].write(rects.tobytes())
+            if 'u_point_shadow_light' in prog: prog['u_point_shadow_light'].write(lights.tobytes())
+            if 'u_point_shadow_face' in prog:  prog['u_point_shadow_face'].write(faces.tobytes())
+            if 'u_point_shadow_bias' in prog:  prog['u_point_shadow_bias'].write(biases.tobytes())
+
+        if 'u_cascade_atlas' in prog:      prog['u_cascade_atlas'].value = self.CASCADE_UNIT
+        if 'u_point_shadow_atlas' in prog: prog['u_point_shadow_atlas'].value = self.POINT_UNIT
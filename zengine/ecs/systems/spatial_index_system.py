@@ -0,0 +1,106 @@
+# zengine/ecs/systems/spatial_index_system.py
+
+import math
+
+import numpy as np
+
+from zengine.ecs.systems.system import System
+from zengine.ecs.components import Transform, MeshFilter
+from zengine.util.aabb_tree import DynamicAABBTree
+from zengine.util.intersection import frustum_planes, transform_aabbs
+from zengine.util.transforms import transform_key, compute_model_matrices
+
+
+class SpatialIndexSystem(System):
+    """
+    Maintains a DynamicAABBTree over every entity with a Transform and a
+    MeshFilter, keyed by entity id. The tree is synced once per update: new
+    entities are inserted, missing ones removed, and only entities whose
+    Transform (or mesh) changed get their world AABB recomputed and refit.
+
+    Add it after the systems that move entities so queries see this frame's
+    transforms. Render culling, debug drawing, picking and gameplay all share
+    the same index through scene.get_system(SpatialIndexSystem).
+
+    Bounds come from the mesh's bind-pose vertices; skinned meshes that deform
+    far outside them can be culled early.
+    """
+    def __init__(self, margin: float = 0.1):
+        super().__init__()
+        self.tree = DynamicAABBTree(margin=margin)
+        self._proxies = {}       # eid -> tree proxy id
+        self._keys = {}          # eid -> (transform key, id(mesh asset), mesh revision)
+        self._bounds = {}        # eid -> (lo, hi) tight world AABB
+
+    def on_update(self, dt):
+        self.sync()
+
+    def sync(self):
+        """Brings the tree in line with the current entities and transforms."""
+        em = self.em
+        current = em.get_entities_with(Transform, MeshFilter)
+
+        for eid in [e for e in self._proxies if e not in current]:
+            self.tree.remove(self._proxies.pop(eid))
+            self._keys.pop(eid, None)
+            self._bounds.pop(eid, None)
+
+        changed, transforms, los, his = [], [], [], []
+        for eid in current:
+            tr = em.get_component(eid, Transform)
+            mf = em.get_component(eid, MeshFilter)
+            key = (transform_key(tr), id(mf.asset), mf.asset.revision)
+            if self._keys.get(eid) == key:
+                continue
+            self._keys[eid] = key
+            lo, hi = mf.asset.bounds()
+            changed.append(eid)
+            transforms.append(tr)
+            los.append(lo)
+            his.append(hi)
+
+        if not changed:
+            return
+
+        # One batched pass for every entity that moved this frame
+        models = compute_model_matrices(transforms)
+        w_lo, w_hi = transform_aabbs(np.array(los), np.array(his), models)
+        for eid, lo, hi in zip(changed, w_lo.tolist(), w_hi.tolist()):
+            lo, hi = tuple(lo), tuple(hi)
+            self._bounds[eid] = (lo, hi)
+            proxy = self._proxies.get(eid)
+            if proxy is None:
+                self._proxies[eid] = self.tree.insert(lo, hi, eid)
+            else:
+                self.tree.move(proxy, lo, hi)
+
+    def __contains__(self, eid):
+        return eid in self._proxies
+
+    def get_bounds(self, eid):
+        """Tight world-space AABB (lo, hi) of an indexed entity, or None."""
+        return self._bounds.get(eid)
+
+    # --- queries: all return entity ids ----------------------------------
+
+    def query_aabb(self, lo, hi) -> list:
+        return self.tree.query_aabb(lo, hi)
+
+    def query_sphere(self, center, radius: float) -> list:
+        return self.tree.query_sphere(center, radius)
+
+    def query_frustum(self, vp_matrix: np.ndarray) -> list:
+        """Entities whose bounds intersect the frustum of a view-projection matrix."""
+        return self.tree.query_frustum(frustum_planes(vp_matrix))
+
+    def query_ray(self, origin, direction, max_distance: float = math.inf) -> list:
+        """(distance, eid) pairs for entities whose bounds the ray enters, nearest first."""
+        return self.tree.query_ray(origin, direction, max_distance)
+
+    def filter_visible(self, entities, vp_matrix: np.ndarray) -> list:
+        """
+        Frustum-culls a set of entities. Entities the index doesn't track yet
+        (e.g. created after the last sync) are kept rather than culled.
+        """
+        visible = set(self.query_frustum(vp_matrix))
+        return [e for e in entities if e in visible or e not in self._proxies]
@@ -0,0 +1,332 @@
+# zengine/ecs/systems/sprite_batch_system.py
+
+import math
+
+import moderngl
+import numpy as np
+
+from zengine.ecs.systems.system import System
+from zengine.assets.texture_asset import TextureAsset
+from zengine.ecs.components import Transform, SpriteRenderer
+from zengine.ecs.components.camera import CameraComponent
+from zengine.ecs.systems.profiler_system import profile_pass
+from zengine.ecs.systems.render_graph_system import RenderGraphSystem
+from zengine.graphics import render_graph
+from zengine.graphics.shader_library import ShaderLibrary
+
+# Quad corners in pivot space (0..1) and the two triangles drawn from them
+QUAD_CORNERS = np.array([(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)], dtype='f4')
+QUAD_INDICES = np.array([0, 1, 2, 2, 3, 0], dtype='u4')
+VERTEX_FLOATS = 9   # position 3, uv 2, color 4
+
+
+def build_vertices(position, rotation, size, pivot, uv, tint) -> np.ndarray:
+    """
+    (N,4,9) world-space quad vertices (position, uv, color) from per-sprite
+    (N,3) position, (N,2) cos/sin of the Z angle, (N,2) size, (N,2) pivot,
+    (N,4) uv rect and (N,4) tint.
+    """
+    local = (QUAD_CORNERS[None, :, :] - pivot[:, None, :]) * size[:, None, :]   # (N,4,2)
+    cos, sin = rotation[:, None, 0], rotation[:, None, 1]
+    lx, ly = local[..., 0], local[..., 1]
+
+    out = np.empty((len(position), 4, VERTEX_FLOATS), dtype='f4')
+    out[..., 0] = position[:, None, 0] + lx * cos - ly * sin
+    out[..., 1] = position[:, None, 1] + lx * sin + ly * cos
+    out[..., 2] = position[:, None, 2]
+    out[..., 3:5] = uv[:, None, 0:2] + QUAD_CORNERS[None, :, :] * uv[:, None, 2:4]
+    out[..., 5:9] = tint[:, None, :]
+    return out
+
+
+class SpriteBatchSystem(System):
+    """
+    Draws every entity with a Transform and SpriteRenderer in as few calls as possible.
+
+    Sprites live in persistent structure-of-arrays storage, one slot each,
+    with their quad vertices kept in a GPU buffer in slot order. Every frame
+    the Transform and SpriteRenderer fields of all sprites are read into one
+    array and compared with the last frame's per slot (as SpatialIndexSystem
+    and LightCache compare change keys); only the sprites that differ are
+    re-expanded, and only the span of the buffer covering them is uploaded.
+
+    With detect_changes off, sprites are only re-read when added or passed
+    to mark_dirty(eid) (mark_dirty() with no arguments re-reads them all),
+    which skips the per-frame read for scenes of static sprites.
+    Sprites rotate about their Transform's Z axis only.
+
+    Sprites are sorted by layer, then texture, through the index buffer; every
+    run sharing a texture within a layer is a single draw. They are blended in
+    layer order with depth testing off, as in a 2D renderer; within a layer,
+    order among different textures is by texture.
+    """
+    ARRAYS = ("eids", "source", "position", "rotation", "size", "pivot", "uv", "tint", "layer", "visible",
+              "textures", "vertices")
+    SOURCE_FLOATS = 19  # fields read from the components per sprite, see _read()
+
+    def __init__(self, ctx, scene=None):
+        super().__init__()
+        self.ctx = ctx
+        self.scene = scene
+        self.shader = ShaderLibrary.for_context(ctx).load("sprite_vert.glsl", "sprite_frag.glsl")
+
+        # stands in for SpriteRenderer.texture = None
+        self.white = ctx.texture((1, 1), 4, b'\xff\xff\xff\xff')
+
+        self.count = 0
+        self.capacity = 0
+        self._slot = {}         # eid -> slot
+        self.detect_changes = True
+        self.dirty = set()      # eids to re-read this frame regardless
+        self._dirty_all = False
+        self._runs = []         # (texture, first index, index count) per draw
+        self._reorder = True
+
+        self.vbo = None
+        self.ibo = None
+        self.vao = None
+        self._program = None    # program self.vao was built for
+        self._reserve(1024)
+        self.stats = {"sprites": 0, "batches": 0, "updated": 0}
+
+    def mark_dirty(self, *eids):
+        """Rebuilds these sprites from their Transform and SpriteRenderer next frame (all of them if none given)."""
+        if eids:
+            self.dirty.update(eids)
+        else:
+            self._dirty_all = True
+
+    # --- storage --------------------------------------------------------------------
+
+    def _allocate(self, capacity):
+        return {
+            "eids": np.zeros(capacity, dtype=np.int64),
+            "source": np.zeros((capacity, self.SOURCE_FLOATS), dtype='f4'),
+            "position": np.zeros((capacity, 3), dtype='f4'),
+            "rotation": np.zeros((capacity, 2), dtype='f4'),
+            "size": np.zeros((capacity, 2), dtype='f4'),
+            "pivot": np.zeros((capacity, 2), dtype='f4'),
+            "uv": np.zeros((capacity, 4), dtype='f4'),
+            "tint": np.zeros((capacity, 4), dtype='f4'),
+            "layer": np.zeros(capacity, dtype='f4'),
+            "visible": np.zeros(capacity, dtype=bool),
+            "textures": np.empty(capacity, dtype=object),
+            "vertices": np.zeros((capacity, 4, VERTEX_FLOATS), dtype='f4'),
+        }
+
+    def _reserve(self, sprites):
+        if sprites <= self.capacity:
+            return
+        capacity = max(sprites, self.capacity * 2)
+        for name, arr in self._allocate(capacity).items():
+            if self.count:
+                arr[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, arr)
+
+        for obj in (self.vbo, self.ibo):
+            if obj is not None:
+                obj.release()
+        self.vbo = self.ctx.buffer(reserve=capacity * 4 * VERTEX_FLOATS * 4, dynamic=True)
+        self.ibo = self.ctx.buffer(reserve=capacity * 6 * 4, dynamic=True)
+        self._vertex_array()
+        if self.count:
+            self.vbo.write(self.vertices[:self.count].tobytes())
+        self.capacity = capacity
+        self._reorder = True
+
+    def _vertex_array(self):
+        """(Re)builds the vertex array over the current buffers and the shader's current program."""
+        if self.vao is not None:
+            self.vao.release()
+        self._program = self.shader.program
+        self.vao = self.ctx.vertex_array(
+            self._program,
+            [(self.vbo, '3f 2f 4f', 'in_position', 'in_uv', 'in_color')],
+            self.ibo,
+        )
+
+    def _remove(self, eid) -> int:
+        """Frees an entity's slot by moving the last sprite into it; returns the slot rewritten."""
+        slot = self._slot.pop(eid)
+        last = self.count - 1
+        if slot != last:
+            for name in self.ARRAYS:
+                arr = getattr(self, name)
+                arr[slot] = arr[last]
+            self._slot[int(self.eids[slot])] = slot
+        self.textures[last] = None
+        self.count = last
+        self._reorder = True
+        return slot
+
+    def _read(self, entries):
+        """
+        (rows, textures) of (eid, Transform, SpriteRenderer) entries: per sprite,
+        SOURCE_FLOATS floats (position, Z rotation quaternion, size, pivot, uv rect,
+        tint, layer, visible) and the texture it draws with.
+        """
+        flat = []       # one flat float list converts much faster than a list of tuples
+        extend = flat.extend
+        textures = [None] * len(entries)
+        for i, (eid, t, s) in enumerate(entries):
+            # TextureAssets (atlas regions) resolve to their page texture, so every
+            # region of one page batches together; their rect scales the sprite's UVs
+            texture, uv = s.texture, s.uv_rect
+            if isinstance(texture, TextureAsset):
+                r = texture.uv_rect
+                uv = (r[0] + uv[0] * r[2], r[1] + uv[1] * r[3], uv[2] * r[2], uv[3] * r[3])
+                texture = texture.texture
+            textures[i] = texture if texture is not None else self.white
+            size, pivot, tint = s.size, s.pivot, s.tint
+            extend((t.x, t.y, t.z, t.rotation_z, t.rotation_w, t.scale_x * size[0], t.scale_y * size[1],
+                    pivot[0], pivot[1], uv[0], uv[1], uv[2], uv[3], tint[0], tint[1], tint[2], tint[3],
+                    s.layer, s.visible))
+        out = np.empty(len(entries), dtype=object)
+        out[:] = textures
+        return np.array(flat, dtype='f4').reshape(-1, self.SOURCE_FLOATS), out
+
+    def _write(self, entries, forced=()) -> np.ndarray:
+        """
+        Reads (eid, Transform, SpriteRenderer) entries in one batch and copies those
+        that are new, differ from their slot's last read, or are in `forced` into
+        their slots; returns the slots written.
+        """
+        added = [eid for eid, _, _ in entries if eid not in self._slot]
+        self._reserve(self.count + len(added))
+        for eid in added:
+            self._slot[eid] = self.count
+            self.eids[self.count] = eid
+            self.textures[self.count] = None    # never equal to a read texture, so always written
+            self.count += 1
+        self._reorder |= bool(added)
+
+        slot = self._slot
+        slots = np.fromiter([slot[e[0]] for e in entries], dtype=np.int64, count=len(entries))
+        rows, textures = self._read(entries)
+        keep = (rows != self.source[slots]).any(axis=1)
+        keep |= np.fromiter(map(id, self.textures[slots]), dtype=np.int64, count=len(slots)) \
+            != np.fromiter(map(id, textures), dtype=np.int64, count=len(slots))
+        if forced:
+            keep |= np.fromiter((eid in forced for eid, _, _ in entries), dtype=bool, count=len(entries))
+        slots, rows, textures = slots[keep], rows[keep], textures[keep]
+
+        # draw order only depends on layer, texture and visibility
+        layer, visible = rows[:, 17], rows[:, 18] != 0.0
+        if not self._reorder:
+            self._reorder = bool((self.layer[slots] != layer).any() or (self.visible[slots] != visible).any()
+                                 or any(a is not b for a, b in zip(self.textures[slots], textures)))
+
+        angle = 2.0 * np.arctan2(rows[:, 3], rows[:, 4])    # Z rotation of the quaternion
+        self.source[slots] = rows
+        self.position[slots] = rows[:, 0:3]
+        self.rotation[slots] = np.stack([np.cos(angle), np.sin(angle)], axis=1)
+        self.size[slots] = rows[:, 5:7]
+        self.pivot[slots] = rows[:, 7:9]
+        self.uv[slots] = rows[:, 9:13]
+        self.tint[slots] = rows[:, 13:17]
+        self.layer[slots] = layer
+        self.visible[slots] = visible
+        self.textures[slots] = textures
+        return slots
+
+    def _sync(self) -> np.ndarray:
+        """Brings the arrays up to date with the scene; returns the slots whose vertices changed."""
+        em = self.scene.entity_manager
+        transforms = em.components.get(Transform, {})
+        sprites = em.components.get(SpriteRenderer, {})
+
+        live = sprites.keys() & transforms.keys()
+        changed = [self._remove(eid) for eid in self._slot.keys() - live]
+        if self.detect_changes or self._dirty_all:
+            pending = live
+        else:
+            pending = (live - self._slot.keys()) | (self.dirty & live)
+        forced = live if self._dirty_all else self.dirty
+        entries = [(eid, transforms[eid], sprites[eid]) for eid in pending]
+        written = self._write(entries, forced) if entries else np.empty(0, dtype=np.int64)
+        self.dirty.clear()
+        self._dirty_all = False
+
+        changed = np.unique(np.concatenate([np.array(changed, dtype=np.int64), written]))
+        return changed[changed < self.count]
+
+    def _upload(self, slots):
+        """Re-expands the quads of the given slots and uploads the buffer span covering them."""
+        if not len(slots):
+            return
+        lo, hi = int(slots[0]), int(slots[-1]) + 1
+        sel = slice(lo, hi) if hi - lo == len(slots) else slots
+        self.vertices[sel] = build_vertices(self.position[sel], self.rotation[sel], self.size[sel],
+                                            self.pivot[sel], self.uv[sel], self.tint[sel])
+        stride = 4 * VERTEX_FLOATS * 4
+        self.vbo.write(self.vertices[lo:hi].tobytes(), offset=lo * stride)
+
+    def _order(self):
+        """Rebuilds the index buffer in (layer, texture) order and the draw runs over it."""
+        n = self.count
+        slots = np.flatnonzero(self.visible[:n])
+        self._runs = []
+        if not len(slots):
+            return
+        keys = np.fromiter(map(id, self.textures[slots]), dtype=np.int64, count=len(slots))
+        _, first, tex_index = np.unique(keys, return_index=True, return_inverse=True)
+        layers = self.layer[slots]
+        order = np.lexsort((tex_index, layers))
+        slots, tex_index, layers = slots[order], tex_index[order], layers[order]
+
+        indices = (QUAD_INDICES[None, :] + 4 * slots.astype('u4')[:, None]).ravel()
+        self.ibo.write(indices.tobytes())
+
+        # runs of equal (layer, texture) -> one draw each
+        change = np.flatnonzero((np.diff(tex_index) != 0) | (np.diff(layers) != 0)) + 1
+        starts = np.concatenate(([0], change)).tolist()
+        ends = np.concatenate((change, [len(slots)])).tolist()
+        textures = self.textures[slots[starts]]
+        self._runs = [(tex, 6 * a, 6 * (b - a)) for tex, a, b in zip(textures, starts, ends)]
+
+    # --- drawing ----------------------------------------------------------------------
+
+    def _camera(self):
+        cam_e = self.scene.active_camera
+        if cam_e is None:
+            return None
+        return self.scene.entity_manager.get_component(cam_e, CameraComponent)
+
+    def _render(self, cam):
+        changed = self._sync()
+        self._upload(changed)
+        if self._reorder:
+            self._order()
+            self._reorder = False
+        self.stats.update(sprites=self.count, batches=len(self._runs), updated=len(changed))
+        if not self._runs:
+            return
+
+        prog = self.shader.program
+        if prog is not self._program:   # hot-reloaded
+            self._vertex_array()
+        if 'view' in prog:       prog['view'].write(np.asarray(cam.view_matrix, dtype='f4').T.tobytes())
+        if 'projection' in prog: prog['projection'].write(np.asarray(cam.projection_matrix, dtype='f4').T.tobytes())
+        if 'u_texture' in prog:  prog['u_texture'].value = 0
+
+        self.ctx.disable(moderngl.DEPTH_TEST)
+        for tex, first, count in self._runs:
+            tex.use(location=0)
+            self.vao.render(moderngl.TRIANGLES, vertices=count, first=first)
+        self.ctx.enable(moderngl.DEPTH_TEST)
+
+    def on_render(self, renderer):
+        if self.scene.get_system(RenderGraphSystem) is not None:
+            return      # drawn through add_render_passes()
+        cam = self._camera()
+        if cam is None or cam.view_matrix is None:
+            return
+        with profile_pass(self.scene, "sprites"):
+            self._render(cam)
+
+    def add_render_passes(self, graph):
+        cam = self._camera()
+        if cam is None or cam.view_matrix is None:
+            return
+        graph.add_pass("sprites", lambda g: self._render(cam),
+                       order=render_graph.TRANSPARENT + 50, color=("color",), depth="depth")
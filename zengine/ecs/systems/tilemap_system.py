@@ -0,0 +1,208 @@
+# zengine/ecs/systems/tilemap_system.py
+
+import moderngl
+import numpy as np
+
+from zengine.assets.texture_asset import TextureAsset
+from zengine.ecs.systems.system import System
+from zengine.ecs.components import Transform, Tilemap
+from zengine.ecs.components.camera import CameraComponent
+from zengine.ecs.systems.profiler_system import profile_pass
+from zengine.ecs.systems.render_graph_system import RenderGraphSystem
+from zengine.ecs.systems.sprite_batch_system import QUAD_CORNERS, QUAD_INDICES
+from zengine.graphics import render_graph
+from zengine.graphics.shader_library import ShaderLibrary
+from zengine.util.intersection import frustum_planes, transform_aabbs, aabbs_in_frustum
+from zengine.util.transforms import compute_model_matrices
+
+
+def build_chunk_vertices(block: np.ndarray, origin, tile_size, rects: np.ndarray) -> np.ndarray:
+    """
+    Quad vertices of one chunk's non-empty tiles: (T, 4, 4) f4 rows of
+    (x, y, u, v) in map-local space. `origin` is the chunk's first tile and
+    `rects` the (P, 4) palette UV rects. Ids the palette no longer covers
+    (it was shrunk after they were written) draw nothing, like EMPTY.
+    """
+    ys, xs = np.nonzero((block >= 0) & (block < len(rects)))
+    ids = block[ys, xs]
+    corner = np.stack([xs + origin[0], ys + origin[1]], axis=1).astype('f4')  # (T,2) tile coords
+    tile = np.asarray(tile_size, dtype='f4')
+    rect = rects[ids]
+
+    out = np.empty((len(xs), 4, 4), dtype='f4')
+    out[..., 0:2] = (corner[:, None, :] + QUAD_CORNERS[None, :, :]) * tile
+    out[..., 2:4] = rect[:, None, 0:2] + QUAD_CORNERS[None, :, :] * rect[:, None, 2:4]
+    return out
+
+
+class TilemapSystem(System):
+    """
+    Renders Tilemap components as one mesh per chunk.
+
+    A chunk's mesh (two triangles per non-empty tile, local space) is built
+    with NumPy the first time the chunk is seen and again only when the
+    Tilemap marks it dirty. Each frame the chunks' bounds are culled against
+    the camera frustum in one vectorized test and every visible chunk is a
+    single draw, so map size only costs memory, not draws.
+
+    Chunks are built lazily: an edited chunk outside the view is rebuilt
+    when it next comes into view. Maps draw depth-tested, lowest layer first.
+    """
+    def __init__(self, ctx, scene=None):
+        super().__init__()
+        self.ctx = ctx
+        self.scene = scene
+        self.shader = ShaderLibrary.for_context(ctx).load("tilemap_vert.glsl", "sprite_frag.glsl")
+        self._meshes = {}       # (eid, cx, cy) -> (vbo, vao, tile count)
+        self._ibo = None
+        self._ibo_quads = 0
+        self._program = None    # program the chunk vertex arrays were built for
+        self.stats = {"chunks": 0, "visible": 0, "rebuilt": 0, "tiles": 0}
+
+    # --- chunk meshes -----------------------------------------------------------------
+
+    def _indices(self, quads):
+        """Shared index buffer covering `quads` quads."""
+        if quads > self._ibo_quads:
+            if self._ibo is not None:
+                self._ibo.release()
+            indices = (QUAD_INDICES[None, :] + 4 * np.arange(quads, dtype='u4')[:, None]).ravel()
+            self._ibo = self.ctx.buffer(indices.tobytes())
+            self._ibo_quads = quads
+            # VAOs bind the index buffer; rebuild them against the new one
+            self._rebuild_vertex_arrays()
+        return self._ibo
+
+    def _vertex_array(self, vbo):
+        self._program = self.shader.program
+        return self.ctx.vertex_array(self._program, [(vbo, '2f 2f', 'in_position', 'in_uv')], self._ibo)
+
+    def _rebuild_vertex_arrays(self):
+        for key, (vbo, vao, count) in list(self._meshes.items()):
+            vao.release()
+            self._meshes[key] = (vbo, self._vertex_array(vbo), count)
+
+    @staticmethod
+    def palette_rects(tm: Tilemap) -> np.ndarray:
+        return np.array([p.uv_rect if isinstance(p, TextureAsset) else p for p in tm.palette],
+                        dtype='f4').reshape(-1, 4)
+
+    @staticmethod
+    def texture_of(tm: Tilemap):
+        if tm.texture is not None:
+            return tm.texture
+        for p in tm.palette:
+            if isinstance(p, TextureAsset):
+                return p.texture
+        return None
+
+    def _build(self, eid, tm, coord, rects):
+        key = (eid, *coord)
+        block = tm.chunks.get(coord)
+        old = self._meshes.pop(key, None)
+        if old is not None:
+            old[1].release()
+            old[0].release()
+        if block is None or not len(rects):
+            return
+        cs = tm.chunk_size
+        data = build_chunk_vertices(block, (coord[0] * cs, coord[1] * cs), tm.tile_size, rects)
+        if not len(data):
+            return
+        self._indices(max(cs * cs, len(data)))
+        vbo = self.ctx.buffer(data.tobytes())
+        self._meshes[key] = (vbo, self._vertex_array(vbo), len(data))
+        self.stats["rebuilt"] += 1
+
+    def _release_entity(self, eid):
+        for key in [k for k in self._meshes if k[0] == eid]:
+            vbo, vao, _ = self._meshes.pop(key)
+            vao.release()
+            vbo.release()
+
+    # --- culling ----------------------------------------------------------------------
+
+    @staticmethod
+    def chunk_bounds(tm: Tilemap, coords: np.ndarray, model: np.ndarray):
+        """World AABBs (lo, hi) of (N,2) chunk coordinates under a model matrix."""
+        span = np.asarray(tm.tile_size, dtype='f4') * tm.chunk_size
+        lo = np.zeros((len(coords), 3), dtype='f4')
+        hi = np.zeros((len(coords), 3), dtype='f4')
+        lo[:, :2] = coords * span
+        hi[:, :2] = (coords + 1) * span
+        return transform_aabbs(lo, hi, np.broadcast_to(model, (len(coords), 4, 4)))
+
+    # --- drawing ----------------------------------------------------------------------
+
+    def _camera(self):
+        cam_e = self.scene.active_camera
+        if cam_e is None:
+            return None
+        return self.scene.entity_manager.get_component(cam_e, CameraComponent)
+
+    def _render(self, cam):
+        em = self.scene.entity_manager
+        maps = em.components.get(Tilemap, {})
+        for eid in {k[0] for k in self._meshes} - maps.keys():
+            self._release_entity(eid)
+
+        view = np.asarray(cam.view_matrix, dtype='f4')
+        proj = np.asarray(cam.projection_matrix, dtype='f4')
+        planes = frustum_planes(proj @ view)
+        prog = self.shader.program
+        if self._program is not None and prog is not self._program:    # hot-reloaded
+            self._rebuild_vertex_arrays()
+        if 'view' in prog:       prog['view'].write(view.T.tobytes())
+        if 'projection' in prog: prog['projection'].write(proj.T.tobytes())
+        if 'u_texture' in prog:  prog['u_texture'].value = 0
+
+        self.stats.update(chunks=0, visible=0, rebuilt=0, tiles=0)
+        self.ctx.depth_func = '<='     # later layers win on the same plane
+        for eid in sorted(maps, key=lambda e: maps[e].layer):
+            tm = maps[eid]
+            tr = em.get_component(eid, Transform)
+            texture = self.texture_of(tm)
+            if not tm.visible or tr is None or texture is None or not tm.chunks:
+                continue
+
+            model = compute_model_matrices([tr])[0]
+            coords = list(tm.chunks.keys())
+            lo, hi = self.chunk_bounds(tm, np.array(coords, dtype='f4'), model)
+            visible = np.flatnonzero(aabbs_in_frustum(lo, hi, planes))
+            self.stats["chunks"] += len(coords)
+
+            rects = None
+            for i in visible.tolist():
+                coord = coords[i]
+                if coord in tm.dirty or (eid, *coord) not in self._meshes:
+                    rects = self.palette_rects(tm) if rects is None else rects
+                    self._build(eid, tm, coord, rects)
+                    tm.dirty.discard(coord)
+
+            if 'model' in prog:  prog['model'].write(model.T.tobytes())
+            if 'u_tint' in prog: prog['u_tint'].value = tuple(tm.tint)
+            texture.use(location=0)
+            for i in visible.tolist():
+                mesh = self._meshes.get((eid, *coords[i]))
+                if mesh is None:
+                    continue
+                mesh[1].render(moderngl.TRIANGLES, vertices=6 * mesh[2])
+                self.stats["visible"] += 1
+                self.stats["tiles"] += mesh[2]
+        self.ctx.depth_func = '<'
+
+    def on_render(self, renderer):
+        if self.scene.get_system(RenderGraphSystem) is not None:
+            return      # drawn through add_render_passes()
+        cam = self._camera()
+        if cam is None or cam.view_matrix is None:
+            return
+        with profile_pass(self.scene, "tilemaps"):
+            self._render(cam)
+
+    def add_render_passes(self, graph):
+        cam = self._camera()
+        if cam is None or cam.view_matrix is None:
+            return
+        graph.add_pass("tilemaps", lambda g: self._render(cam),
+                       order=render_graph.OPAQUE + 50, color=("color",), depth="depth")
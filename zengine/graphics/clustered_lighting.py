@@ -0,0 +1,194 @@
+# zengine/graphics/clustered_lighting.py
+
+import math
+
+import moderngl
+import numpy as np
+
+
+class ClusteredLightGrid:
+    """
+    CPU light binning for clustered forward shading.
+
+    The view frustum is split into dims = (X, Y, Z) clusters: X*Y screen tiles
+    and Z depth slices (exponential for perspective, linear for orthographic).
+    Each frame `build()` assigns every point light to the clusters its
+    view-space bounding box touches, entirely with NumPy, and uploads three
+    textures that clustered_frag.glsl reads with texelFetch:
+
+        light_tex   RGBA32F, 2 rows x capacity: (position, range), (color, intensity)
+        cluster_tex RG32I, (X*Y) x Z: (offset into the index list, light count)
+        index_tex   R32I, INDEX_WIDTH wide: flat light index list, grouped by cluster
+    """
+    INDEX_WIDTH = 1024
+
+    def __init__(self, ctx, dims=(16, 9, 24), capacity=256):
+        self.ctx = ctx
+        self.dims = tuple(int(d) for d in dims)
+        self.light_count = 0
+        self.index_count = 0
+        self.near = 0.1
+        self.far = 100.0
+        self.ortho = False
+
+        X, Y, Z = self.dims
+        self.cluster_tex = ctx.texture((X * Y, Z), 2, dtype='i4')
+        self._nearest(self.cluster_tex)
+        self._cluster_data = np.zeros((Z, X * Y, 2), dtype='i4')
+
+        self.light_tex = None
+        self.index_tex = None
+        self._light_data = None
+        self._index_data = None
+        self._ensure_lights(capacity)
+        self._ensure_indices(self.INDEX_WIDTH)
+
+    @staticmethod
+    def _nearest(tex):
+        tex.filter = (moderngl.NEAREST, moderngl.NEAREST)
+        tex.repeat_x = False
+        tex.repeat_y = False
+
+    def _ensure_lights(self, n):
+        if self.light_tex is not None and self.light_tex.width >= n:
+            return
+        cap = 1 << max(int(n) - 1, 1).bit_length()
+        if self.light_tex is not None:
+            self.light_tex.release()
+        self.light_tex = self.ctx.texture((cap, 2), 4, dtype='f4')
+        self._nearest(self.light_tex)
+        self._light_data = np.zeros((2, cap, 4), dtype='f4')
+
+    def _ensure_indices(self, n):
+        rows = max(1, -(-int(n) // self.INDEX_WIDTH))
+        if self.index_tex is not None and self.index_tex.height >= rows:
+            return
+        rows = 1 << (rows - 1).bit_length()
+        if self.index_tex is not None:
+            self.index_tex.release()
+        self.index_tex = self.ctx.texture((self.INDEX_WIDTH, rows), 1, dtype='i4')
+        self._nearest(self.index_tex)
+        self._index_data = np.zeros(self.INDEX_WIDTH * rows, dtype='i4')
+
+    def _slice(self, depth):
+        Z = self.dims[2]
+        if self.ortho:
+            s = (depth - self.near) / (self.far - self.near) * Z
+        else:
+            s = np.log(np.maximum(depth, self.near) / self.near) / math.log(self.far / self.near) * Z
+        return np.clip(np.floor(s), 0, Z - 1).astype('i8')
+
+    def assign(self, view, proj, positions, ranges):
+        """
+        Bins point lights into clusters. Returns (cluster ids, light ids) pairs,
+        one per (light, touched cluster), unsorted.
+        """
+        X, Y, Z = self.dims
+        n = len(positions)
+        if n == 0:
+            return np.zeros(0, dtype='i8'), np.zeros(0, dtype='i8')
+
+        view = np.asarray(view, dtype='f4')
+        proj = np.asarray(proj, dtype='f4')
+        r = np.asarray(ranges, dtype='f4')
+
+        # Light bounding boxes in view space (camera looks down -Z)
+        c = np.asarray(positions, dtype='f4') @ view[:3, :3].T + view[:3, 3]
+        lo = c - r[:, None]
+        hi = c + r[:, None]
+        d_near = -hi[:, 2]
+        d_far = -lo[:, 2]
+        visible = (d_far > self.near) & (d_near < self.far)
+
+        z0 = self._slice(np.maximum(d_near, self.near))
+        z1 = self._slice(np.minimum(d_far, self.far))
+
+        # Screen tiles from the projected corners of each box. Only the part
+        # past the near plane lands in a cluster, and clipping the box there
+        # keeps every corner in front of the camera, so it always projects.
+        front = np.minimum(hi[:, 2], -self.near)
+        corners = np.stack([
+            np.stack([np.where(i & 1, hi[:, 0], lo[:, 0]),
+                      np.where(i & 2, hi[:, 1], lo[:, 1]),
+                      np.where(i & 4, front, lo[:, 2])], axis=1)
+            for i in range(8)
+        ], axis=1)                                               # (n,8,3)
+        clip_xy = corners @ proj[:2, :3].T + proj[:2, 3]         # (n,8,2)
+        clip_w = corners @ proj[3, :3] + proj[3, 3]              # (n,8)
+        ndc = clip_xy / np.maximum(clip_w, 1e-5)[..., None]
+        ndc_lo = ndc.min(axis=1)
+        ndc_hi = ndc.max(axis=1)
+        visible &= np.all(ndc_hi >= -1.0, axis=1) & np.all(ndc_lo <= 1.0, axis=1)
+
+        tiles = np.array([X, Y])
+        t0 = np.clip(np.floor((ndc_lo * 0.5 + 0.5) * tiles), 0, tiles - 1).astype('i8')
+        t1 = np.clip(np.floor((ndc_hi * 0.5 + 0.5) * tiles), 0, tiles - 1).astype('i8')
+
+        nx = t1[:, 0] - t0[:, 0] + 1
+        ny = t1[:, 1] - t0[:, 1] + 1
+        nz = z1 - z0 + 1
+        per_light = np.where(visible, nx * ny * nz, 0)
+
+        # Expand every light into the list of clusters it covers, no Python loop
+        total = int(per_light.sum())
+        lights = np.repeat(np.arange(n), per_light)
+        start = np.cumsum(per_light) - per_light
+        local = np.arange(total) - np.repeat(start, per_light)
+        lx = local % nx[lights]
+        rest = local // nx[lights]
+        ly = rest % ny[lights]
+        lz = rest // ny[lights]
+
+        cx = t0[lights, 0] + lx
+        cy = t0[lights, 1] + ly
+        cz = z0[lights] + lz
+        clusters = cx + X * (cy + Y * cz)
+        return clusters, lights
+
+    def build(self, view, proj, near, far, positions, colors, intensities, ranges, ortho=False):
+        """Bins the given point lights for this camera and uploads all three textures."""
+        X, Y, Z = self.dims
+        self.near = max(float(near), 1e-4)
+        self.far = max(float(far), self.near + 1e-3)
+        self.ortho = bool(ortho)
+
+        n = len(positions)
+        self.light_count = n
+        if n:
+            self._ensure_lights(n)
+            self._light_data[0, :n, :3] = positions
+            self._light_data[0, :n, 3] = ranges
+            self._light_data[1, :n, :3] = colors
+            self._light_data[1, :n, 3] = intensities
+            self.light_tex.write(self._light_data)
+
+        clusters, lights = self.assign(view, proj, positions, ranges)
+        order = np.argsort(clusters, kind='stable')
+        indices = lights[order]
+        counts = np.bincount(clusters, minlength=X * Y * Z)
+        offsets = np.cumsum(counts) - counts
+
+        self.index_count = len(indices)
+        self._ensure_indices(self.index_count)
+        self._index_data[:self.index_count] = indices
+        self.index_tex.write(self._index_data)
+
+        grid = self._cluster_data.reshape(X * Y * Z, 2)
+        grid[:, 0] = offsets
+        grid[:, 1] = counts
+        self.cluster_tex.write(self._cluster_data)
+
+    def bind(self, prog, light_unit, cluster_unit, index_unit, viewport):
+        """Binds the textures and cluster uniforms for a program declaring them."""
+        self.light_tex.use(location=light_unit)
+        self.cluster_tex.use(location=cluster_unit)
+        self.index_tex.use(location=index_unit)
+        if 'u_light_data' in prog:      prog['u_light_data'].value = light_unit
+        if 'u_cluster_grid' in prog:    prog['u_cluster_grid'].value = cluster_unit
+        if 'u_light_indices' in prog:   prog['u_light_indices'].value = index_unit
+        if 'u_cluster_dims' in prog:    prog['u_cluster_dims'].value = self.dims
+        if 'u_cluster_depth' in prog:
+            prog['u_cluster_depth'].value = (self.near, self.far,
+                                             math.log(self.far / self.near), float(self.ortho))
+        if 'u_viewport' in prog:
+            prog['u_viewport'].value = tuple(float(v) for v in viewport)
@@ -0,0 +1,222 @@
+# zengine/graphics/debug_draw.py
+
+import moderngl
+import numpy as np
+
+from zengine.util.transforms import quats_to_mat3
+
+# Line-list geometry for common shapes
+AXES_LINES = np.array([
+    (0.0, 0.0, 0.0), (1.0, 0.0, 0.0),   # X
+    (0.0, 0.0, 0.0), (0.0, 1.0, 0.0),   # Y
+    (0.0, 0.0, 0.0), (0.0, 0.0, 1.0),   # Z
+], dtype='f4')
+AXES_COLORS = np.repeat(np.eye(3, dtype='f4'), 2, axis=0)   # red, green, blue
+
+# 12 edges of the unit cube (-0.5..0.5)
+_CORNERS = np.array([(x, y, z) for z in (-0.5, 0.5) for y in (-0.5, 0.5) for x in (-0.5, 0.5)], dtype='f4')
+BOX_LINES = _CORNERS[[0, 1, 1, 3, 3, 2, 2, 0,
+                      4, 5, 5, 7, 7, 6, 6, 4,
+                      0, 4, 1, 5, 3, 7, 2, 6]]
+
+
+def transform_lines(matrices: np.ndarray, lines: np.ndarray) -> np.ndarray:
+    """The same (V,3) line list placed by each of (N,4,4) matrices -> (N*V,3) world points."""
+    pts = np.einsum('nij,vj->nvi', matrices[:, :3, :3], lines) + matrices[:, None, :3, 3]
+    return pts.reshape(-1, 3)
+
+
+def circle_lines(segments: int) -> np.ndarray:
+    """Unit circle in the XY plane as a (2*segments, 3) line list."""
+    a = np.linspace(0.0, 2.0 * np.pi, segments + 1)
+    ring = np.stack([np.cos(a), np.sin(a), np.zeros_like(a)], axis=1).astype('f4')
+    return np.stack([ring[:-1], ring[1:]], axis=1).reshape(-1, 3)
+
+
+# expiry of primitives submitted without a duration: gone at the next end_frame()
+THIS_FRAME = -np.inf
+
+
+class _Staging:
+    """Growable CPU array of (position, color) line vertices with an expiry time per vertex."""
+    def __init__(self, capacity):
+        self.vertices = np.empty((capacity, 6), dtype='f4')
+        self.expiry = np.empty(capacity, dtype='f8')
+        self.count = 0
+
+    def append(self, positions, colors, expiry):
+        n = len(positions)
+        end = self.count + n
+        if end > len(self.vertices):
+            size = max(end, 2 * len(self.vertices))
+            self.vertices = np.resize(self.vertices, (size, 6))
+            self.expiry = np.resize(self.expiry, size)
+        self.vertices[self.count:end, :3] = positions
+        self.vertices[self.count:end, 3:] = colors
+        self.expiry[self.count:end] = expiry
+        self.count = end
+
+    @property
+    def data(self) -> np.ndarray:
+        return self.vertices[:self.count]
+
+    def expire(self, now, keep_frame=False):
+        expiry = self.expiry[:self.count]
+        alive = expiry > now
+        if keep_frame:
+            alive |= expiry == THIS_FRAME
+        keep = np.flatnonzero(alive)
+        n = len(keep)
+        if n != self.count:
+            self.vertices[:n] = self.vertices[keep]
+            self.expiry[:n] = self.expiry[keep]
+            self.count = n
+
+
+class DebugDraw:
+    """
+    Immediate-mode debug drawing for gameplay code:
+
+        debug = scene.get_system(DebugRenderSystem).draw
+        debug.line(a, b, color=(1, 0, 0))
+        debug.sphere(hit_point, 0.1, duration=2.0)
+        debug.text_marker(enemy_pos, "target", depth_test=False)
+
+    Calls only append vertices to a CPU staging array. Once a frame, flush()
+    streams everything into the LineBatch ring buffer and draws it in at most
+    two calls (depth-tested and on top), however many primitives there are.
+
+    Primitives last until the end of the frame unless given a `duration` in
+    seconds; update(dt) advances the clock and end_frame() drops what is
+    done. Text markers draw a cross in 3D; their labels are returned by
+    markers() in screen space for whatever overlay renders text.
+    """
+    def __init__(self, capacity: int = 4096):
+        self.time = 0.0
+        self._staging = {True: _Staging(capacity), False: _Staging(capacity)}  # keyed by depth_test
+        self._markers = []  # (position, text, color, expiry)
+
+    # --- clock ------------------------------------------------------------------
+
+    def update(self, dt: float):
+        """Advances the clock; timed primitives past their duration stop drawing."""
+        self.time += dt
+        self._expire(keep_frame=True)
+
+    def end_frame(self):
+        """Drops this frame's one-frame primitives and expired timed ones."""
+        self._expire(keep_frame=False)
+
+    def _expire(self, keep_frame):
+        for staging in self._staging.values():
+            staging.expire(self.time, keep_frame)
+        self._markers = [m for m in self._markers
+                         if m[3] > self.time or (keep_frame and m[3] == THIS_FRAME)]
+
+    def _expiry(self, duration):
+        return self.time + duration if duration > 0.0 else THIS_FRAME
+
+    def clear(self):
+        for staging in self._staging.values():
+            staging.count = 0
+        self._markers.clear()
+
+    @property
+    def vertex_count(self) -> int:
+        return sum(s.count for s in self._staging.values())
+
+    # --- primitives -------------------------------------------------------------
+
+    def lines(self, points, color=(1.0, 1.0, 1.0), duration: float = 0.0, depth_test: bool = True):
+        """Many segments at once: (2N, 3) points, consecutive pairs joined; color is one RGB or (2N, 3)."""
+        points = np.asarray(points, dtype='f4').reshape(-1, 3)
+        if len(points) == 0:
+            return
+        colors = np.broadcast_to(np.asarray(color, dtype='f4'), points.shape)
+        self._staging[depth_test].append(points, colors, self._expiry(duration))
+
+    def line(self, a, b, color=(1.0, 1.0, 1.0), duration: float = 0.0, depth_test: bool = True):
+        self.lines((a, b), color, duration, depth_test)
+
+    def ray(self, origin, direction, length: float = 1.0, color=(1.0, 1.0, 0.0),
+            duration: float = 0.0, depth_test: bool = True):
+        origin = np.asarray(origin, dtype='f4')
+        self.lines((origin, origin + np.asarray(direction, dtype='f4') * length), color, duration, depth_test)
+
+    def cross(self, position, size: float = 0.25, color=(1.0, 1.0, 1.0),
+              duration: float = 0.0, depth_test: bool = True):
+        p = np.asarray(position, dtype='f4')
+        h = size * 0.5
+        offsets = np.repeat(np.eye(3, dtype='f4') * h, 2, axis=0) * np.tile([[-1.0], [1.0]], (3, 1))
+        self.lines(p + offsets, color, duration, depth_test)
+
+    def axes(self, matrix, size: float = 1.0, duration: float = 0.0, depth_test: bool = True):
+        """RGB axes of a 4x4 model matrix."""
+        m = np.asarray(matrix, dtype='f4').reshape(1, 4, 4)
+        self.lines(transform_lines(m, AXES_LINES * size), AXES_COLORS, duration, depth_test)
+
+    def box(self, center, size, color=(1.0, 1.0, 0.0), rotation=None,
+            duration: float = 0.0, depth_test: bool = True):
+        """Box of `size` around `center`, optionally rotated by an (x, y, z, w) quaternion."""
+        m = np.eye(4, dtype='f4')
+        basis = quats_to_mat3(rotation)[0] if rotation is not None else np.eye(3, dtype='f4')
+        m[:3, :3] = basis * np.asarray(size, dtype='f4')
+        m[:3, 3] = center
+        self.lines(transform_lines(m[None], BOX_LINES), color, duration, depth_test)
+
+    def aabb(self, lo, hi, color=(1.0, 1.0, 0.0), duration: float = 0.0, depth_test: bool = True):
+        lo, hi = np.asarray(lo, dtype='f4'), np.asarray(hi, dtype='f4')
+        self.box((lo + hi) * 0.5, hi - lo, color, None, duration, depth_test)
+
+    def circle(self, center, radius: float, normal=(0.0, 0.0, 1.0), color=(1.0, 1.0, 1.0),
+               segments: int = 32, duration: float = 0.0, depth_test: bool = True):
+        n = np.asarray(normal, dtype='f8')
+        n /= np.linalg.norm(n)
+        u = np.cross(n, (1.0, 0.0, 0.0) if abs(n[0]) < 0.9 else (0.0, 1.0, 0.0))
+        u /= np.linalg.norm(u)
+        v = np.cross(n, u)
+        ring = circle_lines(segments)
+        pts = ring[:, :1] * u * radius + ring[:, 1:2] * v * radius + np.asarray(center, dtype='f8')
+        self.lines(pts, color, duration, depth_test)
+
+    def sphere(self, center, radius: float, color=(1.0, 1.0, 1.0), segments: int = 24,
+               duration: float = 0.0, depth_test: bool = True):
+        """Wire sphere: its three axis-aligned great circles."""
+        ring = circle_lines(segments) * radius
+        c = np.asarray(center, dtype='f4')
+        pts = np.concatenate([ring, ring[:, [0, 2, 1]], ring[:, [2, 0, 1]]]) + c
+        self.lines(pts, color, duration, depth_test)
+
+    def text_marker(self, position, text: str, color=(1.0, 1.0, 1.0), size: float = 0.25,
+                    duration: float = 0.0, depth_test: bool = True):
+        self.cross(position, size, color, duration, depth_test)
+        self._markers.append((tuple(position), str(text), tuple(color), self._expiry(duration)))
+
+    # --- output -----------------------------------------------------------------
+
+    def markers(self, view: np.ndarray, proj: np.ndarray, viewport) -> list:
+        """On-screen text markers as (x, y, text, color), y from the top of the viewport."""
+        if not self._markers:
+            return []
+        x0, y0, w, h = viewport
+        pos = np.array([m[0] for m in self._markers], dtype='f8')
+        clip = np.c_[pos, np.ones(len(pos))] @ (np.asarray(proj, dtype='f8') @ np.asarray(view, dtype='f8')).T
+        out = []
+        for (p, text, color, _), c in zip(self._markers, clip):
+            if c[3] <= 0.0:
+                continue
+            ndc = c[:3] / c[3]
+            if np.any(np.abs(ndc[:2]) > 1.0):
+                continue
+            out.append((x0 + (ndc[0] * 0.5 + 0.5) * w, y0 + (0.5 - ndc[1] * 0.5) * h, text, color))
+        return out
+
+    def flush(self, batch, view: np.ndarray, proj: np.ndarray, ctx=None):
+        """Draws everything staged through a LineBatch: one draw depth-tested, one on top."""
+        batch.draw_packed(self._staging[True].data, view, proj)
+        overlay = self._staging[False].data
+        if len(overlay):
+            ctx = ctx or batch.ctx
+            ctx.disable(moderngl.DEPTH_TEST)
+            batch.draw_packed(overlay, view, proj)
+            ctx.enable(moderngl.DEPTH_TEST)
@@ -0,0 +1,151 @@
+# zengine/graphics/frame_capture.py
+
+import json
+import os
+import queue
+import threading
+import traceback
+
+
+class FrameCapture:
+    """
+    Non-blocking framebuffer capture to PNG sequences or raw video.
+
+    capture() issues an asynchronous read of the framebuffer into one of a
+    ring of `ring_size` GL pixel buffers and returns immediately. A buffer is
+    mapped (read back on the CPU) only when the ring comes around to it again,
+    ring_size - 1 frames later, when the GPU has long finished the copy, so
+    the render loop never waits on the frame it just submitted.
+
+    Mapped frames go into a queue of at most `max_queue` frames that a
+    background thread drains to disk:
+
+    - "png": one frame_000000.png per frame (needs Pillow)
+    - "raw": all frames appended to capture.rgb / capture.rgba, top row
+      first, plus capture.json with size and frame count, e.g. for
+      `ffmpeg -f rawvideo -pix_fmt rgba -s WxH -r 60 -i capture.rgba out.mp4`
+
+    If the writer falls behind and the queue is full, the frame is dropped
+    and counted in stats["dropped"] rather than stalling rendering.
+    """
+    def __init__(self, ctx, directory, mode: str = "png", ring_size: int = 3, max_queue: int = 8,
+                 components: int = 3, fps: float = 60.0):
+        if mode not in ("png", "raw"):
+            raise ValueError(f"Unknown capture mode '{mode}' (expected 'png' or 'raw')")
+        self.ctx = ctx
+        self.directory = os.path.abspath(str(directory))
+        os.makedirs(self.directory, exist_ok=True)
+        self.mode = mode
+        self.components = components
+        self.fps = fps
+        self.stats = {"captured": 0, "written": 0, "dropped": 0, "failed": 0}
+
+        self._ring = [[None, None, None] for _ in range(max(2, ring_size))]   # [buffer, frame, size]
+        self._next = 0
+        self._frame = 0
+        self._size = None
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._raw = None
+        self._thread = threading.Thread(target=self._run, name="FrameCapture", daemon=True)
+        self._thread.start()
+
+    # --- render thread --------------------------------------------------------
+
+    def capture(self, fbo=None):
+        """Queues a read of `fbo` (default: the bound framebuffer). Call after the frame is drawn."""
+        fbo = fbo or self.ctx.fbo
+        viewport = tuple(fbo.viewport)
+        size = (viewport[2], viewport[3])
+        nbytes = size[0] * size[1] * self.components
+
+        slot = self._ring[self._next]
+        self._next = (self._next + 1) % len(self._ring)
+        if slot[1] is not None:
+            self._collect(slot)
+
+        if slot[0] is None:
+            slot[0] = self.ctx.buffer(reserve=nbytes, dynamic=True)
+        elif slot[0].size != nbytes:
+            slot[0].orphan(nbytes)
+        fbo.read_into(slot[0], viewport, components=self.components, alignment=1)
+        slot[1] = self._frame
+        slot[2] = size
+        self._frame += 1
+        self.stats["captured"] += 1
+
+    def _collect(self, slot):
+        buf, frame, size = slot
+        slot[1] = None
+        try:
+            self._queue.put_nowait((frame, size, buf.read()))
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    def flush(self):
+        """Maps every outstanding read (oldest first) and hands it to the writer."""
+        n = len(self._ring)
+        for i in range(n):
+            slot = self._ring[(self._next + i) % n]
+            if slot[1] is not None:
+                self._collect(slot)
+
+    def close(self):
+        """Flushes, waits for the writer to finish and releases the pixel buffers."""
+        if self._thread is None:
+            return
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        for slot in self._ring:
+            if slot[0] is not None:
+                slot[0].release()
+                slot[0] = None
+
+    # --- writer thread --------------------------------------------------------
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            frame, size, data = item
+            try:
+                self._write(frame, size, data)
+                self.stats["written"] += 1
+            except Exception as e:
+                self.stats["failed"] += 1
+                print(f"⚠️ Failed to write captured frame {frame}:")
+                traceback.print_exception(type(e), e, e.__traceback__)
+        self._finish()
+
+    def _write(self, frame, size, data):
+        # GL rows are bottom-up; files are written top row first
+        w, h = size
+        stride = w * self.components
+        rows = b"".join(data[y * stride:(y + 1) * stride] for y in range(h - 1, -1, -1))
+
+        if self.mode == "png":
+            from PIL import Image
+            Image.frombytes("RGB" if self.components == 3 else "RGBA", size, rows).save(
+                os.path.join(self.directory, f"frame_{frame:06d}.png"))
+            return
+
+        if self._raw is None:
+            self._size = size
+            ext = "rgb" if self.components == 3 else "rgba"
+            self._raw = open(os.path.join(self.directory, f"capture.{ext}"), 'wb')
+        if size != self._size:
+            raise ValueError(f"Raw capture is {self._size[0]}x{self._size[1]}, got a {w}x{h} frame")
+        self._raw.write(rows)
+
+    def _finish(self):
+        if self._raw is None:
+            return
+        self._raw.close()
+        self._raw = None
+        with open(os.path.join(self.directory, "capture.json"), 'w', encoding='utf-8') as f:
+            json.dump({"width": self._size[0], "height": self._size[1],
+                       "pix_fmt": "rgb24" if self.components == 3 else "rgba",
+                       "fps": self.fps, "frames": self.stats["written"]}, f)
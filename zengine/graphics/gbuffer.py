@@ -0,0 +1,56 @@
+# zengine/graphics/gbuffer.py
+
+import moderngl
+
+
+class GBuffer:
+    """
+    Render targets for deferred shading, matching gbuffer_frag.glsl:
+
+        albedo   RGBA8    rgb albedo, a smoothness
+        normal   RGBA16F  world-space normal
+        position RGBA32F  world-space position
+        depth    DEPTH24  sampled by the lighting pass and written back out
+
+    Targets are (re)allocated on demand when the requested size changes.
+    """
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.size = None
+        self.albedo = None
+        self.normal = None
+        self.position = None
+        self.depth = None
+        self.fbo = None
+
+    def ensure(self, size):
+        size = (int(size[0]), int(size[1]))
+        if size == self.size:
+            return
+        self.release()
+        self.size = size
+        self.albedo = self.ctx.texture(size, 4, dtype='f1')
+        self.normal = self.ctx.texture(size, 4, dtype='f2')
+        self.position = self.ctx.texture(size, 4, dtype='f4')
+        self.depth = self.ctx.depth_texture(size)
+        for tex in (self.albedo, self.normal, self.position, self.depth):
+            tex.filter = (moderngl.NEAREST, moderngl.NEAREST)
+            tex.repeat_x = False
+            tex.repeat_y = False
+        self.depth.compare_func = ''    # sampled as plain depth values, not a shadow sampler
+        self.fbo = self.ctx.framebuffer([self.albedo, self.normal, self.position], self.depth)
+
+    def release(self):
+        for obj in (self.fbo, self.albedo, self.normal, self.position, self.depth):
+            if obj is not None:
+                obj.release()
+        self.fbo = self.albedo = self.normal = self.position = self.depth = None
+        self.size = None
+
+    def bind(self, prog, first_unit):
+        """Binds the four targets to consecutive texture units starting at first_unit."""
+        for i, (name, tex) in enumerate((('g_albedo', self.albedo), ('g_normal', self.normal),
+                                         ('g_position', self.position), ('g_depth', self.depth))):
+            tex.use(location=first_unit + i)
+            if name in prog:
+                prog[name].value = first_unit + i
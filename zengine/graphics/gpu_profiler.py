@@ -0,0 +1,186 @@
+# zengine/graphics/gpu_profiler.py
+
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+
+@dataclass
+class PassTiming:
+    """One profiled pass of one frame. Times are in milliseconds; GPU fields are None until resolved."""
+    name: str
+    depth: int
+    cpu_start: float            # ms since the profiler was created
+    cpu_ms: float = 0.0
+    gpu_ms: float | None = None
+    samples: int | None = None
+    primitives: int | None = None
+    query: object = field(default=None, repr=False)
+
+
+@dataclass
+class FrameTiming:
+    index: int
+    cpu_start: float
+    cpu_ms: float = 0.0
+    passes: list = field(default_factory=list)
+
+    @property
+    def gpu_ms(self) -> float:
+        return sum(p.gpu_ms for p in self.passes if p.gpu_ms is not None)
+
+    @property
+    def bound(self) -> str:
+        """'gpu' if the profiled GPU work took longer than the frame's CPU time, else 'cpu'."""
+        return "gpu" if self.gpu_ms > self.cpu_ms else "cpu"
+
+
+class GPUProfiler:
+    """
+    Per-pass CPU and GPU timing for the render loop.
+
+    Wrap each pass in `with profiler.scope("name"):`. The CPU side is timed
+    with perf_counter; the GPU side by a moderngl query (time elapsed, samples
+    passed, primitives generated) around the pass. Query results are read
+    `latency` frames after they were issued, by which time the GPU has long
+    finished them, so reading never stalls the pipeline waiting for the
+    current frame. Finished frames go into `timeline` (the last `history`).
+
+    GL allows only one active query of each kind, so GPU scopes don't nest:
+    a scope opened inside another one gets CPU timing only.
+
+    moderngl only exposes elapsed time, not GPU timestamps, so in the Chrome
+    trace each GPU pass is placed at its CPU submission time or right after
+    the previous GPU pass, whichever is later.
+    """
+    def __init__(self, ctx, latency: int = 3, history: int = 240, gpu: bool = True):
+        self.ctx = ctx
+        self.latency = max(1, latency)
+        self.gpu = gpu
+        self.timeline = deque(maxlen=history)
+
+        self._origin = time.perf_counter()
+        self._frame_index = 0
+        self._frame = None
+        self._stack = []
+        self._gpu_open = False
+        self._pending = deque()     # finished frames whose queries aren't read yet
+        self._free = []             # query pool
+
+    def _now(self) -> float:
+        return (time.perf_counter() - self._origin) * 1000.0
+
+    def _query(self):
+        if self._free:
+            return self._free.pop()
+        return self.ctx.query(time=True, samples=True, primitives=True)
+
+    # --- recording ------------------------------------------------------------
+
+    def begin_frame(self):
+        if self._frame is not None:
+            self.end_frame()
+        self._frame = FrameTiming(self._frame_index, self._now())
+        self._frame_index += 1
+
+    def end_frame(self):
+        frame = self._frame
+        if frame is None:
+            return
+        self._frame = None
+        frame.cpu_ms = self._now() - frame.cpu_start
+        self._pending.append(frame)
+        while len(self._pending) > self.latency:
+            self._resolve(self._pending.popleft())
+
+    @contextmanager
+    def scope(self, name: str):
+        if self._frame is None:
+            self.begin_frame()
+        timing = PassTiming(name, len(self._stack), self._now())
+        self._frame.passes.append(timing)
+
+        query = None
+        if self.gpu and not self._gpu_open:
+            query = timing.query = self._query()
+            self._gpu_open = True
+        self._stack.append(timing)
+        start = time.perf_counter()
+        try:
+            if query is not None:
+                with query:
+                    yield timing
+            else:
+                yield timing
+        finally:
+            timing.cpu_ms = (time.perf_counter() - start) * 1000.0
+            self._stack.pop()
+            if query is not None:
+                self._gpu_open = False
+
+    def _resolve(self, frame):
+        for p in frame.passes:
+            if p.query is None:
+                continue
+            p.gpu_ms = p.query.elapsed / 1e6
+            p.samples = p.query.samples
+            p.primitives = p.query.primitives
+            self._free.append(p.query)
+            p.query = None
+        self.timeline.append(frame)
+
+    def flush(self):
+        """Reads back every outstanding query now (blocks until the GPU is done)."""
+        self.end_frame()
+        while self._pending:
+            self._resolve(self._pending.popleft())
+
+    # --- reporting ------------------------------------------------------------
+
+    def summary(self, frames: int = None) -> dict:
+        """Average cpu_ms / gpu_ms / samples / primitives per pass name over the last `frames` frames."""
+        recent = list(self.timeline)[-frames:] if frames else list(self.timeline)
+        totals = {}
+        for frame in recent:
+            for p in frame.passes:
+                t = totals.setdefault(p.name, {"count": 0, "cpu_ms": 0.0, "gpu_ms": 0.0, "samples": 0, "primitives": 0})
+                t["count"] += 1
+                t["cpu_ms"] += p.cpu_ms
+                t["gpu_ms"] += p.gpu_ms or 0.0
+                t["samples"] += p.samples or 0
+                t["primitives"] += p.primitives or 0
+        for t in totals.values():
+            n = t.pop("count")
+            for k in t:
+                t[k] /= n
+        return totals
+
+    def chrome_trace(self, frames: int = None) -> dict:
+        """The timeline as Chrome trace-event JSON (load in chrome://tracing or Perfetto)."""
+        recent = list(self.timeline)[-frames:] if frames else list(self.timeline)
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": 0, "tid": 0, "args": {"name": "CPU"}},
+            {"name": "thread_name", "ph": "M", "pid": 0, "tid": 1, "args": {"name": "GPU"}},
+        ]
+        gpu_end = 0.0
+        for frame in recent:
+            events.append({"name": f"Frame {frame.index}", "ph": "X", "pid": 0, "tid": 0,
+                           "ts": frame.cpu_start * 1000.0, "dur": frame.cpu_ms * 1000.0,
+                           "args": {"gpu_ms": frame.gpu_ms, "bound": frame.bound}})
+            for p in frame.passes:
+                events.append({"name": p.name, "ph": "X", "pid": 0, "tid": 0,
+                               "ts": p.cpu_start * 1000.0, "dur": p.cpu_ms * 1000.0})
+                if p.gpu_ms is None:
+                    continue
+                start = max(p.cpu_start, gpu_end)
+                gpu_end = start + p.gpu_ms
+                events.append({"name": p.name, "ph": "X", "pid": 0, "tid": 1,
+                               "ts": start * 1000.0, "dur": p.gpu_ms * 1000.0,
+                               "args": {"samples": p.samples, "primitives": p.primitives}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path, frames: int = None):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(frames), f)
@@ -0,0 +1,99 @@
+# zengine/graphics/joint_palette.py
+
+import moderngl
+import numpy as np
+
+from zengine.animation.skin_utils import compute_joint_matrices
+
+
+class JointPaletteTexture:
+    """
+    Skinning matrices of every skeleton drawn in a frame, packed into one float texture.
+
+    Each frame, add() each skinned mesh before drawing. Its skeleton's
+    palette is computed once and appended. A skeleton is keyed by the glTF
+    and its joint list, because each glTF primitive carries its own
+    SkinAsset. pack() then uploads everything in one write. A draw only
+    sets the skeleton's offset and joint count, so rigs are not limited by
+    uniform array size, and many instances can share the one texture.
+
+        palette_tex  RGBA32F, WIDTH wide: 4 texels per matrix, one per column,
+                     matrix i of a skeleton at texel (offset + i) * 4
+
+    Vertex shaders read it through include/joint_palette.glsl (u_joint_palette,
+    u_joint_offset, u_joint_count); a joint count of 0 means unskinned.
+    """
+    WIDTH = 1024    # texels per row: 256 matrices
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.texture = None
+        self._offsets = {}      # skeleton key -> (first matrix, joint count), this frame
+        self._palettes = {}     # skeleton key -> (J,4,4) array, in packing order
+        self.matrix_count = 0
+        self.stats = {"skeletons": 0, "joints": 0, "uploads": 0}
+
+    @staticmethod
+    def key(mesh_asset) -> tuple:
+        return (id(mesh_asset.gltf_data), tuple(mesh_asset.skin_asset.joint_nodes))
+
+    def new_frame(self):
+        self._offsets.clear()
+        self._palettes.clear()
+        self.matrix_count = 0
+
+    def add(self, mesh_asset):
+        """Reserves the palette of a skinned mesh's skeleton (computed once per frame)."""
+        key = self.key(mesh_asset)
+        if key in self._offsets:
+            return
+        joints = compute_joint_matrices(mesh_asset.gltf_data, mesh_asset.skin_asset)
+        self._offsets[key] = (self.matrix_count, len(joints))
+        self._palettes[key] = joints
+        self.matrix_count += len(joints)
+
+    def matrices(self, mesh_asset):
+        """This frame's (J,4,4) palette of a mesh's skeleton, or None if it was not added."""
+        return self._palettes.get(self.key(mesh_asset))
+
+    def _ensure(self, texels):
+        rows = max(1, -(-texels // self.WIDTH))
+        if self.texture is not None and self.texture.height >= rows:
+            return
+        if self.texture is not None:
+            self.texture.release()
+        rows = 1 << (rows - 1).bit_length()
+        self.texture = self.ctx.texture((self.WIDTH, rows), 4, dtype='f4')
+        self.texture.filter = (moderngl.NEAREST, moderngl.NEAREST)
+        self.texture.repeat_x = False
+        self.texture.repeat_y = False
+
+    def pack(self):
+        """Uploads this frame's palettes in one write."""
+        self.stats.update(skeletons=len(self._palettes), joints=self.matrix_count)
+        if not self._palettes:
+            return
+        texels = self.matrix_count * 4
+        self._ensure(texels)
+        # texel c of a matrix holds its column c, as GLSL's mat4(c0, c1, c2, c3) expects
+        data = np.concatenate(list(self._palettes.values())).astype('f4').transpose(0, 2, 1).reshape(-1, 4)
+        rows = -(-texels // self.WIDTH)
+        if rows * self.WIDTH != texels:
+            data = np.concatenate([data, np.zeros((rows * self.WIDTH - texels, 4), dtype='f4')])
+        self.texture.write(data.tobytes(), viewport=(0, 0, self.WIDTH, rows))
+        self.stats["uploads"] += 1
+
+    def bind(self, prog, mesh_asset, unit):
+        """Points a program declaring the palette uniforms at a mesh's skeleton (count 0 if unskinned)."""
+        if 'u_joint_count' not in prog:
+            return
+        entry = None
+        if getattr(mesh_asset, 'skin_asset', None) is not None:
+            entry = self._offsets.get(self.key(mesh_asset))
+        if entry is None:
+            prog['u_joint_count'].value = 0
+            return
+        self.texture.use(location=unit)
+        if 'u_joint_palette' in prog: prog['u_joint_palette'].value = unit
+        if 'u_joint_offset' in prog:  prog['u_joint_offset'].value = entry[0]
+        prog['u_joint_count'].value = entry[1]
@@ -0,0 +1,126 @@
+# zengine/graphics/light_cache.py
+
+import numpy as np
+
+from zengine.ecs.components.transform import Transform
+from zengine.ecs.components.light import LightComponent, LightType
+from zengine.util.quaternion import quats_to_forward
+from zengine.util.transforms import transform_key
+
+# Directional lights are packed as a point light this far along -direction,
+# so the plain forward shader can light with them like any other light; their
+# range is packed as DIRECTIONAL_RANGE, which the shader reads as "no falloff"
+DIRECTIONAL_DISTANCE = 1e6
+DIRECTIONAL_RANGE = -1.0
+
+
+class LightCache:
+    """
+    Incrementally maintained, packed light arrays.
+
+    Every light entity owns a slot in preallocated f4 arrays. Each frame only
+    lights whose Transform or LightComponent changed since the last update are
+    re-packed (directions for all of them in one batched quaternion pass);
+    unchanged lights keep their entries. Removing a light compacts the arrays.
+    """
+    def __init__(self, capacity: int = 16):
+        self._slots = {}     # eid -> slot
+        self._keys = {}      # eid -> change key
+        self._order = []     # slot -> eid
+        self.count = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        old = getattr(self, 'kinds', None)
+        kinds = np.zeros(capacity, dtype='i4')
+        positions = np.zeros((capacity, 3), dtype='f4')
+        directions = np.zeros((capacity, 3), dtype='f4')
+        colors = np.zeros((capacity, 3), dtype='f4')
+        intensities = np.zeros(capacity, dtype='f4')
+        ranges = np.zeros(capacity, dtype='f4')
+        if old is not None:
+            n = self.count
+            kinds[:n] = self.kinds[:n]
+            positions[:n] = self.positions[:n]
+            directions[:n] = self.directions[:n]
+            colors[:n] = self.colors[:n]
+            intensities[:n] = self.intensities[:n]
+            ranges[:n] = self.ranges[:n]
+        self.kinds, self.positions, self.directions = kinds, positions, directions
+        self.colors, self.intensities, self.ranges = colors, intensities, ranges
+
+    @property
+    def entities(self) -> list:
+        """Light entity ids in slot order, matching the packed arrays."""
+        return self._order
+
+    @staticmethod
+    def _key(tr, lc):
+        return (transform_key(tr), lc.type, tuple(lc.color), lc.intensity, lc.range)
+
+    def _remove(self, gone):
+        """Drops lights and compacts the remaining slots, preserving order."""
+        keep = [i for i, eid in enumerate(self._order) if eid not in gone]
+        for eid in gone:
+            self._slots.pop(eid, None)
+            self._keys.pop(eid, None)
+
+        for arr in (self.kinds, self.positions, self.directions, self.colors, self.intensities, self.ranges):
+            arr[:len(keep)] = arr[keep]
+        self._order = [self._order[i] for i in keep]
+        self._slots = {eid: i for i, eid in enumerate(self._order)}
+        self.count = len(self._order)
+
+    def update(self, em):
+        """
+        Syncs with the entity manager and returns views over the packed arrays:
+        (kinds, positions, directions, colors, intensities, ranges).
+        """
+        current = em.get_entities_with(Transform, LightComponent)
+
+        gone = [eid for eid in self._order if eid not in current]
+        if gone:
+            self._remove(set(gone))
+
+        changed = []
+        for eid in current:
+            tr = em.get_component(eid, Transform)
+            lc = em.get_component(eid, LightComponent)
+            key = self._key(tr, lc)
+            if self._keys.get(eid) == key:
+                continue
+            self._keys[eid] = key
+
+            slot = self._slots.get(eid)
+            if slot is None:
+                if self.count == len(self.kinds):
+                    self._allocate(max(16, 2 * len(self.kinds)))
+                slot = self.count
+                self._slots[eid] = slot
+                self._order.append(eid)
+                self.count += 1
+            changed.append((slot, tr, lc))
+
+        if changed:
+            self._pack(changed)
+
+        n = self.count
+        return (self.kinds[:n], self.positions[:n], self.directions[:n],
+                self.colors[:n], self.intensities[:n], self.ranges[:n])
+
+    def _pack(self, changed):
+        slots = np.array([c[0] for c in changed])
+        quats = np.array([(tr.rotation_x, tr.rotation_y, tr.rotation_z, tr.rotation_w)
+                          for _, tr, _ in changed], dtype='f4')
+        positions = np.array([(tr.x, tr.y, tr.z) for _, tr, _ in changed], dtype='f4')
+        kinds = np.array([lc.type.value for _, _, lc in changed], dtype='i4')
+        directional = kinds == LightType.DIRECTIONAL.value
+
+        forward = quats_to_forward(quats)
+        self.directions[slots] = np.where(directional[:, None], forward, (0.0, 0.0, -1.0))
+        self.positions[slots] = np.where(directional[:, None], -forward * DIRECTIONAL_DISTANCE, positions)
+        self.ranges[slots] = np.where(directional, DIRECTIONAL_RANGE,
+                                      [float(lc.range) for _, _, lc in changed])
+        self.kinds[slots] = kinds
+        self.colors[slots] = [tuple(lc.color[:3]) for _, _, lc in changed]
+        self.intensities[slots] = [float(lc.intensity) for _, _, lc in changed]
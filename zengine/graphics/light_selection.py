@@ -0,0 +1,54 @@
+# zengine/graphics/light_selection.py
+
+import numpy as np
+
+# Rec. 709 luma weights, used to compare colored lights by brightness
+LUMA = np.array([0.2126, 0.7152, 0.0722], dtype='f4')
+
+
+def light_influence(centers, radii, positions, colors, intensities, ranges, directional):
+    """
+    Attenuated intensity of every light at every object, as an (objects, lights)
+    matrix. Point lights are evaluated at the point of each bounding sphere
+    nearest to them, with the same (1 - d/range)^2 falloff as basic_frag.glsl,
+    so a light that cannot reach an object scores exactly 0. Directional lights
+    are unattenuated.
+    """
+    centers = np.asarray(centers, dtype='f8').reshape(-1, 3)
+    radii = np.asarray(radii, dtype='f4').reshape(-1)
+    positions = np.asarray(positions, dtype='f8').reshape(-1, 3)
+    ranges = np.maximum(np.asarray(ranges, dtype='f4'), 1e-4)
+
+    strength = (np.asarray(colors, dtype='f4').reshape(-1, 3) @ LUMA) * np.asarray(intensities, dtype='f4')
+
+    # |c - p|^2 expanded, so no (objects, lights, 3) temporary is built
+    d2 = ((centers * centers).sum(axis=1)[:, None] + (positions * positions).sum(axis=1)[None, :]
+          - 2.0 * (centers @ positions.T))
+    dist = np.maximum(np.sqrt(np.maximum(d2, 0.0)) - radii[:, None], 0.0)
+    att = np.clip(1.0 - dist / ranges[None, :], 0.0, 1.0) ** 2
+    att = np.where(np.asarray(directional)[None, :], 1.0, att)
+    return att * strength[None, :]
+
+
+def select_lights(influence: np.ndarray, k: int):
+    """
+    Picks the k most influential lights per object from an influence matrix.
+    Returns (indices (objects, k) sorted by influence, counts (objects,)).
+    Lights with zero influence are never selected; their slots sit at the end
+    of each row and are excluded by the count.
+    """
+    n_obj, n_lights = influence.shape
+    k = min(k, n_lights)
+    if k == 0:
+        return np.zeros((n_obj, 0), dtype='i8'), np.zeros(n_obj, dtype='i8')
+
+    if k < n_lights:
+        top = np.argpartition(-influence, k - 1, axis=1)[:, :k]
+    else:
+        top = np.broadcast_to(np.arange(n_lights), (n_obj, n_lights))
+    top_inf = np.take_along_axis(influence, top, axis=1)
+
+    order = np.argsort(-top_inf, axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    counts = np.count_nonzero(np.take_along_axis(top_inf, order, axis=1) > 0.0, axis=1)
+    return top, counts
@@ -0,0 +1,80 @@
+# zengine/graphics/line_batch.py
+
+import moderngl
+import numpy as np
+
+
+class LineBatch:
+    """
+    World-space colored line segments streamed through a ring-buffer VBO.
+
+    draw() takes (N, 3) positions and (N, 3) colors, every two vertices
+    forming a segment, and renders them with one LINES call. The vertices are
+    appended after the previous draw's in one persistent dynamic buffer;
+    when the buffer is full it is orphaned (the driver hands out fresh
+    storage while the GPU may still read the old one) and writing restarts
+    at the front. Nothing is reallocated per frame and no draw waits on an
+    earlier one still in flight. Meant for debug geometry that changes every
+    frame.
+
+    The vertex array is rebuilt when the shader's program is replaced
+    (hot-reload).
+    """
+    STRIDE = 6 * 4  # position + color, f4
+
+    def __init__(self, ctx, shader, capacity: int = 65536):
+        self.ctx = ctx
+        self.shader = shader
+        self.capacity = capacity    # vertices
+        self.vbo = ctx.buffer(reserve=capacity * self.STRIDE, dynamic=True)
+        self.vao = None
+        self._program = None        # program self.vao was built for
+        self._head = 0              # next free vertex in the ring
+        self.stats = {"draws": 0, "vertices": 0, "orphans": 0}
+
+    def _vertex_array(self):
+        prog = self.shader.program
+        if self._program is not prog:
+            if self.vao is not None:
+                self.vao.release()
+            self.vao = self.ctx.vertex_array(prog, [(self.vbo, '3f 3f', 'in_position', 'in_color')])
+            self._program = prog
+        return self.vao
+
+    def _reserve(self, count) -> int:
+        """First vertex of `count` free slots, orphaning (and growing if needed) when the ring is full."""
+        if self._head + count <= self.capacity:
+            first = self._head
+            self._head += count
+            return first
+        if count > self.capacity:
+            while self.capacity < count:
+                self.capacity *= 2
+        self.vbo.orphan(self.capacity * self.STRIDE)
+        self.stats["orphans"] += 1
+        self._head = count
+        return 0
+
+    def draw(self, positions: np.ndarray, colors: np.ndarray, view: np.ndarray, proj: np.ndarray):
+        count = len(positions)
+        if count == 0:
+            return
+        data = np.empty((count, 6), dtype='f4')
+        data[:, :3] = positions
+        data[:, 3:] = colors
+        self.draw_packed(data, view, proj)
+
+    def draw_packed(self, data: np.ndarray, view: np.ndarray, proj: np.ndarray):
+        """Draws already interleaved (N, 6) f4 position + color vertices."""
+        count = len(data)
+        if count == 0:
+            return
+        first = self._reserve(count)
+        self.vbo.write(np.ascontiguousarray(data, dtype='f4').tobytes(), offset=first * self.STRIDE)
+
+        prog = self.shader.program
+        if 'view' in prog:       prog['view'].write(view.T.astype('f4').tobytes())
+        if 'projection' in prog: prog['projection'].write(proj.T.astype('f4').tobytes())
+        self._vertex_array().render(moderngl.LINES, vertices=count, first=first)
+        self.stats["draws"] += 1
+        self.stats["vertices"] += count
@@ -0,0 +1,28 @@
+# zengine/graphics/program_cache.py
+
+import os
+
+# Environment variables that point the common GL drivers' own on-disk shader
+# caches somewhere (Mesa, older Mesa, NVIDIA). They are read when the driver
+# loads, so they only take effect if set before the GL context is created.
+DRIVER_CACHE_ENV = {
+    "MESA_SHADER_CACHE_DIR": "{dir}",
+    "MESA_GLSL_CACHE_DIR": "{dir}",
+    "__GL_SHADER_DISK_CACHE": "1",
+    "__GL_SHADER_DISK_CACHE_PATH": "{dir}",
+}
+
+
+def enable_driver_shader_cache(directory) -> None:
+    """
+    Points the GL driver's program binary cache at `directory` (unless the
+    user already configured one). moderngl has no glProgramBinary access, so
+    persisting linked binaries is left to the driver, which keys them on the
+    exact source text and its own build and falls back to compiling on any
+    mismatch. Call before the context is created.
+    """
+    directory = os.path.abspath(str(directory))
+    driver_dir = os.path.join(directory, "driver")
+    os.makedirs(driver_dir, exist_ok=True)
+    for var, value in DRIVER_CACHE_ENV.items():
+        os.environ.setdefault(var, value.format(dir=driver_dir))
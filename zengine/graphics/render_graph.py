@@ -0,0 +1,269 @@
+# zengine/graphics/render_graph.py
+
+from dataclasses import dataclass
+from typing import Callable
+
+import moderngl
+
+# Pass order buckets: passes run sorted by `order`, then by the order they were added
+SHADOW      = 0
+PREPASS     = 100
+OPAQUE      = 200
+TRANSPARENT = 300
+DEBUG       = 400
+POST        = 500
+
+BACKBUFFER = "backbuffer"
+
+
+@dataclass(frozen=True)
+class TextureDesc:
+    """Format of a transient attachment; pooled textures are shared between equal descriptions."""
+    size: tuple
+    components: int = 4
+    dtype: str = 'f1'
+    depth: bool = False
+
+
+@dataclass
+class RenderPass:
+    name: str
+    execute: Callable
+    order: int = OPAQUE
+    color: tuple = ()           # color attachments, drawn into (loaded, or cleared on first use)
+    depth: str | None = None    # depth attachment
+    reads: tuple = ()           # sampled inputs / other dependencies
+    writes: tuple = ()          # non-attachment outputs (e.g. a system's own shadow maps)
+    side_effects: bool = False  # never culled
+    index: int = 0              # order of add_pass() calls
+
+    @property
+    def outputs(self) -> tuple:
+        return (*self.color, *((self.depth,) if self.depth else ()), *self.writes)
+
+    @property
+    def inputs(self) -> tuple:
+        # Attachments are loaded, so a pass also depends on whoever drew into them before
+        return (*self.reads, *self.color, *((self.depth,) if self.depth else ()))
+
+
+class FramebufferPool:
+    """
+    Reuses offscreen textures and framebuffers across frames.
+
+    acquire() hands out a free texture of the requested TextureDesc or creates
+    one; release() returns it for the next acquire() of the same description,
+    in the same frame or a later one. Framebuffers are cached per attachment
+    set. Textures nobody acquired for `max_idle_frames` frames are freed by
+    end_frame().
+    """
+    def __init__(self, ctx, max_idle_frames: int = 60):
+        self.ctx = ctx
+        self.max_idle_frames = max_idle_frames
+        self._free = {}         # TextureDesc -> list of textures
+        self._last_used = {}    # id(texture) -> frame
+        self._descs = {}        # id(texture) -> (TextureDesc, texture)
+        self._framebuffers = {} # attachment ids -> Framebuffer
+        self._frame = 0
+        self.stats = {"created": 0, "reused": 0}
+
+    def acquire(self, desc: TextureDesc):
+        free = self._free.get(desc)
+        if free:
+            tex = free.pop()
+            self.stats["reused"] += 1
+        else:
+            tex = self._create(desc)
+            self._descs[id(tex)] = (desc, tex)
+            self.stats["created"] += 1
+        self._last_used[id(tex)] = self._frame
+        return tex
+
+    def _create(self, desc):
+        if desc.depth:
+            tex = self.ctx.depth_texture(desc.size)
+            tex.compare_func = ''
+        else:
+            tex = self.ctx.texture(desc.size, desc.components, dtype=desc.dtype)
+        tex.filter = (moderngl.LINEAR, moderngl.LINEAR) if not desc.depth else (moderngl.NEAREST, moderngl.NEAREST)
+        tex.repeat_x = False
+        tex.repeat_y = False
+        return tex
+
+    def release(self, tex):
+        desc, _ = self._descs[id(tex)]
+        self._free.setdefault(desc, []).append(tex)
+
+    def framebuffer(self, color, depth=None):
+        key = (tuple(id(t) for t in color), id(depth) if depth is not None else None)
+        fbo = self._framebuffers.get(key)
+        if fbo is None:
+            fbo = self.ctx.framebuffer(list(color), depth)
+            self._framebuffers[key] = fbo
+        return fbo
+
+    def end_frame(self):
+        """Frees textures (and their framebuffers) left unused for max_idle_frames."""
+        self._frame += 1
+        for desc, free in self._free.items():
+            keep = []
+            for tex in free:
+                if self._frame - self._last_used[id(tex)] > self.max_idle_frames:
+                    self._drop(tex)
+                else:
+                    keep.append(tex)
+            free[:] = keep
+
+    def _drop(self, tex):
+        tid = id(tex)
+        for key in [k for k in self._framebuffers if tid in k[0] or k[1] == tid]:
+            self._framebuffers.pop(key).release()
+        del self._descs[tid]
+        del self._last_used[tid]
+        tex.release()
+
+    def release_all(self):
+        for _, tex in list(self._descs.values()):
+            self._drop(tex)
+        self._free.clear()
+
+
+class RenderGraph:
+    """
+    One frame's passes and the resources they exchange.
+
+    Resources are names. Imported ones are backed by something the caller owns:
+    a Framebuffer (its color and depth, e.g. the screen as BACKBUFFER), a
+    texture, or None for outputs a pass manages itself. Anything else used as
+    an attachment is transient and must be declared with create(); it gets a
+    pooled texture only for the span of passes that use it, and is cleared by
+    the first pass drawing into it (only that attachment: a color target first
+    drawn after a depth pre-pass keeps the pre-pass depth).
+
+    compile() drops passes whose outputs nothing needed consumes (only passes
+    writing an imported resource, or flagged side_effects, are needed by
+    themselves) and sorts the rest by `order`. execute() runs them, binding a
+    framebuffer made of each pass's attachments first. Pass callbacks receive
+    the graph and can fetch inputs with texture(name).
+    """
+    def __init__(self, ctx, pool: FramebufferPool, clear_color=(0.0, 0.0, 0.0, 0.0)):
+        self.ctx = ctx
+        self.pool = pool
+        self.clear_color = clear_color
+        self.passes = []
+        self._imported = {}     # name -> Framebuffer / texture / None
+        self._transient = {}    # name -> TextureDesc
+        self._textures = {}     # name -> texture while alive
+        self.culled = []
+
+    def import_resource(self, name, resource=None):
+        self._imported[name] = resource
+
+    def create(self, name, desc: TextureDesc):
+        self._transient[name] = desc
+
+    def add_pass(self, name, execute, order=OPAQUE, color=(), depth=None, reads=(), writes=(),
+                 side_effects=False) -> RenderPass:
+        rp = RenderPass(name, execute, order, tuple(color), depth, tuple(reads), tuple(writes),
+                        side_effects, len(self.passes))
+        self.passes.append(rp)
+        return rp
+
+    def texture(self, name):
+        """The texture behind a resource during execute()."""
+        if name in self._textures:
+            return self._textures[name]
+        res = self._imported.get(name)
+        if isinstance(res, moderngl.Framebuffer):
+            return res.color_attachments[0] if res.color_attachments else None
+        return res
+
+    # --- compile ------------------------------------------------------------------
+
+    def compile(self) -> list:
+        """Culled, ordered pass list."""
+        ordered = sorted(self.passes, key=lambda p: (p.order, p.index))
+        for p in ordered:
+            for name in p.color + ((p.depth,) if p.depth else ()):
+                if name not in self._imported and name not in self._transient:
+                    raise KeyError(f"Render pass '{p.name}' uses undeclared attachment '{name}'")
+
+        # Walk backwards: a pass is live if it is needed by itself or produces
+        # something a later live pass consumes
+        live = []
+        wanted = set()
+        for p in reversed(ordered):
+            needed = p.side_effects or any(o in self._imported and self._imported[o] is not None
+                                           for o in p.outputs)
+            if needed or any(o in wanted for o in p.outputs):
+                live.append(p)
+                # outputs are satisfied here; only what this pass loads/reads is needed earlier
+                wanted.difference_update(p.outputs)
+                wanted.update(p.inputs)
+        live.reverse()
+        self.culled = [p.name for p in ordered if p not in live]
+        return live
+
+    # --- execute ------------------------------------------------------------------
+
+    def execute(self, scope=None):
+        """Runs the compiled passes. `scope(name)`, if given, wraps each pass (e.g. profiling)."""
+        passes = self.compile()
+        last_use = {}
+        for i, p in enumerate(passes):
+            for name in (*p.inputs, *p.outputs):
+                if name in self._transient:
+                    last_use[name] = i
+
+        for i, p in enumerate(passes):
+            fbo, fresh = self._target(p)
+            if fbo is not None:
+                fbo.use()
+                if fresh:
+                    self._clear(fbo, p, fresh)
+            if scope is not None:
+                with scope(p.name):
+                    p.execute(self)
+            else:
+                p.execute(self)
+
+            for name, last in last_use.items():
+                if last == i and name in self._textures:
+                    self.pool.release(self._textures.pop(name))
+
+        backbuffer = self._imported.get(BACKBUFFER)
+        if isinstance(backbuffer, moderngl.Framebuffer):
+            backbuffer.use()
+
+    def _target(self, p):
+        """(framebuffer, names of newly allocated attachments) for a pass; (None, ()) if it has none."""
+        names = p.color + ((p.depth,) if p.depth else ())
+        if not names:
+            return None, ()
+        for name in names:
+            res = self._imported.get(name)
+            if isinstance(res, moderngl.Framebuffer):
+                return res, ()
+
+        fresh = []
+        for name in names:
+            if name in self._transient and name not in self._textures:
+                self._textures[name] = self.pool.acquire(self._transient[name])
+                fresh.append(name)
+        color = [self.texture(n) for n in p.color]
+        depth = self.texture(p.depth) if p.depth else None
+        return self.pool.framebuffer(color, depth), tuple(fresh)
+
+    def _clear(self, fbo, p, fresh):
+        """Clears only the attachments newly allocated for this pass; the others keep earlier passes' contents."""
+        color = [self.texture(n) for n in p.color if n in fresh]
+        depth = self.texture(p.depth) if p.depth in fresh else None
+        if len(color) == len(p.color) and (depth is not None or p.depth is None):
+            fbo.clear(*self.clear_color, depth=1.0)
+            return
+        # Framebuffer.clear() always clears every attachment, whatever the write
+        # masks, so clear through a framebuffer of just the fresh ones (e.g. the
+        # opaque pass after a depth pre-pass must keep the pre-pass depth)
+        if color or depth is not None:
+            self.pool.framebuffer(color, depth).clear(*self.clear_color, depth=1.0)
+            fbo.use()
@@ -1,21 +1,114 @@
+import os
+import re
+
 import moderngl
 
+_INCLUDE = re.compile(r'^[ \t]*#[ \t]*include[ \t]+[<"]([^>"]+)[>"][^\n]*$', re.MULTILINE)
+_VERSION = re.compile(r'^[ \t]*#[ \t]*version[^\n]*\n?', re.MULTILINE)
+
+
+def _resolve_include(name, base_dir, search_paths):
+    for d in (base_dir, *search_paths):
+        if d is None:
+            continue
+        path = os.path.normpath(os.path.join(d, name))
+        if os.path.isfile(path):
+            return path
+    raise FileNotFoundError(f"GLSL include '{name}' not found (from {base_dir})")
+
+
+def preprocess(source: str, base_dir=None, search_paths=(), defines=None, included=None, _top=True) -> str:
+    """
+    Expands `#include "file"` (relative to the including file, then search_paths;
+    each file is included once) and inserts `#define NAME value` lines right
+    after the `#version` directive. Defines with bool values become 1 / 0.
+    Paths of the included files are added to `included` when a set is given.
+    """
+    seen = included if included is not None else set()
+
+    def include(match):
+        path = _resolve_include(match.group(1), base_dir, search_paths)
+        if path in seen:
+            return ""
+        seen.add(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        text = _VERSION.sub("", text, count=1)
+        return preprocess(text, os.path.dirname(path), search_paths, None, seen, False).rstrip("\n")
+
+    source = _INCLUDE.sub(include, source)
+    if not _top or not defines:
+        return source
+
+    lines = "".join(f"#define {k} {int(v) if isinstance(v, bool) else v}\n" for k, v in sorted(defines.items()))
+    version = _VERSION.search(source)
+    if version is None:
+        return lines + source
+    return source[:version.end()] + lines + source[version.end():]
+
+
 class Shader:
-    def __init__(self, ctx, vertex_path, fragment_path):
+    def __init__(self, ctx, vertex_path, fragment_path, defines=None):
         # force UTF-8 decoding
         with open(vertex_path,  'r', encoding='utf-8') as f:
             vs = f.read()
         with open(fragment_path,'r', encoding='utf-8') as f:
             fs = f.read()
 
+        vs = preprocess(vs, os.path.dirname(os.path.abspath(vertex_path)), defines=defines)
+        fs = preprocess(fs, os.path.dirname(os.path.abspath(fragment_path)), defines=defines)
+        self._build(ctx, vs, fs)
+
+    @classmethod
+    def from_source(cls, ctx, vertex_source: str, fragment_source: str) -> 'Shader':
+        """Builds a Shader from already preprocessed GLSL sources."""
+        shader = cls.__new__(cls)
+        shader._build(ctx, vertex_source, fragment_source)
+        return shader
+
+    def _build(self, ctx, vs, fs):
+        # keep the sources so passes can build companion programs (depth pre-pass, G-buffer)
+        self.vertex_source = vs
+        self.fragment_source = fs
+
+        # set by ShaderLibrary for the programs it owns
+        self.library = None
+        self.name = None
+        self.defines = {}
+        self.files = set()      # source files (incl. includes), for hot-reload
+
         # create & store the Program
         self.program = ctx.program(
             vertex_shader=   vs,
             fragment_shader= fs,
         )
 
+        # reflect active uniforms / attributes once
+        self.uniforms = {}
+        self.attributes = {}
+        for name in self.program:
+            member = self.program[name]
+            if isinstance(member, moderngl.Attribute):
+                self.attributes[name] = member
+            elif isinstance(member, moderngl.Uniform):
+                self.uniforms[name] = member
+
+    def adopt(self, other: 'Shader'):
+        """
+        Takes over another Shader's program in place, so every material holding
+        this object uses the new program from the next draw (hot-reload).
+        """
+        self.program = other.program
+        self.vertex_source = other.vertex_source
+        self.fragment_source = other.fragment_source
+        self.uniforms = other.uniforms
+        self.attributes = other.attributes
+
     def __getitem__(self, name):
         """
         shader['myUniform'] → Uniform object
         """
         return self.program[name]
+
+    def __contains__(self, name):
+        return name in self.uniforms or name in self.attributes
@@ -0,0 +1,218 @@
+# zengine/graphics/shader_library.py
+
+import hashlib
+import os
+import re
+import weakref
+from pathlib import Path
+
+from zengine.graphics.shader import Shader, preprocess
+
+SHADER_DIR = Path(__file__).parent.parent / "assets" / "shaders"
+
+
+class ShaderLibrary:
+    """
+    Loads, preprocesses and deduplicates shader programs for one GL context.
+
+    Sources are looked up on search_paths (the engine's shader directory by
+    default), `#include`s are expanded and `defines` are injected after
+    `#version` (see graphics.shader.preprocess). Only defines a source actually
+    mentions are kept, so requesting a feature a shader doesn't use returns the
+    same program. Programs are keyed by the hash of their final sources:
+    loading the same file pair twice, or two paths producing identical GLSL,
+    compiles once.
+
+    Variants are the same shader with different feature defines, e.g.
+
+        lit = library.load("basic_vert.glsl", "basic_frag.glsl")
+        static = library.variant(lit, SKINNED=False)
+
+    Use ShaderLibrary.for_context(ctx) to share one library per context.
+
+    Compiled programs persist across runs only through the driver's own
+    binary cache (program_cache.enable_driver_shader_cache, which
+    Engine(shader_cache_dir=...) calls): moderngl cannot create a Program
+    from a glProgramBinary blob.
+    """
+    _instances = weakref.WeakKeyDictionary()
+
+    def __init__(self, ctx, search_paths=None):
+        self.ctx = ctx
+        self.search_paths = [str(p) for p in (search_paths or [SHADER_DIR])]
+        self._programs = {}     # source hash -> Shader
+        self._requests = {}     # (vertex, fragment, defines) -> source hash
+        self.stats = {"compiled": 0, "reused": 0}
+        self.generation = 0     # bumped whenever programs are replaced or released
+
+    @classmethod
+    def for_context(cls, ctx) -> 'ShaderLibrary':
+        library = cls._instances.get(ctx)
+        if library is None:
+            library = cls(ctx)
+            cls._instances[ctx] = library
+        return library
+
+    # --- sources --------------------------------------------------------------
+
+    def resolve(self, name) -> str:
+        """Absolute path of a shader file, searched on search_paths unless already a path."""
+        if os.path.isfile(name):
+            return os.path.abspath(name)
+        for d in self.search_paths:
+            path = os.path.join(d, name)
+            if os.path.isfile(path):
+                return os.path.abspath(path)
+        raise FileNotFoundError(f"Shader source '{name}' not found in {self.search_paths}")
+
+    def source(self, name, defines=None) -> str:
+        """Preprocessed GLSL of a shader file (includes expanded, defines injected)."""
+        return self._source(self.resolve(name), defines)
+
+    def _source(self, path, defines, files=None):
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        included = set()
+        source = preprocess(text, os.path.dirname(path), self.search_paths, defines, included)
+        if files is not None:
+            files.update(included)
+        return source
+
+    @staticmethod
+    def source_hash(vertex_source: str, fragment_source: str) -> str:
+        h = hashlib.sha1()
+        for src in (vertex_source, fragment_source):
+            h.update(src.encode('utf-8'))
+            h.update(b'\0')
+        return h.hexdigest()
+
+    @staticmethod
+    def _used_defines(defines, *sources):
+        """Drops defines no source refers to, so unused features don't fork programs."""
+        if not defines:
+            return {}
+        expanded = "\n".join(sources)
+        return {k: v for k, v in defines.items() if re.search(rf'\b{re.escape(k)}\b', expanded)}
+
+    # --- programs ---------------------------------------------------------------
+
+    def load(self, vertex, fragment, defines=None) -> Shader:
+        """Returns the (shared) Shader for a vertex/fragment pair under the given defines."""
+        defines = dict(defines or {})
+        request = (vertex, fragment, tuple(sorted(defines.items())))
+        key = self._requests.get(request)
+        if key is not None and key in self._programs:
+            self.stats["reused"] += 1
+            return self._programs[key]
+
+        vpath, fpath = self.resolve(vertex), self.resolve(fragment)
+        files = set()
+        vs, fs = self._source(vpath, None, files), self._source(fpath, None, files)
+        used = self._used_defines(defines, vs, fs)
+        if used:
+            vs, fs = self._source(vpath, used), self._source(fpath, used)
+        key = self.source_hash(vs, fs)
+        files = [vpath, fpath, *files]
+
+        self._requests[request] = key
+        shader = self._programs.get(key)
+        if shader is not None:
+            self.stats["reused"] += 1
+            return shader
+
+        shader = self._compile(vs, fs, key)
+        shader.library = self
+        shader.name = (vertex, fragment)
+        shader.defines = used
+        shader.files = set(files)
+        self._programs[key] = shader
+        self.stats["compiled"] += 1
+        return shader
+
+    def _compile(self, vs, fs, key) -> Shader:
+        return Shader.from_source(self.ctx, vs, fs)
+
+    def from_source(self, vertex_source: str, fragment_source: str) -> Shader:
+        """Deduplicated program from already preprocessed sources (e.g. pass-specific stages)."""
+        key = self.source_hash(vertex_source, fragment_source)
+        shader = self._programs.get(key)
+        if shader is None:
+            shader = self._compile(vertex_source, fragment_source, key)
+            shader.library = self
+            self._programs[key] = shader
+            self.stats["compiled"] += 1
+        else:
+            self.stats["reused"] += 1
+        return shader
+
+    def variant(self, shader: Shader, **features) -> Shader:
+        """The same shader with some feature defines changed; `shader` itself if it isn't library-made."""
+        if shader.library is not self or shader.name is None:
+            return shader
+        defines = dict(shader.defines)
+        defines.update(features)
+        if defines == shader.defines:
+            return shader
+        return self.load(*shader.name, defines=defines)
+
+    # --- hot-reload -------------------------------------------------------------
+
+    def loaded(self) -> list:
+        """Every file-backed shader built so far."""
+        return [s for s in self._programs.values() if s.name is not None]
+
+    def programs(self) -> list:
+        """The GL programs of every shader currently held, file-backed or not."""
+        return [s.program for s in self._programs.values()]
+
+    def release(self, shader: Shader):
+        """Drops a shader from the library and frees its program."""
+        key = next((k for k, s in self._programs.items() if s is shader), None)
+        if key is None:
+            return
+        del self._programs[key]
+        self._requests = {r: k for r, k in self._requests.items() if k != key}
+        shader.program.release()
+        self.generation += 1
+
+    def shaders_using(self, path) -> list:
+        """Library shaders built from a given source or include file."""
+        path = os.path.abspath(str(path))
+        return [s for s in list(self._programs.values()) if path in s.files]
+
+    def prepare_reload(self, shader: Shader):
+        """
+        Re-reads and preprocesses a shader's sources. Pure file work, safe to run
+        off the render thread. Returns (vertex source, fragment source, files).
+        """
+        vpath, fpath = self.resolve(shader.name[0]), self.resolve(shader.name[1])
+        files = set()
+        vs = self._source(vpath, shader.defines or None, files)
+        fs = self._source(fpath, shader.defines or None, files)
+        return vs, fs, {vpath, fpath, *files}
+
+    def swap(self, shader: Shader, vertex_source: str, fragment_source: str, files=None):
+        """
+        Compiles new sources for an existing shader and swaps them in place.
+        Must run on the thread owning the context. If compiling fails the
+        exception propagates and the shader keeps its current program.
+        Otherwise the replaced program is released and `generation` bumped.
+        Anything holding a vertex array on the old program must rebuild it
+        before its next draw; the systems compare the program they built for
+        with `shader.program`.
+        """
+        new = self._compile(vertex_source, fragment_source, None)
+        old_key = next((k for k, s in self._programs.items() if s is shader), None)
+        new_key = self.source_hash(vertex_source, fragment_source)
+
+        old_program = shader.program
+        shader.adopt(new)
+        old_program.release()
+        self.generation += 1
+        if files is not None:
+            shader.files = set(files)
+        if old_key is not None:
+            del self._programs[old_key]
+            self._requests = {r: (new_key if k == old_key else k) for r, k in self._requests.items()}
+        self._programs[new_key] = shader
+        self.stats["compiled"] += 1
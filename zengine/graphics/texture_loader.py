@@ -4,9 +4,14 @@ import moderngl
 def create_texture_from_numpy(ctx, image_data, width, height):
     return ctx.texture((width, height), 4, image_data.tobytes())
 
-def load_texture_2d(ctx: moderngl.Context, path: str):
+def read_image_rgba(path: str):
+    """Decodes an image file to ((width, height), RGBA bytes), bottom row first as GL expects."""
     img = Image.open(path).transpose(Image.FLIP_TOP_BOTTOM)
-    texture = ctx.texture(img.size, 4, img.convert("RGBA").tobytes())
+    return img.size, img.convert("RGBA").tobytes()
+
+def load_texture_2d(ctx: moderngl.Context, path: str):
+    size, data = read_image_rgba(path)
+    texture = ctx.texture(size, 4, data)
 
     texture.build_mipmaps()
     texture.filter = (moderngl.NEAREST, moderngl.NEAREST)
@@ -0,0 +1,433 @@
+# zengine/util/aabb_tree.py
+
+import math
+
+NULL_NODE = -1
+
+
+def _union(alo, ahi, blo, bhi):
+    return ((min(alo[0], blo[0]), min(alo[1], blo[1]), min(alo[2], blo[2])),
+            (max(ahi[0], bhi[0]), max(ahi[1], bhi[1]), max(ahi[2], bhi[2])))
+
+
+def _area(lo, hi):
+    dx, dy, dz = hi[0] - lo[0], hi[1] - lo[1], hi[2] - lo[2]
+    return 2.0 * (dx * dy + dy * dz + dz * dx)
+
+
+def _contains(alo, ahi, blo, bhi):
+    return (alo[0] <= blo[0] and alo[1] <= blo[1] and alo[2] <= blo[2] and
+            bhi[0] <= ahi[0] and bhi[1] <= ahi[1] and bhi[2] <= ahi[2])
+
+
+def _overlaps(alo, ahi, blo, bhi):
+    return (alo[0] <= bhi[0] and blo[0] <= ahi[0] and
+            alo[1] <= bhi[1] and blo[1] <= ahi[1] and
+            alo[2] <= bhi[2] and blo[2] <= ahi[2])
+
+
+class DynamicAABBTree:
+    """
+    Incrementally updated bounding volume hierarchy (dynamic AABB tree).
+
+    Leaves hold "fat" AABBs (the tight box grown by `margin`) so that small
+    movements don't touch the tree at all; a leaf is only reinserted when its
+    object leaves the fat box. Insertion picks the sibling by surface-area cost
+    and the tree is kept balanced with AVL-style rotations, so every query is
+    O(log N + hits).
+
+    Proxies are integer node ids; each carries an arbitrary `data` payload
+    (SpatialIndexSystem stores the entity id).
+    """
+    def __init__(self, margin: float = 0.1):
+        self.margin = margin
+        self.root = NULL_NODE
+
+        self._lo = []
+        self._hi = []
+        self._parent = []
+        self._left = []
+        self._right = []
+        self._height = []
+        self._data = []
+        self._free = []
+        self._leaf_count = 0
+
+    def __len__(self):
+        return self._leaf_count
+
+    # --- node pool -------------------------------------------------------
+
+    def _alloc(self):
+        if self._free:
+            n = self._free.pop()
+        else:
+            n = len(self._lo)
+            self._lo.append(None)
+            self._hi.append(None)
+            self._parent.append(NULL_NODE)
+            self._left.append(NULL_NODE)
+            self._right.append(NULL_NODE)
+            self._height.append(0)
+            self._data.append(None)
+        self._parent[n] = NULL_NODE
+        self._left[n] = NULL_NODE
+        self._right[n] = NULL_NODE
+        self._height[n] = 0
+        self._data[n] = None
+        return n
+
+    def _release(self, n):
+        self._lo[n] = None
+        self._hi[n] = None
+        self._data[n] = None
+        self._height[n] = -1
+        self._free.append(n)
+
+    def _is_leaf(self, n):
+        return self._left[n] == NULL_NODE
+
+    # --- public proxy API ------------------------------------------------
+
+    def insert(self, lo, hi, data=None) -> int:
+        """Adds a tight AABB and returns its proxy id."""
+        n = self._alloc()
+        m = self.margin
+        self._lo[n] = (lo[0] - m, lo[1] - m, lo[2] - m)
+        self._hi[n] = (hi[0] + m, hi[1] + m, hi[2] + m)
+        self._data[n] = data
+        self._insert_leaf(n)
+        self._leaf_count += 1
+        return n
+
+    def remove(self, proxy: int):
+        self._remove_leaf(proxy)
+        self._release(proxy)
+        self._leaf_count -= 1
+
+    def move(self, proxy: int, lo, hi) -> bool:
+        """
+        Updates a proxy with its new tight AABB. Returns True if the leaf had to
+        be reinserted, False if the existing fat AABB still covers it.
+        """
+        m = self.margin
+        flo, fhi = self._lo[proxy], self._hi[proxy]
+        if _contains(flo, fhi, lo, hi):
+            # Still covered; only reinsert if the fat box has become far too loose
+            # (e.g. after the object shrank), as that would bloat every query.
+            big = 4.0 * m
+            if (lo[0] - flo[0] <= big and lo[1] - flo[1] <= big and lo[2] - flo[2] <= big and
+                    fhi[0] - hi[0] <= big and fhi[1] - hi[1] <= big and fhi[2] - hi[2] <= big):
+                return False
+
+        self._remove_leaf(proxy)
+        self._lo[proxy] = (lo[0] - m, lo[1] - m, lo[2] - m)
+        self._hi[proxy] = (hi[0] + m, hi[1] + m, hi[2] + m)
+        self._insert_leaf(proxy)
+        return True
+
+    def get_data(self, proxy: int):
+        return self._data[proxy]
+
+    def get_fat_aabb(self, proxy: int):
+        return self._lo[proxy], self._hi[proxy]
+
+    def height(self) -> int:
+        return 0 if self.root == NULL_NODE else self._height[self.root]
+
+    # --- queries ---------------------------------------------------------
+
+    def query_aabb(self, lo, hi) -> list:
+        """Payloads of every leaf whose fat AABB overlaps [lo, hi]."""
+        out = []
+        if self.root == NULL_NODE:
+            return out
+        stack = [self.root]
+        while stack:
+            n = stack.pop()
+            if not _overlaps(self._lo[n], self._hi[n], lo, hi):
+                continue
+            if self._is_leaf(n):
+                out.append(self._data[n])
+            else:
+                stack.append(self._left[n])
+                stack.append(self._right[n])
+        return out
+
+    def query_sphere(self, center, radius: float) -> list:
+        """Payloads of every leaf whose fat AABB touches the sphere."""
+        out = []
+        if self.root == NULL_NODE:
+            return out
+        cx, cy, cz = center[0], center[1], center[2]
+        r2 = radius * radius
+        stack = [self.root]
+        while stack:
+            n = stack.pop()
+            lo, hi = self._lo[n], self._hi[n]
+            dx = max(lo[0] - cx, 0.0, cx - hi[0])
+            dy = max(lo[1] - cy, 0.0, cy - hi[1])
+            dz = max(lo[2] - cz, 0.0, cz - hi[2])
+            if dx * dx + dy * dy + dz * dz > r2:
+                continue
+            if self._is_leaf(n):
+                out.append(self._data[n])
+            else:
+                stack.append(self._left[n])
+                stack.append(self._right[n])
+        return out
+
+    def query_frustum(self, planes) -> list:
+        """
+        Payloads of every leaf whose fat AABB is inside or intersects the frustum.
+        `planes` is (6,4) as returned by util.intersection.frustum_planes. Subtrees
+        fully inside the frustum are collected without further plane tests.
+        """
+        out = []
+        if self.root == NULL_NODE:
+            return out
+        planes = [tuple(float(v) for v in p) for p in planes]
+        stack = [self.root]
+        while stack:
+            n = stack.pop()
+            lo, hi = self._lo[n], self._hi[n]
+            outside = False
+            inside = True
+            for a, b, c, d in planes:
+                # distance of the corner furthest along / against the normal
+                far = (a * (hi[0] if a > 0 else lo[0]) +
+                       b * (hi[1] if b > 0 else lo[1]) +
+                       c * (hi[2] if c > 0 else lo[2]) + d)
+                if far < 0.0:
+                    outside = True
+                    break
+                if inside:
+                    near = (a * (lo[0] if a > 0 else hi[0]) +
+                            b * (lo[1] if b > 0 else hi[1]) +
+                            c * (lo[2] if c > 0 else hi[2]) + d)
+                    if near < 0.0:
+                        inside = False
+            if outside:
+                continue
+            if inside:
+                self._collect(n, out)
+            elif self._is_leaf(n):
+                out.append(self._data[n])
+            else:
+                stack.append(self._left[n])
+                stack.append(self._right[n])
+        return out
+
+    def query_ray(self, origin, direction, max_distance: float = math.inf) -> list:
+        """
+        (distance, payload) for every leaf whose fat AABB the ray enters within
+        max_distance, sorted nearest first. `direction` need not be normalized;
+        distances are in units of its length.
+        """
+        out = []
+        if self.root == NULL_NODE:
+            return out
+        ox, oy, oz = float(origin[0]), float(origin[1]), float(origin[2])
+        inv = tuple(1.0 / float(d) if d != 0.0 else math.inf for d in direction[:3])
+        o = (ox, oy, oz)
+
+        stack = [self.root]
+        while stack:
+            n = stack.pop()
+            lo, hi = self._lo[n], self._hi[n]
+            t_near, t_far = 0.0, max_distance
+            miss = False
+            for k in range(3):
+                if inv[k] == math.inf:
+                    # parallel to this slab: must already be between its planes
+                    if o[k] < lo[k] or o[k] > hi[k]:
+                        miss = True
+                        break
+                    continue
+                t1 = (lo[k] - o[k]) * inv[k]
+                t2 = (hi[k] - o[k]) * inv[k]
+                if t1 > t2:
+                    t1, t2 = t2, t1
+                if t1 > t_near:
+                    t_near = t1
+                if t2 < t_far:
+                    t_far = t2
+                if t_near > t_far:
+                    miss = True
+                    break
+            if miss:
+                continue
+            if self._is_leaf(n):
+                out.append((t_near, self._data[n]))
+            else:
+                stack.append(self._left[n])
+                stack.append(self._right[n])
+
+        out.sort(key=lambda h: h[0])
+        return out
+
+    def _collect(self, n, out):
+        stack = [n]
+        while stack:
+            n = stack.pop()
+            if self._is_leaf(n):
+                out.append(self._data[n])
+            else:
+                stack.append(self._left[n])
+                stack.append(self._right[n])
+
+    # --- tree maintenance ------------------------------------------------
+
+    def _insert_leaf(self, leaf):
+        if self.root == NULL_NODE:
+            self.root = leaf
+            self._parent[leaf] = NULL_NODE
+            return
+
+        # Find the best sibling by surface area heuristic
+        llo, lhi = self._lo[leaf], self._hi[leaf]
+        index = self.root
+        while not self._is_leaf(index):
+            c1, c2 = self._left[index], self._right[index]
+            area = _area(self._lo[index], self._hi[index])
+            combined = _area(*_union(self._lo[index], self._hi[index], llo, lhi))
+
+            cost = 2.0 * combined
+            inheritance = 2.0 * (combined - area)
+
+            cost1 = _area(*_union(llo, lhi, self._lo[c1], self._hi[c1])) + inheritance
+            if not self._is_leaf(c1):
+                cost1 -= _area(self._lo[c1], self._hi[c1])
+            cost2 = _area(*_union(llo, lhi, self._lo[c2], self._hi[c2])) + inheritance
+            if not self._is_leaf(c2):
+                cost2 -= _area(self._lo[c2], self._hi[c2])
+
+            if cost < cost1 and cost < cost2:
+                break
+            index = c1 if cost1 < cost2 else c2
+
+        sibling = index
+        old_parent = self._parent[sibling]
+        new_parent = self._alloc()
+        self._parent[new_parent] = old_parent
+        self._lo[new_parent], self._hi[new_parent] = _union(llo, lhi, self._lo[sibling], self._hi[sibling])
+        self._height[new_parent] = self._height[sibling] + 1
+        self._left[new_parent] = sibling
+        self._right[new_parent] = leaf
+        self._parent[sibling] = new_parent
+        self._parent[leaf] = new_parent
+
+        if old_parent != NULL_NODE:
+            if self._left[old_parent] == sibling:
+                self._left[old_parent] = new_parent
+            else:
+                self._right[old_parent] = new_parent
+        else:
+            self.root = new_parent
+
+        self._refit_upwards(self._parent[leaf])
+
+    def _remove_leaf(self, leaf):
+        if leaf == self.root:
+            self.root = NULL_NODE
+            return
+
+        parent = self._parent[leaf]
+        grand = self._parent[parent]
+        sibling = self._right[parent] if self._left[parent] == leaf else self._left[parent]
+
+        if grand != NULL_NODE:
+            if self._left[grand] == parent:
+                self._left[grand] = sibling
+            else:
+                self._right[grand] = sibling
+            self._parent[sibling] = grand
+            self._release(parent)
+            self._refit_upwards(grand)
+        else:
+            self.root = sibling
+            self._parent[sibling] = NULL_NODE
+            self._release(parent)
+        self._parent[leaf] = NULL_NODE
+
+    def _refit_upwards(self, index):
+        while index != NULL_NODE:
+            index = self._balance(index)
+            c1, c2 = self._left[index], self._right[index]
+            self._height[index] = 1 + max(self._height[c1], self._height[c2])
+            self._lo[index], self._hi[index] = _union(self._lo[c1], self._hi[c1], self._lo[c2], self._hi[c2])
+            index = self._parent[index]
+
+    def _balance(self, a):
+        """Rotates node `a` up or down if its subtrees differ in height by more than one."""
+        if self._is_leaf(a) or self._height[a] < 2:
+            return a
+
+        b, c = self._left[a], self._right[a]
+        balance = self._height[c] - self._height[b]
+
+        if balance > 1:
+            return self._rotate(a, c, b, is_left=False)
+        if balance < -1:
+            return self._rotate(a, b, c, is_left=True)
+        return a
+
+    def _rotate(self, a, up, other, is_left):
+        """Promotes child `up` of `a`; `other` is a's remaining child."""
+        f, g = self._left[up], self._right[up]
+
+        # `up` takes a's place
+        self._left[up] = a
+        self._parent[up] = self._parent[a]
+        self._parent[a] = up
+
+        p = self._parent[up]
+        if p != NULL_NODE:
+            if self._left[p] == a:
+                self._left[p] = up
+            else:
+                self._right[p] = up
+        else:
+            self.root = up
+
+        # The taller grandchild stays under `up`, the shorter one moves down to `a`
+        if self._height[f] > self._height[g]:
+            keep, move = f, g
+        else:
+            keep, move = g, f
+
+        self._right[up] = keep
+        if is_left:
+            self._left[a] = move
+        else:
+            self._right[a] = move
+        self._parent[move] = a
+
+        self._lo[a], self._hi[a] = _union(self._lo[other], self._hi[other], self._lo[move], self._hi[move])
+        self._lo[up], self._hi[up] = _union(self._lo[a], self._hi[a], self._lo[keep], self._hi[keep])
+        self._height[a] = 1 + max(self._height[other], self._height[move])
+        self._height[up] = 1 + max(self._height[a], self._height[keep])
+        return up
+
+    def validate(self):
+        """Walks the whole tree checking structural invariants. Debug use only."""
+        if self.root == NULL_NODE:
+            assert self._leaf_count == 0
+            return
+        assert self._parent[self.root] == NULL_NODE
+        leaves = 0
+        stack = [self.root]
+        while stack:
+            n = stack.pop()
+            if self._is_leaf(n):
+                leaves += 1
+                assert self._height[n] == 0
+                continue
+            c1, c2 = self._left[n], self._right[n]
+            assert self._parent[c1] == n and self._parent[c2] == n
+            assert self._height[n] == 1 + max(self._height[c1], self._height[c2])
+            assert _contains(self._lo[n], self._hi[n], self._lo[c1], self._hi[c1])
+            assert _contains(self._lo[n], self._hi[n], self._lo[c2], self._hi[c2])
+            stack.append(c1)
+            stack.append(c2)
+        assert leaves == self._leaf_count
@@ -0,0 +1,130 @@
+# zengine/util/file_watcher.py
+
+import os
+import queue
+import threading
+import time
+import traceback
+
+
+class FileWatcher:
+    """
+    Polling file watcher with debouncing; no OS notification service needed.
+
+    A background thread stats every watched path each `interval` seconds. A
+    change is reported once the file has stopped changing for `debounce`
+    seconds, so an editor's save-in-several-writes produces one event. For each
+    settled change the watch's `prepare(path)` runs on the watcher thread (file
+    reads, parsing, decoding: anything that doesn't touch GL) and its result
+    is queued. The owner drains the queue with `poll()` on its own thread and
+    applies the results at a safe point, e.g. between frames.
+
+    prepare() exceptions are reported through `on_error` and nothing is
+    queued, so the previous resource stays in use.
+    """
+    def __init__(self, interval: float = 0.25, debounce: float = 0.2, on_error=None):
+        self.interval = interval
+        self.debounce = debounce
+        self.on_error = on_error or self._print_error
+
+        self._lock = threading.Lock()
+        self._watches = {}      # path -> list of (key, prepare)
+        self._stamps = {}       # path -> (mtime, size) last seen
+        self._settling = {}     # path -> (stamp, time first seen)
+        self._ready = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _print_error(path, exc):
+        print(f"⚠️ Reload of '{path}' failed, keeping the previous version:")
+        traceback.print_exception(type(exc), exc, exc.__traceback__)
+
+    @staticmethod
+    def _stamp(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def watch(self, path, key, prepare=None):
+        """
+        Watches a file. `key` identifies what to reload (returned by poll());
+        `prepare(path)` builds the reload payload off-thread (default: None).
+        """
+        path = os.path.abspath(str(path))
+        with self._lock:
+            entries = self._watches.setdefault(path, [])
+            if all(k is not key for k, _ in entries):
+                entries.append((key, prepare))
+            self._stamps.setdefault(path, self._stamp(path))
+
+    def unwatch(self, key):
+        with self._lock:
+            for path in list(self._watches):
+                self._watches[path] = [(k, p) for k, p in self._watches[path] if k is not key]
+                if not self._watches[path]:
+                    del self._watches[path]
+                    self._stamps.pop(path, None)
+                    self._settling.pop(path, None)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="FileWatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def check(self, now=None):
+        """One polling pass; runs on the watcher thread but can be called directly."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            paths = list(self._watches)
+
+        for path in paths:
+            stamp = self._stamp(path)
+            with self._lock:
+                if path not in self._watches:
+                    continue
+                if stamp == self._stamps.get(path):
+                    self._settling.pop(path, None)
+                    continue
+                pending = self._settling.get(path)
+                if pending is None or pending[0] != stamp:
+                    # still being written: restart the debounce window
+                    self._settling[path] = (stamp, now)
+                    continue
+                if now - pending[1] < self.debounce:
+                    continue
+                del self._settling[path]
+                self._stamps[path] = stamp
+                entries = list(self._watches[path])
+
+            if stamp is None:
+                continue    # deleted; keep the last good resource
+            for key, prepare in entries:
+                try:
+                    payload = prepare(path) if prepare is not None else None
+                except Exception as e:
+                    self.on_error(path, e)
+                    continue
+                self._ready.put((key, path, payload))
+
+    def poll(self) -> list:
+        """All prepared changes since the last call, as (key, path, payload), oldest first."""
+        out = []
+        while True:
+            try:
+                out.append(self._ready.get_nowait())
+            except queue.Empty:
+                return out
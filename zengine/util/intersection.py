@@ -0,0 +1,132 @@
+# zengine/util/intersection.py
+
+import numpy as np
+
+
+def frustum_planes(vp: np.ndarray) -> np.ndarray:
+    """
+    Extracts the 6 frustum planes (left, right, bottom, top, near, far) from a
+    view-projection matrix (column-vector convention, as built by CameraSystem).
+    Returns (6,4) rows of (a, b, c, d) with inward-facing normals, normalized so
+    a*x + b*y + c*z + d is the signed distance to the plane.
+    """
+    m = np.asarray(vp, dtype='f8')
+    planes = np.array([
+        m[3] + m[0],
+        m[3] - m[0],
+        m[3] + m[1],
+        m[3] - m[1],
+        m[3] + m[2],
+        m[3] - m[2],
+    ])
+    planes /= np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+    return planes
+
+
+def transform_aabbs(lo: np.ndarray, hi: np.ndarray, models: np.ndarray):
+    """
+    Transforms local-space AABBs by model matrices and returns the enclosing
+    world-space AABBs. Works for a single box and matrix, or batches (N,3)/(N,4,4).
+    """
+    lo = np.asarray(lo, dtype='f4')
+    hi = np.asarray(hi, dtype='f4')
+    models = np.asarray(models, dtype='f4')
+
+    center = (lo + hi) * 0.5
+    extent = (hi - lo) * 0.5
+    rot = models[..., :3, :3]
+
+    w_center = np.einsum('...ij,...j->...i', rot, center) + models[..., :3, 3]
+    w_extent = np.einsum('...ij,...j->...i', np.abs(rot), extent)
+    return w_center - w_extent, w_center + w_extent
+
+
+def aabbs_in_frustum(lo: np.ndarray, hi: np.ndarray, planes: np.ndarray) -> np.ndarray:
+    """Vectorized frustum test for (N,3) boxes. True where a box is at least partially inside."""
+    lo = np.asarray(lo, dtype='f4').reshape(-1, 3)
+    hi = np.asarray(hi, dtype='f4').reshape(-1, 3)
+    normals = planes[:, :3]
+
+    # Positive vertex: the box corner furthest along each plane normal
+    p = np.where(normals[None, :, :] > 0, hi[:, None, :], lo[:, None, :])
+    dist = np.einsum('npk,pk->np', p, normals) + planes[None, :, 3]
+    return np.all(dist >= 0.0, axis=1)
+
+
+def screen_coverage(lo: np.ndarray, hi: np.ndarray, vp: np.ndarray) -> np.ndarray:
+    """
+    Fraction of the viewport covered by the screen-space rectangle of each of
+    (N,3) world AABBs. Boxes crossing the camera plane count as covering it all.
+    Summed over the visible objects this estimates the scene's overdraw.
+    """
+    lo = np.asarray(lo, dtype='f4').reshape(-1, 3)
+    hi = np.asarray(hi, dtype='f4').reshape(-1, 3)
+    m = np.asarray(vp, dtype='f4')
+
+    corners = np.stack([np.where(np.array([i & 1, i & 2, i & 4], dtype=bool), hi, lo)
+                        for i in range(8)], axis=1)              # (N,8,3)
+    clip = corners @ m[:, :3].T + m[:, 3]                        # (N,8,4)
+    w = clip[..., 3]
+    straddle = np.any(w <= 1e-5, axis=1)
+    ndc = clip[..., :2] / np.where(w > 1e-5, w, 1.0)[..., None]
+
+    ndc_lo = np.clip(ndc.min(axis=1), -1.0, 1.0)
+    ndc_hi = np.clip(ndc.max(axis=1), -1.0, 1.0)
+    area = np.prod(ndc_hi - ndc_lo, axis=1) * 0.25
+    return np.where(straddle, 1.0, area)
+
+
+def ray_aabbs(origin, direction, lo: np.ndarray, hi: np.ndarray, max_distance=np.inf):
+    """
+    Vectorized slab test of one ray against (N,3) boxes.
+    Returns (hit mask, entry distance); the distance is 0 when the origin is inside.
+    """
+    o = np.asarray(origin, dtype='f8')
+    d = np.asarray(direction, dtype='f8')
+    lo = np.asarray(lo, dtype='f8').reshape(-1, 3)
+    hi = np.asarray(hi, dtype='f8').reshape(-1, 3)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv = 1.0 / d
+        t1 = (lo - o) * inv
+        t2 = (hi - o) * inv
+    # Axis-parallel rays: inside the slab -> unbounded, outside -> miss (entry at +inf)
+    parallel = d == 0.0
+    inside = (o >= lo) & (o <= hi)
+    t1 = np.where(parallel, np.where(inside, -np.inf, np.inf), t1)
+    t2 = np.where(parallel, np.inf, t2)
+
+    t_near = np.max(np.minimum(t1, t2), axis=1)
+    t_far = np.min(np.maximum(t1, t2), axis=1)
+    t_near = np.maximum(t_near, 0.0)
+    hit = (t_near <= t_far) & (t_near <= max_distance)
+    return hit, t_near
+
+
+def ray_triangles(origin, direction, v0: np.ndarray, e1: np.ndarray, e2: np.ndarray,
+                  cull_backfaces: bool = False, eps: float = 1e-9):
+    """
+    Vectorized Möller–Trumbore test of one ray against (N,3) triangles given as
+    a vertex and two edge vectors (v1 - v0, v2 - v0).
+    Returns (hit mask, t); t is in units of `direction` and inf where missed.
+    """
+    o = np.asarray(origin, dtype='f8')
+    d = np.asarray(direction, dtype='f8')
+
+    p = np.cross(d, e2)
+    det = np.einsum('ij,ij->i', e1, p)
+    if cull_backfaces:
+        valid = det > eps
+    else:
+        valid = np.abs(det) > eps
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv_det = np.where(valid, 1.0 / det, 0.0)
+        s = o - v0
+        u = np.einsum('ij,ij->i', s, p) * inv_det
+        q = np.cross(s, e1)
+        v = (q @ d) * inv_det
+        t = np.einsum('ij,ij->i', e2, q) * inv_det
+
+    hit = valid & (u >= 0.0) & (v >= 0.0) & (u + v <= 1.0) & (t >= 0.0)
+    return hit, np.where(hit, t, np.inf)
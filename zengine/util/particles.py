@@ -0,0 +1,114 @@
+# zengine/util/particles.py
+
+import numpy as np
+
+
+def cone_directions(rng, n: int, axis, spread_deg: float) -> np.ndarray:
+    """(n,3) unit vectors uniformly distributed within `spread_deg` of `axis`."""
+    axis = np.asarray(axis, dtype='f4')
+    axis = axis / max(float(np.linalg.norm(axis)), 1e-9)
+    cos_max = np.cos(np.radians(min(spread_deg, 180.0)))
+    cos_t = rng.uniform(cos_max, 1.0, n).astype('f4')
+    sin_t = np.sqrt(np.maximum(0.0, 1.0 - cos_t * cos_t))
+    phi = rng.uniform(0.0, 2.0 * np.pi, n).astype('f4')
+
+    # any basis with `axis` as its third vector
+    helper = (1.0, 0.0, 0.0) if abs(axis[0]) < 0.9 else (0.0, 1.0, 0.0)
+    u = np.cross(axis, helper)
+    u /= np.linalg.norm(u)
+    v = np.cross(axis, u)
+    return ((sin_t * np.cos(phi))[:, None] * u + (sin_t * np.sin(phi))[:, None] * v
+            + cos_t[:, None] * axis).astype('f4')
+
+
+def curl_noise(p: np.ndarray, t: float, scale: float) -> np.ndarray:
+    """
+    Divergence-free swirl at (N,3) points: the analytic curl of a smooth
+    sum-of-sines vector potential drifting with time. Cheap, and particles
+    following it circulate instead of bunching up or spreading out.
+    """
+    x, y, z = (p * scale).T
+    # potential psi = (sin(y+t) + cos(z), sin(z+1.7t) + cos(x), sin(x+2.3t) + cos(y))
+    curl = np.empty_like(p)
+    curl[:, 0] = -np.sin(y) - np.cos(z + 1.7 * t)     # d(psi_z)/dy - d(psi_y)/dz
+    curl[:, 1] = -np.sin(z) - np.cos(x + 2.3 * t)     # d(psi_x)/dz - d(psi_z)/dx
+    curl[:, 2] = -np.sin(x) - np.cos(y + t)           # d(psi_y)/dx - d(psi_x)/dy
+    return curl
+
+
+class ParticlePool:
+    """
+    Fixed-capacity particle storage as structure-of-arrays.
+
+    Live particles are always packed at the front ([:count]), so every kernel
+    is a slice operation and the arrays can go to the GPU as they are. Dead
+    particles are removed by compact(), which gathers the survivors with one
+    fancy-index per array; nothing loops over particles in Python and no
+    array is ever reallocated.
+    """
+    def __init__(self, capacity: int, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.position = np.zeros((capacity, 3), dtype='f4')
+        self.velocity = np.zeros((capacity, 3), dtype='f4')
+        self.age = np.zeros(capacity, dtype='f4')
+        self.lifetime = np.ones(capacity, dtype='f4')
+        self.size = np.zeros(capacity, dtype='f4')
+        self.color = np.zeros((capacity, 4), dtype='f4')
+        self.rng = np.random.default_rng(seed)
+        self.time = 0.0
+        self.spawn_carry = 0.0      # fractional particles owed by the emission rate
+
+    ARRAYS = ("position", "velocity", "age", "lifetime", "size", "color")
+
+    def spawn(self, n: int, position, velocity, lifetime) -> slice:
+        """Appends up to `n` particles (fewer when at capacity); returns their slice."""
+        n = max(0, min(n, self.capacity - self.count))
+        s = slice(self.count, self.count + n)
+        self.position[s] = position[:n] if np.ndim(position) == 2 else position
+        self.velocity[s] = velocity[:n] if np.ndim(velocity) == 2 else velocity
+        self.lifetime[s] = lifetime[:n] if np.ndim(lifetime) == 1 else lifetime
+        self.age[s] = 0.0
+        self.count += n
+        return s
+
+    def compact(self):
+        """Drops particles past their lifetime, keeping the survivors packed and in order."""
+        n = self.count
+        alive = self.age[:n] < self.lifetime[:n]
+        if alive.all():
+            return
+        keep = np.flatnonzero(alive)
+        for name in self.ARRAYS:
+            arr = getattr(self, name)
+            arr[:len(keep)] = arr[keep]
+        self.count = len(keep)
+
+    def clear(self):
+        self.count = 0
+
+    # --- kernels: each acts on the live slice in place -----------------------------
+
+    def integrate(self, dt: float, gravity, drag: float):
+        n = self.count
+        v = self.velocity[:n]
+        v += np.asarray(gravity, dtype='f4') * dt
+        if drag > 0.0:
+            v *= np.float32(np.exp(-drag * dt))
+        self.position[:n] += v * dt
+        self.age[:n] += dt
+        self.time += dt
+
+    def swirl(self, dt: float, strength: float, scale: float):
+        n = self.count
+        if strength > 0.0 and n:
+            self.velocity[:n] += curl_noise(self.position[:n], self.time, scale) * (strength * dt)
+
+    def over_life(self, start_size, end_size, start_color, end_color):
+        """Size and color interpolated by normalized age."""
+        n = self.count
+        t = np.clip(self.age[:n] / self.lifetime[:n], 0.0, 1.0)
+        self.size[:n] = start_size + (end_size - start_size) * t
+        c0 = np.asarray(start_color, dtype='f4')
+        c1 = np.asarray(end_color, dtype='f4')
+        self.color[:n] = c0 + (c1 - c0) * t[:, None]
@@ -94,3 +94,15 @@ def from_axis_angle(axis: Tuple[float, float, float], angle_rad: float) -> Tuple
         z * sin_half,  # qz
         cos_half       # qw
     )
+
+
+def quats_to_forward(quats: np.ndarray) -> np.ndarray:
+    """Batched quat_to_forward: (N,4) quaternions (x, y, z, w) -> (N,3) forward (-Z) vectors."""
+    q = np.asarray(quats, dtype='f4').reshape(-1, 4)
+    q = q / np.linalg.norm(q, axis=1, keepdims=True)
+    x, y, z, w = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+    return -np.stack([
+        2 * (x*z + w*y),
+        2 * (y*z - w*x),
+        1 - 2 * (x*x + y*y),
+    ], axis=1)
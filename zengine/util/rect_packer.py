@@ -0,0 +1,77 @@
+# zengine/util/rect_packer.py
+
+
+class SkylinePacker:
+    """
+    Bottom-left skyline packing of rectangles into one fixed-size bin.
+
+    The skyline is the top edge of everything placed so far, kept as
+    (x, y, width) segments. Each rectangle goes where its top would be
+    lowest (ties: the narrower leftover gap), then the segments it covers
+    are raised to its top. Fast and tight enough for sprite atlases when
+    rectangles are inserted tallest first.
+    """
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.skyline = [(0, 0, width)]
+        self.used_height = 0
+
+    def _fit(self, index, w, h):
+        """y at which a w x h rect starting at skyline[index] rests, or None if it does not fit."""
+        x, _, _ = self.skyline[index]
+        if x + w > self.width:
+            return None
+        y = 0
+        remaining = w
+        i = index
+        while remaining > 0:
+            sx, sy, sw = self.skyline[i]
+            y = max(y, sy)
+            if y + h > self.height:
+                return None
+            remaining -= sw
+            i += 1
+        return y
+
+    def insert(self, w: int, h: int):
+        """(x, y) of a free w x h area, or None when the bin is full."""
+        best = None     # (top, waste, index, y)
+        for i, (x, _, _) in enumerate(self.skyline):
+            y = self._fit(i, w, h)
+            if y is None:
+                continue
+            waste = self.skyline[i][2] - w if self.skyline[i][2] >= w else 0
+            key = (y + h, waste)
+            if best is None or key < best[:2]:
+                best = (y + h, waste, i, y)
+        if best is None:
+            return None
+
+        _, _, index, y = best
+        x = self.skyline[index][0]
+        self._raise(index, x, y + h, w)
+        self.used_height = max(self.used_height, y + h)
+        return x, y
+
+    def _raise(self, index, x, top, w):
+        """Replaces the segments under [x, x + w) with one at height `top`."""
+        end = x + w
+        new = self.skyline[:index] + [(x, top, w)]
+        for sx, sy, sw in self.skyline[index:]:
+            if sx + sw <= end:
+                continue
+            if sx < end:
+                sw -= end - sx
+                sx = end
+            new.append((sx, sy, sw))
+
+        # merge neighbours of equal height
+        merged = [new[0]]
+        for sx, sy, sw in new[1:]:
+            px, py, pw = merged[-1]
+            if py == sy:
+                merged[-1] = (px, py, pw + sw)
+            else:
+                merged.append((sx, sy, sw))
+        self.skyline = merged
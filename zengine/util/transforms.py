@@ -0,0 +1,43 @@
+# zengine/util/transforms.py
+
+import numpy as np
+
+
+def transform_key(tr) -> tuple:
+    """
+    Snapshot of everything that affects a Transform's model matrix.
+    Systems keep the last key per entity and compare it to detect changes.
+    """
+    return (tr.x, tr.y, tr.z,
+            tr.rotation_x, tr.rotation_y, tr.rotation_z, tr.rotation_w,
+            tr.scale_x, tr.scale_y, tr.scale_z)
+
+
+def quats_to_mat3(quats: np.ndarray) -> np.ndarray:
+    """Batched quaternion (x, y, z, w) -> rotation matrix. (N,4) -> (N,3,3)"""
+    q = np.asarray(quats, dtype='f4').reshape(-1, 4)
+    x, y, z, w = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+    xx, yy, zz = x*x, y*y, z*z
+    xy, xz, yz = x*y, x*z, y*z
+    wx, wy, wz = w*x, w*y, w*z
+
+    m = np.empty((q.shape[0], 3, 3), dtype='f4')
+    m[:, 0, 0] = 1 - 2*(yy + zz); m[:, 0, 1] = 2*(xy - wz);     m[:, 0, 2] = 2*(xz + wy)
+    m[:, 1, 0] = 2*(xy + wz);     m[:, 1, 1] = 1 - 2*(xx + zz); m[:, 1, 2] = 2*(yz - wx)
+    m[:, 2, 0] = 2*(xz - wy);     m[:, 2, 1] = 2*(yz + wx);     m[:, 2, 2] = 1 - 2*(xx + yy)
+    return m
+
+
+def compute_model_matrices(transforms) -> np.ndarray:
+    """
+    Batched T @ R @ S for a sequence of Transform components. Returns (N,4,4) f4,
+    matching compute_model_matrix() in the render system for each entry.
+    """
+    data = np.array([transform_key(tr) for tr in transforms], dtype='f4').reshape(-1, 10)
+    n = data.shape[0]
+
+    m = np.zeros((n, 4, 4), dtype='f4')
+    m[:, :3, :3] = quats_to_mat3(data[:, 3:7]) * data[:, None, 7:10]
+    m[:, :3, 3] = data[:, 0:3]
+    m[:, 3, 3] = 1.0
+    return m